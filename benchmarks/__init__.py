@@ -0,0 +1 @@
+"""Benchmarks for TalkyBoi's audio and transcription pipeline."""
@@ -0,0 +1,45 @@
+"""Compare upload encodings: bytes on the wire and encode CPU time.
+
+Usage:
+    python -m benchmarks.bench_encoding [--duration SECONDS] [--repeat N]
+"""
+
+import argparse
+import time
+from talkyboi.audio.audio_utils import AUDIO_FORMATS, encode_audio
+from benchmarks.synthetic import speech_like
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=60.0, help="Fixture length in seconds")
+    parser.add_argument("--repeat", type=int, default=5, help="Encodes per format (best is reported)")
+    args = parser.parse_args()
+
+    audio = speech_like(args.duration)
+    print(f"Fixture: {args.duration:.0f}s speech-like audio, {audio.nbytes} bytes raw PCM\n")
+    print(f"{'format':<8}{'bytes':>12}{'ratio':>8}{'kbit/s':>10}{'cpu ms':>10}{'cpu ms/s':>10}")
+
+    wav_size = None
+    for name in AUDIO_FORMATS:
+        try:
+            best_cpu = float("inf")
+            for _ in range(args.repeat):
+                start = time.process_time()
+                data = encode_audio(audio, name)
+                best_cpu = min(best_cpu, time.process_time() - start)
+        except ValueError as e:
+            print(f"{name:<8}  skipped: {e}")
+            continue
+
+        size = len(data)
+        wav_size = wav_size or size
+        kbps = size * 8 / args.duration / 1000
+        print(
+            f"{name:<8}{size:>12}{wav_size / size:>7.1f}x{kbps:>10.1f}"
+            f"{best_cpu * 1000:>10.1f}{best_cpu * 1000 / args.duration:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
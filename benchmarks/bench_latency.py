@@ -0,0 +1,314 @@
+"""End-to-end release-to-text latency through the real pipeline.
+
+Usage:
+    python -m benchmarks.bench_latency [--durations 1 5 30 ...] [--runs N]
+        [--providers lan broadband mobile whisper] [--save FILE] [--compare FILE]
+
+Each run feeds a synthetic speech-like fixture through AudioRecorder's
+capture callback, releases, and times every stage until the text is in
+MainWindow: capture teardown, the app's TranscriptionPool (queueing, VAD,
+encoding and the client call) and the UI append. Cloud providers are StubClients with
+fixed latency/bandwidth profiles; "whisper" is local Whisper tiny, if
+faster-whisper is installed. Peak RSS is sampled during the timed runs,
+then one extra run is traced with tracemalloc for Python allocations.
+
+--save writes the results as a JSON baseline; --compare diffs against one
+and exits non-zero if any p50 or p95 got more than --threshold worse.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+import numpy as np
+from PySide6.QtCore import QEventLoop, QObject
+from PySide6.QtWidgets import QApplication
+from talkyboi.audio.recorder import AudioRecorder
+from talkyboi.config import SAMPLE_RATE
+from talkyboi.transcription.stub_client import StubClient
+from talkyboi.transcription.pool import TranscriptionPool
+from talkyboi.ui.main_window import MainWindow
+from benchmarks.synthetic import speech_like
+
+DEFAULT_DURATIONS = [1, 5, 30, 120, 600, 1800]
+
+# Simulated cloud providers: service latency, upload speed and tail
+STUB_PROFILES = {
+    "lan": dict(latency_ms=150, jitter_ms=20, bandwidth_kbps=0),
+    "broadband": dict(latency_ms=400, jitter_ms=80, bandwidth_kbps=20_000),
+    "mobile": dict(latency_ms=800, jitter_ms=200, bandwidth_kbps=2_000, slow_rate=0.05, slow_ms=4000),
+}
+
+# Local Whisper is only run on fixtures up to this long by default
+WHISPER_MAX_S = 60
+
+# Samples per simulated PortAudio callback
+_BLOCK_FRAMES = 1024
+
+
+class _SyntheticStream:
+    """Stands in for a sounddevice InputStream; audio is pushed by feed()."""
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SyntheticRecorder(AudioRecorder):
+    """AudioRecorder whose microphone is a fixture."""
+
+    def __init__(self):
+        super().__init__(warm=False)
+
+    def _open_stream(self, callback):
+        self._callback = callback
+        return _SyntheticStream()
+
+    def feed(self, audio: np.ndarray):
+        """Deliver a fixture through the capture callback in PortAudio-sized blocks."""
+        block = audio.reshape(-1, 1)
+        for start in range(0, len(block), _BLOCK_FRAMES):
+            chunk = block[start:start + _BLOCK_FRAMES]
+            self._callback(chunk, len(chunk), None, None)
+
+
+class RssSampler:
+    """Samples resident memory on a background thread and keeps the peak."""
+
+    def __init__(self, interval_s: float = 0.01):
+        self.interval_s = interval_s
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self.peak = current_rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self.peak = max(self.peak, current_rss())
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # No procfs: fall back to the lifetime peak
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class PipelineHarness(QObject):
+    """Runs recordings through recorder, TranscriptionPool and MainWindow."""
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+        self.recorder = SyntheticRecorder()
+        self.window = MainWindow()
+        # Configured like the app's, so queueing and delivery are measured too
+        self.pool = TranscriptionPool(client)
+        self.recorder.recording_finished.connect(self._on_audio)
+        self.recorder.error_occurred.connect(self._on_error)
+        self.pool.finished.connect(self._on_text)
+        self.pool.error.connect(self._on_pool_error)
+        self._loop = None
+        self._marks = {}
+        self._error = None
+
+    def run_once(self, audio: np.ndarray) -> dict[str, float]:
+        """Record, release and wait for the text to be shown.
+
+        Returns:
+            Milliseconds per stage: capture, transcribe, ui and total
+        """
+        self.window.clear_text()
+        self.recorder.start_recording()
+        self.recorder.feed(audio)
+
+        self._loop = QEventLoop()
+        self._error = None
+        self._marks = {"released": time.perf_counter()}
+        self.recorder.stop_recording()
+        self._loop.exec()
+        if self._error:
+            raise RuntimeError(self._error)
+
+        m = self._marks
+        return {
+            "capture": (m["audio"] - m["released"]) * 1000,
+            "transcribe": (m["text"] - m["audio"]) * 1000,
+            "ui": (m["shown"] - m["text"]) * 1000,
+            "total": (m["shown"] - m["released"]) * 1000,
+        }
+
+    def close(self):
+        """Stop the pool's workers and close the window."""
+        self.pool.shutdown()
+        self.window.close()
+
+    def _on_audio(self, audio_data):
+        self._marks["audio"] = time.perf_counter()
+        if not self.pool.submit(audio_data):
+            self._on_error("Transcription queue full")
+
+    def _on_text(self, context, text: str):
+        self._marks["text"] = time.perf_counter()
+        self.window.append_transcription(text)
+        self._marks["shown"] = time.perf_counter()
+        self._loop.quit()
+
+    def _on_pool_error(self, context, message: str):
+        self._on_error(message)
+
+    def _on_error(self, message: str):
+        self._error = message
+        self._loop.quit()
+
+
+def percentile(values: list[float], p: int) -> float:
+    """p-th percentile, interpolated; the value itself for a single run."""
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1]
+
+
+def make_client(provider: str):
+    """Create the client for a provider name, or None if it is unavailable."""
+    if provider in STUB_PROFILES:
+        return StubClient(provider, seed=0, **STUB_PROFILES[provider])
+    if provider == "whisper":
+        try:
+            from talkyboi.transcription.whisper_client import WhisperClient
+        except ImportError:
+            print("whisper: skipped, faster-whisper is not installed")
+            return None
+        client = WhisperClient("tiny", idle_timeout_s=0)
+        client.prewarm()
+        return client
+    raise ValueError(f"Unknown provider: {provider}")
+
+
+def bench_case(harness: PipelineHarness, audio: np.ndarray, runs: int) -> dict:
+    """Time one provider on one fixture."""
+    stages = []
+    with RssSampler() as rss:
+        for _ in range(runs):
+            stages.append(harness.run_once(audio))
+
+    tracemalloc.start()
+    harness.run_once(audio)
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    totals = [s["total"] for s in stages]
+    return {
+        "p50_ms": percentile(totals, 50),
+        "p95_ms": percentile(totals, 95),
+        "p99_ms": percentile(totals, 99),
+        "capture_ms": statistics.median(s["capture"] for s in stages),
+        "transcribe_ms": statistics.median(s["transcribe"] for s in stages),
+        "ui_ms": statistics.median(s["ui"] for s in stages),
+        "rss_peak_mb": rss.peak / 2**20,
+        "alloc_peak_mb": alloc_peak / 2**20,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print deltas against a baseline and return the regressed cases."""
+    regressions = []
+    print(f"\n{'case':<22}{'p50 base':>10}{'p50 now':>10}{'delta':>8}{'p95 base':>10}{'p95 now':>10}{'delta':>8}")
+    for case, now in results.items():
+        base = baseline.get(case)
+        if not base:
+            continue
+        row = f"{case:<22}"
+        for key in ("p50_ms", "p95_ms"):
+            change = now[key] / base[key] - 1 if base[key] else 0.0
+            row += f"{base[key]:>10.0f}{now[key]:>10.0f}{change:>+8.0%}"
+            if change > threshold:
+                regressions.append(f"{case} {key[:3]}")
+        print(row)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--durations", type=float, nargs="+", default=DEFAULT_DURATIONS,
+                        help="Fixture lengths in seconds")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per case")
+    parser.add_argument("--providers", nargs="+", default=[*STUB_PROFILES, "whisper"],
+                        help="Stub profiles and/or 'whisper'")
+    parser.add_argument("--whisper-max-s", type=float, default=WHISPER_MAX_S,
+                        help="Longest fixture to run local Whisper on")
+    parser.add_argument("--save", metavar="FILE", help="Write results as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown before failing")
+    args = parser.parse_args()
+
+    # No window needs to be seen; this also lets the benchmark run headless
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication.instance() or QApplication(sys.argv)
+    fixtures = {d: speech_like(d) for d in args.durations}
+
+    results = {}
+    print(f"{'case':<22}{'p50':>8}{'p95':>8}{'p99':>8}{'capture':>9}{'transcr':>9}{'ui':>6}{'rss MB':>8}{'alloc MB':>9}")
+    for provider in args.providers:
+        client = make_client(provider)
+        if client is None:
+            continue
+        harness = PipelineHarness(client)
+        for duration, audio in fixtures.items():
+            if provider == "whisper" and duration > args.whisper_max_s:
+                continue
+            case = f"{provider}/{duration:g}s"
+            r = results[case] = bench_case(harness, audio, args.runs)
+            print(
+                f"{case:<22}{r['p50_ms']:>8.0f}{r['p95_ms']:>8.0f}{r['p99_ms']:>8.0f}"
+                f"{r['capture_ms']:>9.1f}{r['transcribe_ms']:>9.0f}{r['ui_ms']:>6.1f}"
+                f"{r['rss_peak_mb']:>8.0f}{r['alloc_peak_mb']:>9.1f}"
+            )
+        harness.close()
+    app.processEvents()
+
+    if args.save:
+        meta = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "sample_rate": SAMPLE_RATE,
+            "runs": args.runs,
+        }
+        with open(args.save, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
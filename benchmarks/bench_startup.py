@@ -0,0 +1,161 @@
+"""Startup-time budget: import costs, time-to-window and time-to-first-sample.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs N] [--top N] [--no-launch]
+
+Import costs come from `python -X importtime`. Launch timings start both
+entry points (normal and --quick) with TALKYBOI_STARTUP_TRACE and
+TALKYBOI_STARTUP_PROBE set: the app reports its milestones on stderr,
+starts recording as soon as its window is up, and exits on the first
+audio sample. Exits non-zero if a median exceeds its budget.
+"""
+
+import argparse
+import os
+import queue
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from talkyboi.startup import MARK_PREFIX
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Milliseconds from process launch
+BUDGETS_MS = {
+    "window_shown": 1000,
+    "first_sample": 1500,
+}
+
+# Modules whose import cost matters at startup
+IMPORT_TARGETS = ["talkyboi.launcher", "talkyboi.app", "talkyboi.input.single_instance"]
+
+
+def import_times(module: str) -> list[tuple[int, int, str]]:
+    """Import a module in a fresh interpreter under -X importtime.
+
+    Args:
+        module: Dotted module name
+
+    Returns:
+        (self_us, cumulative_us, name) for the module and everything it
+        imported, excluding interpreter startup; names keep their indentation
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time:       123 |       4567 |   package.module"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    # A module is reported after everything it imported; its subtree is the
+    # run of more deeply indented rows directly before it
+    end = next(i for i, row in enumerate(rows) if row[2].strip() == module)
+    depth = _indent(rows[end][2])
+    start = end
+    while start > 0 and _indent(rows[start - 1][2]) > depth:
+        start -= 1
+    return rows[start:end + 1]
+
+
+def _indent(name: str) -> int:
+    return len(name) - len(name.lstrip())
+
+
+def _pump_lines(stream, lines: queue.Queue):
+    """Forward lines from a stream into a queue, then None at EOF."""
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
+
+
+def launch_times(quick: bool, timeout_s: float = 30.0) -> dict[str, float]:
+    """Launch an entry point and collect its startup milestones.
+
+    Args:
+        quick: Launch quick record mode instead of the main window
+        timeout_s: Give up on the probe after this long
+
+    Returns:
+        Milestone name -> milliseconds since launch
+    """
+    env = dict(os.environ, TALKYBOI_STARTUP_TRACE="1", TALKYBOI_STARTUP_PROBE="1")
+    cmd = [sys.executable, "main.py"] + (["--quick"] if quick else [])
+
+    launched = time.monotonic()
+    proc = subprocess.Popen(cmd, cwd=REPO_ROOT, env=env, stderr=subprocess.PIPE, text=True)
+
+    # Read stderr on a thread so a probe that never sees audio still times out
+    lines = queue.Queue()
+    threading.Thread(target=_pump_lines, args=(proc.stderr, lines), daemon=True).start()
+
+    marks = {}
+    deadline = launched + timeout_s
+    try:
+        while "first_sample" not in marks and "forwarded" not in marks:
+            try:
+                line = lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if line is None:
+                break
+            if line.startswith(MARK_PREFIX):
+                _, event, stamp = line.split()
+                marks[event] = (float(stamp) - launched) * 1000
+    finally:
+        proc.terminate()
+        proc.wait(timeout=5)
+    return marks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Launches per entry point")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--no-launch", action="store_true", help="Only measure imports")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for each launch")
+    args = parser.parse_args()
+
+    for module in IMPORT_TARGETS:
+        rows = import_times(module)
+        total = rows[-1][1]
+        print(f"\nimport {module}: {total / 1000:.1f} ms cumulative")
+        for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+            print(f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:7.1f} ms self  {name.strip()}")
+
+    if args.no_launch:
+        return
+
+    over_budget = False
+    for quick in (False, True):
+        label = "run_quick()" if quick else "run()"
+        runs = [launch_times(quick, args.timeout) for _ in range(args.runs)]
+        print(f"\n{label}: median of {args.runs} launches")
+        for event in sorted({event for marks in runs for event in marks} | set(BUDGETS_MS)):
+            values = [marks[event] for marks in runs if event in marks]
+            if not values:
+                print(f"  {event:<14}     not reached")
+                over_budget = True
+                continue
+            median = statistics.median(values)
+            budget = BUDGETS_MS.get(event)
+            status = ""
+            if budget is not None:
+                status = "ok" if median <= budget else f"OVER BUDGET ({budget} ms)"
+                over_budget |= median > budget
+            print(f"  {event:<14}{median:8.1f} ms  {status}")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
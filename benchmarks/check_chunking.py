@@ -0,0 +1,52 @@
+"""Check where long recordings are cut and how the chunk transcripts are joined.
+
+Usage:
+    python -m benchmarks.check_chunking
+
+Plans chunks for synthetic speech with pauses (cuts must fall in a pause,
+without overlap) and for a pause-free tone (hard cuts, with overlap), then
+stitches transcripts with words repeated across each kind of boundary:
+a genuine repeat at a pause cut ("no. No.") must be kept, a word heard
+twice in an overlap must not. Exits non-zero if any case fails.
+"""
+
+import sys
+import numpy as np
+from talkyboi.config import SAMPLE_RATE
+from talkyboi.transcription.chunked import plan_chunks, stitch
+from benchmarks.synthetic import speech_like
+
+
+def main():
+    failed = False
+
+    def check(label, ok, detail=""):
+        nonlocal failed
+        failed |= not ok
+        print(f"{label:<44}{'ok' if ok else 'FAILED'} {detail}")
+
+    # 3 s phrases between 1 s silences, so every 5 s chunk window has a pause
+    silence = np.zeros(SAMPLE_RATE, dtype=np.int16)
+    phrases = np.concatenate([np.concatenate((speech_like(3.0, seed), silence)) for seed in range(5)])
+    chunks = plan_chunks(phrases, chunk_s=5, overlap_s=1)
+    gaps = [start - end for (start, _), (_, end) in zip(chunks[1:], chunks)]
+    check("pause cuts do not overlap", len(chunks) > 1 and all(g == 0 for g in gaps), str(chunks))
+
+    t = np.arange(20 * SAMPLE_RATE) / SAMPLE_RATE
+    tone = (3000 * np.sin(2 * np.pi * 200 * t)).astype(np.int16)
+    chunks = plan_chunks(tone, chunk_s=5, overlap_s=1)
+    gaps = [start - end for (start, _), (_, end) in zip(chunks[1:], chunks)]
+    check("hard cuts overlap", len(chunks) > 1 and all(g == -SAMPLE_RATE for g in gaps), str(chunks))
+
+    text = stitch(["I said no.", "No. That is final."], [False])
+    check("repeat at a pause cut is kept", text == "I said no. No. That is final.", repr(text))
+    text = stitch(["we need that", "that that one"], [False])
+    check("'that that' at a pause cut is kept", text == "we need that that that one", repr(text))
+    text = stitch(["the quick brown", "brown fox jumps"], [True])
+    check("word heard twice in an overlap is dropped", text == "the quick brown fox jumps", repr(text))
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Check that the VAD keeps speech in clips with no silence to measure against.
+
+Usage:
+    python -m benchmarks.check_vad
+
+Runs detect_speech on synthetic clips that are sound from start to end
+(a held tone and tones modulated by 6-12 dB, 0.8-3 s long), which must be
+kept whole, and on speech between stretches of silence, which must still
+be trimmed. Exits non-zero if any case fails.
+"""
+
+import sys
+import numpy as np
+from talkyboi.audio.audio_utils import detect_speech, get_speech_duration_ms
+from talkyboi.config import SAMPLE_RATE
+from benchmarks.synthetic import speech_like
+
+
+def tone(duration_s: float, depth_db: float = 0.0, level: float = 3000) -> np.ndarray:
+    """A 200 Hz tone whose loudness swings by depth_db at a syllabic 4 Hz."""
+    t = np.arange(int(duration_s * SAMPLE_RATE)) / SAMPLE_RATE
+    swing = 10 ** (-depth_db / 20)
+    envelope = swing + (1 - swing) * (0.5 + 0.5 * np.sin(2 * np.pi * 4 * t))
+    return (level * envelope * np.sin(2 * np.pi * 200 * t)).astype(np.int16)
+
+
+def main():
+    cases = []
+    for duration in (0.8, 1.5, 3.0):
+        for depth in (0, 6, 10, 12):
+            audio = tone(duration, depth)
+            # Whole clip, give or take the trailing partial frame
+            cases.append((f"{duration:g}s tone, {depth} dB swing", audio, 0.95, 1.0))
+
+    silence = np.zeros(SAMPLE_RATE, dtype=np.int16)
+    padded = np.concatenate((silence, speech_like(2.0), silence))
+    cases.append(("2s speech between 1s silences", padded, 0.35, 0.75))
+
+    failed = False
+    for label, audio, low, high in cases:
+        kept = get_speech_duration_ms(detect_speech(audio)) / (len(audio) / SAMPLE_RATE * 1000)
+        ok = low <= kept <= high
+        failed |= not ok
+        print(f"{label:<32}{kept:>6.0%} kept  {'ok' if ok else f'FAILED, expected {low:.0%}-{high:.0%}'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
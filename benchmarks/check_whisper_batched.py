@@ -0,0 +1,58 @@
+"""Check that long clips decode through the batched Whisper pipeline.
+
+Usage:
+    python -m benchmarks.check_whisper_batched [--model tiny] [--duration 75]
+
+Transcribes a synthetic clip longer than batched_min_s with batching
+enabled, once with the VAD filter off (fixed 30 s windows) and once with
+it on, and exits non-zero if either decode fails or skips the batched
+pipeline. Needs faster-whisper.
+"""
+
+import argparse
+import sys
+import time
+from benchmarks.synthetic import speech_like
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="tiny", help="Whisper model size")
+    parser.add_argument("--duration", type=float, default=75.0, help="Clip length in seconds")
+    parser.add_argument("--batch-size", type=int, default=8, help="Batch size to decode with")
+    args = parser.parse_args()
+
+    try:
+        from talkyboi.transcription.whisper_client import WhisperClient
+        from talkyboi.transcription.whisper_profile import load_inference_profile
+    except ImportError:
+        print("Requires the 'faster-whisper' package. Install with: pip install talkyboi[whisper]")
+        sys.exit(1)
+
+    audio = speech_like(args.duration)
+    failed = False
+    for vad_filter in (False, True):
+        profile = load_inference_profile()._replace(
+            batch_size=args.batch_size, batched_min_s=min(60.0, args.duration), vad_filter=vad_filter
+        )
+        client = WhisperClient(args.model, idle_timeout_s=0, profile=profile)
+        client.prewarm()
+        label = f"vad_filter={vad_filter}"
+        if not client._use_batched(audio.astype("float32")):
+            print(f"{label}: FAILED, clip did not take the batched path")
+            failed = True
+            continue
+        started = time.perf_counter()
+        try:
+            text = client.transcribe_array(audio)
+        except Exception as e:
+            print(f"{label}: FAILED, {type(e).__name__}: {e}")
+            failed = True
+        else:
+            print(f"{label}: ok, {args.duration:g}s decoded in {time.perf_counter() - started:.1f}s, {len(text)} chars")
+        client.unload()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Load test for talkyboi-serve: throughput, latency percentiles and 429s.
+
+Usage:
+    python -m benchmarks.load_server [--url URL] [--clients N] [--requests N] [--duration SECONDS]
+
+Without --url, starts a talkyboi-serve on a free local port backed by the
+stub provider (STUB_* variables still apply), so no API keys or network
+are needed. Each client thread sends speech-like WAV uploads back to back
+over one keep-alive connection.
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from urllib.parse import urlsplit
+from talkyboi.audio.audio_utils import numpy_to_wav_bytes
+from talkyboi.server import TRANSCRIPTIONS_PATH
+from benchmarks.synthetic import speech_like
+
+# Distinct fixtures, so a transcript cache on the server cannot answer from memory
+FIXTURES = 8
+
+
+def multipart_body(wav: bytes, boundary: str) -> bytes:
+    """Encode a WAV upload as the OpenAI transcription form."""
+    return b"".join([
+        f'--{boundary}\r\nContent-Disposition: form-data; name="model"\r\n\r\nwhisper-1\r\n'.encode(),
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="load.wav"\r\n'.encode(),
+        b"Content-Type: audio/wav\r\n\r\n",
+        wav,
+        f"\r\n--{boundary}--\r\n".encode(),
+    ])
+
+
+def start_stub_server(concurrency: int, queue: int) -> tuple[subprocess.Popen, str]:
+    """Launch talkyboi-serve with the stub provider and wait until it listens."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = dict(os.environ, TRANSCRIPTION_PROVIDER="stub", TRANSCRIPT_CACHE="0")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "talkyboi.server", "--port", str(port),
+         "--concurrency", str(concurrency), "--queue", str(queue)],
+        env=env, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("talkyboi-serve did not start")
+
+
+def run_client(url: str, bodies: list[bytes], boundary: str, count: int, results: list, lock: threading.Lock):
+    """Send count requests over one connection, reconnecting after errors."""
+    parts = urlsplit(url)
+    conn = None
+    for i in range(count):
+        if conn is None:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=300)
+        body = bodies[i % len(bodies)]
+        started = time.perf_counter()
+        try:
+            conn.request("POST", TRANSCRIPTIONS_PATH, body, {
+                "Content-Type": f"multipart/form-data; boundary={boundary}",
+            })
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+            if response.getheader("Connection", "").lower() == "close":
+                conn.close()
+                conn = None
+        except (OSError, http.client.HTTPException):
+            status = 0
+            conn.close()
+            conn = None
+        with lock:
+            results.append((status, time.perf_counter() - started))
+    if conn:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Server to test (default: start one with the stub provider)")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent client connections")
+    parser.add_argument("--requests", type=int, default=10, help="Requests per client")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of audio per upload")
+    parser.add_argument("--concurrency", type=int, default=4, help="Server concurrency (started server only)")
+    parser.add_argument("--queue", type=int, default=8, help="Server queue size (started server only)")
+    args = parser.parse_args()
+
+    proc = None
+    url = args.url
+    if not url:
+        proc, url = start_stub_server(args.concurrency, args.queue)
+        print(f"Started stub server at {url} (concurrency {args.concurrency}, queue {args.queue})")
+
+    boundary = uuid.uuid4().hex
+    bodies = [multipart_body(bytes(numpy_to_wav_bytes(speech_like(args.duration, seed))), boundary)
+              for seed in range(FIXTURES)]
+    results: list[tuple[int, float]] = []
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=run_client, args=(url, bodies, boundary, args.requests, results, lock))
+        for _ in range(args.clients)
+    ]
+
+    started = time.perf_counter()
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+    wall_s = time.perf_counter() - started
+
+    statuses = Counter(status for status, _ in results)
+    ok = sorted(seconds for status, seconds in results if status == 200)
+    print(f"\n{len(results)} requests from {args.clients} clients in {wall_s:.1f}s")
+    print("Responses: " + ", ".join(f"{code or 'failed'}: {n}" for code, n in sorted(statuses.items())))
+    if len(ok) >= 2:
+        q = statistics.quantiles(ok, n=100)
+        print(f"Latency (200s): p50 {q[49] * 1000:.0f}ms  p95 {q[94] * 1000:.0f}ms  p99 {q[98] * 1000:.0f}ms")
+        print(f"Throughput: {len(ok) / wall_s:.1f} req/s, {len(ok) * args.duration / wall_s:.1f} audio-s/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Synthetic speech-like audio fixtures."""
+
+import numpy as np
+from talkyboi.config import SAMPLE_RATE
+
+
+def speech_like(duration_s: float, seed: int = 0) -> np.ndarray:
+    """Generate int16 audio that resembles speech to codecs and the VAD.
+
+    Voiced "syllables" (a wandering fundamental with decaying harmonics,
+    amplitude-modulated at a syllabic rate) alternate with short unvoiced
+    noise bursts and pauses, over a low background noise floor.
+
+    Args:
+        duration_s: Length of the fixture in seconds
+        seed: Random seed, so fixtures are reproducible
+
+    Returns:
+        NumPy array of int16 samples at SAMPLE_RATE
+    """
+    rng = np.random.default_rng(seed)
+    n = int(duration_s * SAMPLE_RATE)
+    t = np.arange(n, dtype=np.float64) / SAMPLE_RATE
+
+    # Fundamental drifts between ~100 and ~220 Hz like a speaking voice
+    f0 = 160 + 60 * np.sin(2 * np.pi * 0.3 * t + rng.uniform(0, 2 * np.pi))
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+
+    # ~4 syllables per second, phrases separated by pauses of up to a second
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 0.5
+    phrase_len = int(3 * SAMPLE_RATE)
+    phrases = np.ones(n)
+    for start in range(phrase_len, n, phrase_len):
+        pause = int(rng.uniform(0.2, 1.0) * SAMPLE_RATE)
+        phrases[start:start + pause] = 0.0
+
+    fricatives = rng.normal(0, 0.15, n) * (rng.random(n // 800 + 1).repeat(800)[:n] > 0.8)
+    signal = (0.5 * voiced * syllables + fricatives) * phrases
+    signal += rng.normal(0, 0.005, n)
+
+    return np.clip(signal * 8000, -32768, 32767).astype(np.int16)
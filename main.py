@@ -14,10 +14,6 @@ logging.basicConfig(
     handlers=[logging.StreamHandler(sys.stderr)],
 )
 
-load_dotenv()
-
-from talkyboi.app import run, run_quick
-
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="TalkyBoi - Audio dictation with Gemini transcription"
@@ -27,9 +23,29 @@ if __name__ == "__main__":
         action="store_true",
         help="Quick record mode: record, transcribe, copy to clipboard, exit"
     )
+    parser.add_argument(
+        "--calibrate",
+        metavar="AUDIO",
+        help="Benchmark local Whisper settings on a recording and save the fastest"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each recording with cProfile and tracemalloc (see TALKYBOI_PROFILE_DIR)"
+    )
     args = parser.parse_args()
 
+    # Config is read from the environment at import time, so load .env first;
+    # the launcher then imports only what the chosen mode needs
+    load_dotenv()
+    if args.calibrate:
+        from talkyboi.calibrate import main as calibrate
+        calibrate([args.calibrate])
+        sys.exit(0)
+
+    from talkyboi.launcher import run, run_quick
+
     if args.quick:
-        run_quick()
+        run_quick(profile=args.profile)
     else:
-        run()
+        run(profile=args.profile)
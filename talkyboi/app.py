@@ -1,23 +1,118 @@
 """Application setup for TalkyBoi."""
 
+import contextlib
 import logging
 import sys
-import os
+import threading
 from PySide6.QtWidgets import QApplication, QMessageBox
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import Qt, QObject, QTimer, Signal
+from talkyboi import profiling, startup, timing
 from talkyboi.ui.main_window import MainWindow
 from talkyboi.ui.quick_window import QuickRecordWindow
 from talkyboi.audio.recorder import AudioRecorder
 from talkyboi.audio.audio_utils import get_audio_duration_ms
+from talkyboi.input.single_instance import InstanceServer
 from talkyboi.transcription import create_transcription_client
+from talkyboi.transcription.pool import TranscriptionPool
 from talkyboi.transcription.transcriber import TranscriptionThread
-from talkyboi.config import MIN_RECORDING_DURATION_MS
+from talkyboi.transcription.incremental import IncrementalTranscriber
+from talkyboi.config import TRANSCRIPTION_PROVIDER, WHISPER_STREAMING
 
 logger = logging.getLogger(__name__)
 
 
+class ClientLoader(QObject):
+    """Creates the transcription client on a background thread.
+
+    Provider SDKs are among the slowest imports, so they load while the
+    window is already on screen. Emits loaded with the client, or failed
+    with a configuration error message.
+    """
+
+    loaded = Signal(object)
+    failed = Signal(str)
+
+    def start(self):
+        """Start creating the client."""
+        threading.Thread(target=self._load, daemon=True, name="client-loader").start()
+
+    def _load(self):
+        try:
+            client = create_transcription_client()
+        except ValueError as e:
+            self.failed.emit(str(e))
+            return
+        self.loaded.emit(client)
+
+
+def _prewarm_in_background(client):
+    """Let the client load models or open connections without blocking the UI.
+
+    Transcriptions started meanwhile simply wait for the client to be ready.
+    """
+    def prewarm():
+        try:
+            client.prewarm()
+        except Exception as e:
+            logger.warning(f"Transcription client prewarm failed: {e}")
+
+    threading.Thread(target=prewarm, daemon=True, name="prewarm").start()
+
+
+def _current_utterance() -> tuple:
+    """The stage-timing trace and profiling session current on this thread."""
+    return timing.current(), profiling.current()
+
+
+@contextlib.contextmanager
+def _activate_utterance(utterance: tuple):
+    """Make a recording's trace and profiling session current for the duration."""
+    trace, session = utterance
+    with timing.activate(trace), profiling.activate(session):
+        yield
+
+
+def _finish_utterance(status: str = "ok"):
+    """End the current recording's stage timings and profile, if any."""
+    timing.finish(status=status)
+    profiling.finish(status=status)
+
+
+def _copy_quick_result(window: QuickRecordWindow, text: str):
+    """Copy a quick record transcription to the clipboard and show it."""
+    logger.info(f"Quick mode: transcription complete: {len(text)} chars")
+    with timing.span("ui_update"):
+        QApplication.clipboard().setText(text)
+        window.show_success(text)
+    logger.info("Quick mode: copied to clipboard")
+    _finish_utterance()
+
+
+def _preview_quick_result(window: QuickRecordWindow, text: str, progress: float):
+    """Copy a quick record transcription that is still arriving.
+
+    Streamed text only ever grows, so what is already on the clipboard can
+    be pasted while the rest is transcribed.
+    """
+    QApplication.clipboard().setText(text.strip())
+    window.show_partial(text, progress)
+
+
+def _create_incremental_transcriber(client, recorder) -> IncrementalTranscriber | None:
+    """Create an incremental transcriber if streaming local Whisper is enabled."""
+    if WHISPER_STREAMING and TRANSCRIPTION_PROVIDER.lower() == "whisper":
+        logger.info("Local Whisper streaming enabled")
+        return IncrementalTranscriber(client, recorder)
+    return None
+
+
 class TalkyBoiApp:
-    """Main application controller that wires all components together."""
+    """Main application controller that wires all components together.
+
+    Also serves talkyboi-quick: instead of cold-starting, it hands its
+    request to this process, which pops up a quick record window and
+    records with the already-warm recorder and transcription client.
+    """
 
     def __init__(self):
         self.app = QApplication(sys.argv)
@@ -27,20 +122,29 @@ class TalkyBoiApp:
         self.window = MainWindow()
         self.recorder = AudioRecorder()
 
-        # Create transcription client (validates its own API key)
-        try:
-            self.transcription_client = create_transcription_client()
-        except ValueError as e:
-            QMessageBox.critical(None, "Configuration Error", str(e))
-            sys.exit(1)
-        self.transcription_thread = None
+        # Transcription client is created in the background once the window
+        # is up; recordings finished before then wait in _pending_audio
+        self.client_loader = ClientLoader()
+        self.transcription_client = None
+        self.transcription_pool = None
+        self.incremental = None
+        self._pending_audio = []
+        # Trace and profiling session of the recording being finalized
+        self._stopped = None
+
+        # Quick record requests forwarded by talkyboi-quick
+        self.instance_server = InstanceServer(self._on_quick_requested)
+        self._quick_window = None
 
         # Connect signals
         self._connect_signals()
 
     def _connect_signals(self):
         """Connect all component signals."""
-        # Keyboard PTT (Ctrl key when app focused)
+        self.client_loader.loaded.connect(self._on_client_loaded)
+        self.client_loader.failed.connect(self._on_client_failed)
+
+        # Keyboard PTT
         self.window.ptt_pressed.connect(self._on_ptt_pressed)
         self.window.ptt_released.connect(self._on_ptt_released)
 
@@ -48,61 +152,243 @@ class TalkyBoiApp:
         self.window.talk_btn.pressed_signal.connect(self._on_ptt_pressed)
         self.window.talk_btn.released_signal.connect(self._on_ptt_released)
 
+        # Profiling can be switched on and off while running
+        self.window.set_profiling(profiling.is_enabled())
+        self.window.profiling_toggled.connect(profiling.set_enabled)
+
         # Recording -> Transcription
+        self.recorder.capture_started.connect(self._on_capture_started)
         self.recorder.recording_finished.connect(self._on_recording_finished)
-        self.recorder.error_occurred.connect(self.window.show_error)
+        self.recorder.error_occurred.connect(self._on_recorder_error)
+
+    def _on_client_loaded(self, client):
+        """Start using the transcription client and work off queued recordings."""
+        startup.mark("client_ready")
+        self.transcription_client = client
+        self.transcription_pool = TranscriptionPool(client)
+        self.transcription_pool.finished.connect(self._on_pool_finished)
+        self.transcription_pool.error.connect(self._on_pool_error)
+        self.transcription_pool.partial.connect(self._on_pool_partial)
+        self.incremental = _create_incremental_transcriber(client, self.recorder)
+        if self.incremental:
+            self.incremental.finished.connect(self._on_transcription_done)
+            self.incremental.error.connect(self._on_transcription_error)
+        _prewarm_in_background(client)
+
+        pending, self._pending_audio = self._pending_audio, []
+        for audio_data, utterance in pending:
+            logger.info("Transcribing recording queued during startup")
+            with _activate_utterance(utterance):
+                self._start_transcription(audio_data)
+
+    def _on_client_failed(self, error):
+        """Report a configuration error and quit."""
+        QMessageBox.critical(self.window, "Configuration Error", error)
+        self.app.exit(1)
 
     def _on_ptt_pressed(self):
         """Handle push-to-talk key pressed."""
+        if self._quick_window is not None:
+            logger.warning("PTT pressed during quick record, ignoring")
+            return
         logger.info("PTT pressed - starting recording")
+        profiling.begin()
         self.recorder.start_recording()
+        if self.transcription_client:
+            _prewarm_in_background(self.transcription_client)
+        if self.incremental:
+            self.incremental.start()
         self.window.set_recording(True)
 
     def _on_ptt_released(self):
         """Handle push-to-talk key released."""
+        if self._quick_window is not None:
+            return
         logger.info("PTT released - stopping recording")
-        self.recorder.stop_recording()
+        self._stop_recording()
         self.window.set_recording(False)
 
+    def _on_capture_started(self, latency_ms):
+        """Log how long the first audio block took to arrive after the press."""
+        startup.mark("first_sample")
+        logger.info(f"First audio sample {latency_ms:.0f}ms after start")
+        if startup.STARTUP_PROBE:
+            self.app.quit()
+
+    def _stop_recording(self):
+        """Stop recording, keeping its trace and profiling session.
+
+        The audio arrives later from the recorder, by which time another
+        press may already have begun a new trace and session.
+        """
+        if self.recorder.is_recording:
+            self._stopped = _current_utterance()
+        self.recorder.stop_recording()
+
+    def _take_stopped(self) -> tuple:
+        """The stopped recording's trace and session; the current ones if none was kept."""
+        utterance, self._stopped = self._stopped, None
+        return utterance or _current_utterance()
+
     def _on_recording_finished(self, audio_data):
-        """Handle recording finished - start transcription."""
+        """Handle recording finished under the recording's own trace and session."""
+        with _activate_utterance(self._take_stopped()):
+            self._process_recording(audio_data)
+
+    def _process_recording(self, audio_data):
+        """Start transcribing a finished recording."""
+        if self._quick_window is not None:
+            self._finish_quick_recording(audio_data)
+            return
+
         duration = get_audio_duration_ms(audio_data)
         logger.info(f"Recording finished: {duration}ms, {len(audio_data)} samples")
 
-        if duration < MIN_RECORDING_DURATION_MS:
-            logger.warning(f"Recording too short ({duration}ms < {MIN_RECORDING_DURATION_MS}ms)")
-            self.window.show_error(f"Recording too short ({duration}ms)")
+        self.window.set_transcribing()
+
+        if self.transcription_client is None:
+            logger.info("Transcription client still loading, queueing recording")
+            self._pending_audio.append((audio_data, _current_utterance()))
             return
 
-        self.window.set_transcribing()
+        if self.incremental:
+            self.incremental.finish(audio_data)
+            return
 
-        # Create new thread for this transcription
-        logger.info("Starting transcription thread")
-        self.transcription_thread = TranscriptionThread(self.transcription_client, audio_data)
-        self.transcription_thread.finished.connect(self._on_transcription_done)
-        self.transcription_thread.error.connect(self._on_transcription_error)
-        self.transcription_thread.start()
+        self._start_transcription(audio_data)
+
+    def _start_transcription(self, audio_data, quick_window=None):
+        """Queue a recording on the transcription pool.
+
+        Args:
+            audio_data: The recording
+            quick_window: Quick record window to deliver to, instead of the main window
+        """
+        logger.info("Queueing transcription")
+        if not self.transcription_pool.submit(audio_data, quick_window):
+            message = "Too many recordings waiting, try again shortly"
+            _finish_utterance("rejected")
+            if quick_window is not None:
+                quick_window.show_error(message)
+            else:
+                self.window.show_error(message)
+
+    def _on_pool_finished(self, quick_window, text):
+        """Route a finished transcription to the window it belongs to."""
+        if quick_window is not None:
+            _copy_quick_result(quick_window, text)
+        else:
+            self._on_transcription_done(text)
+
+    def _on_pool_partial(self, quick_window, text, progress):
+        """Show a transcription in progress in the window it belongs to."""
+        if quick_window is not None:
+            _preview_quick_result(quick_window, text, progress)
+        else:
+            self.window.show_partial(text, progress)
+
+    def _on_pool_error(self, quick_window, error):
+        """Route a transcription error to the window it belongs to."""
+        if quick_window is not None:
+            logger.error(f"Quick mode error: {error}")
+            _finish_utterance("error")
+            quick_window.show_error(error)
+        else:
+            self._on_transcription_error(error)
 
     def _on_transcription_done(self, text):
         """Handle transcription completed."""
         logger.info(f"Transcription complete: {len(text)} chars")
-        self.window.append_transcription(text)
+        with timing.span("ui_update"):
+            self.window.append_transcription(text)
+        _finish_utterance()
+        if self.transcription_pool.pending:
+            self.window.set_transcribing()
 
     def _on_transcription_error(self, error):
         """Handle transcription error."""
         logger.error(f"Transcription error: {error}")
+        _finish_utterance("error")
         self.window.show_error(error)
 
+    def _on_recorder_error(self, error):
+        """Show a recorder error in whichever window owns the recording."""
+        with _activate_utterance(self._take_stopped()):
+            _finish_utterance("error")
+        if self._quick_window is not None:
+            window, self._quick_window = self._quick_window, None
+            window.show_error(error)
+        else:
+            self.window.show_error(error)
+
+    def _on_quick_requested(self) -> bool:
+        """Take over a quick record hand-off from talkyboi-quick.
+
+        Returns:
+            False if busy, in which case talkyboi-quick records on its own
+        """
+        if self.recorder.is_recording or self._quick_window is not None:
+            logger.warning("Quick record requested while already recording, declining")
+            return False
+        if self.transcription_client is None:
+            logger.warning("Quick record requested before the transcription client is ready, declining")
+            return False
+
+        logger.info("Quick mode: request from talkyboi-quick, starting recording")
+        window = QuickRecordWindow()
+        window.setAttribute(Qt.WA_DeleteOnClose)
+        window.stop_requested.connect(self._on_quick_stop_requested)
+        window.show()
+        window.raise_()
+        window.activateWindow()
+
+        # Reply first; opening the microphone may take a moment
+        self._quick_window = window
+        QTimer.singleShot(0, self._start_quick_recording)
+        return True
+
+    def _start_quick_recording(self):
+        """Start recording into the quick record window."""
+        profiling.begin()
+        self.recorder.start_recording()
+        _prewarm_in_background(self.transcription_client)
+        self._quick_window.start_recording_ui()
+
+    def _on_quick_stop_requested(self):
+        """Handle stop request from the quick record window."""
+        if self._quick_window is not None and self.recorder.is_recording:
+            logger.info("Quick mode: stop requested")
+            self._stop_recording()
+
+    def _finish_quick_recording(self, audio_data):
+        """Transcribe a quick record capture and report back to its window."""
+        window, self._quick_window = self._quick_window, None
+        duration = get_audio_duration_ms(audio_data)
+        logger.info(f"Quick mode: recording finished: {duration}ms")
+
+        window.set_transcribing()
+        self._start_transcription(audio_data, quick_window=window)
+
     def run(self):
         """Run the application."""
         logger.info("Starting TalkyBoi application")
         self.window.show()
+        startup.mark("window_shown")
+        self.recorder.open_stream()
+        self.instance_server.listen()
+        self.client_loader.start()
+        if startup.STARTUP_PROBE:
+            QTimer.singleShot(0, self._on_ptt_pressed)
         result = self.app.exec()
         logger.info("Application shutting down")
-        if self.transcription_thread and self.transcription_thread.isRunning():
-            logger.debug("Waiting for transcription thread to finish")
-            self.transcription_thread.quit()
-            self.transcription_thread.wait()
+        self.instance_server.close()
+        self.recorder.close()
+        if self.transcription_pool:
+            self.transcription_pool.shutdown()
+        if self.incremental:
+            self.incremental.shutdown()
+        if self.transcription_client:
+            self.transcription_client.close()
         return result
 
 
@@ -117,96 +403,128 @@ class QuickRecordApp:
         self.window = QuickRecordWindow()
         self.recorder = AudioRecorder()
 
-        # Create transcription client (validates its own API key)
-        try:
-            self.transcription_client = create_transcription_client()
-        except ValueError as e:
-            QMessageBox.critical(None, "Configuration Error", str(e))
-            sys.exit(1)
+        # Transcription client loads in the background while recording
+        self.client_loader = ClientLoader()
+        self.transcription_client = None
         self.transcription_thread = None
+        self.incremental = None
+        self._pending_audio = None
 
         # Connect signals
         self._connect_signals()
 
     def _connect_signals(self):
         """Connect all component signals."""
+        self.client_loader.loaded.connect(self._on_client_loaded)
+        self.client_loader.failed.connect(self._on_client_failed)
         self.window.stop_requested.connect(self._on_stop_requested)
+        self.recorder.capture_started.connect(self._on_capture_started)
         self.recorder.recording_finished.connect(self._on_recording_finished)
         self.recorder.error_occurred.connect(self._on_error)
 
+    def _on_client_loaded(self, client):
+        """Start using the transcription client, transcribing a waiting recording."""
+        startup.mark("client_ready")
+        self.transcription_client = client
+        _prewarm_in_background(client)
+
+        if self._pending_audio is not None:
+            audio_data, self._pending_audio = self._pending_audio, None
+            self._start_transcription(audio_data)
+            return
+
+        # Incremental transcription can only join a recording from its start
+        self.incremental = _create_incremental_transcriber(client, self.recorder)
+        if self.incremental:
+            self.incremental.finished.connect(self._on_transcription_done)
+            self.incremental.error.connect(self._on_error)
+            if self.recorder.is_recording:
+                self.incremental.start()
+
+    def _on_client_failed(self, error):
+        """Report a configuration error and quit."""
+        QMessageBox.critical(self.window, "Configuration Error", error)
+        self.app.exit(1)
+
     def _on_stop_requested(self):
         """Handle stop request from UI."""
         if self.recorder.is_recording:
             logger.info("Quick mode: stop requested")
             self.recorder.stop_recording()
 
+    def _on_capture_started(self, latency_ms):
+        """Log how long the first audio block took to arrive after the press."""
+        startup.mark("first_sample")
+        logger.info(f"First audio sample {latency_ms:.0f}ms after start")
+        if startup.STARTUP_PROBE:
+            self.app.quit()
+
     def _on_recording_finished(self, audio_data):
         """Handle recording finished - start transcription."""
         duration = get_audio_duration_ms(audio_data)
         logger.info(f"Quick mode: recording finished: {duration}ms")
 
-        if duration < MIN_RECORDING_DURATION_MS:
-            logger.warning(f"Recording too short ({duration}ms)")
-            self.window.show_error(f"Recording too short ({duration}ms)")
+        self.window.set_transcribing()
+
+        if self.transcription_client is None:
+            logger.info("Quick mode: transcription client still loading, waiting")
+            self._pending_audio = audio_data
             return
 
-        self.window.set_transcribing()
+        if self.incremental:
+            self.incremental.finish(audio_data)
+            return
 
-        # Create transcription thread
+        self._start_transcription(audio_data)
+
+    def _start_transcription(self, audio_data):
+        """Transcribe the recording on a new thread."""
         logger.info("Quick mode: starting transcription")
         self.transcription_thread = TranscriptionThread(self.transcription_client, audio_data)
         self.transcription_thread.finished.connect(self._on_transcription_done)
         self.transcription_thread.error.connect(self._on_error)
+        self.transcription_thread.partial.connect(
+            lambda text, progress: _preview_quick_result(self.window, text, progress)
+        )
         self.transcription_thread.start()
 
     def _on_transcription_done(self, text):
         """Handle transcription completed - copy to clipboard and show success."""
-        logger.info(f"Quick mode: transcription complete: {len(text)} chars")
-
-        # Copy to clipboard
-        clipboard = QApplication.clipboard()
-        clipboard.setText(text)
-        logger.info("Quick mode: copied to clipboard")
-
-        # Show success and auto-close
-        self.window.show_success(text)
+        _copy_quick_result(self.window, text)
 
     def _on_error(self, error):
         """Handle errors."""
         logger.error(f"Quick mode error: {error}")
+        _finish_utterance("error")
         self.window.show_error(str(error))
 
     def run(self):
         """Run the quick record application."""
         logger.info("Starting TalkyBoi quick record mode")
         self.window.show()
+        startup.mark("window_shown")
 
-        # Start recording immediately after window is shown
-        QTimer.singleShot(100, self._start_recording)
+        # Start recording as soon as the window has been shown
+        QTimer.singleShot(0, self._start_recording)
+        self.client_loader.start()
 
         result = self.app.exec()
         logger.info("Quick mode shutting down")
+        self.recorder.close()
         if self.transcription_thread and self.transcription_thread.isRunning():
             self.transcription_thread.quit()
             self.transcription_thread.wait()
+        if self.incremental:
+            self.incremental.shutdown()
+        if self.transcription_client:
+            self.transcription_client.close()
         return result
 
     def _start_recording(self):
         """Start recording (called after window is shown)."""
         logger.info("Quick mode: starting recording")
+        profiling.begin()
         self.recorder.start_recording()
+        if self.incremental:
+            self.incremental.start()
         self.window.start_recording_ui()
-
-
-def run():
-    """Run the TalkyBoi application."""
-    logger.info("Initializing TalkyBoi")
-    app = TalkyBoiApp()
-    sys.exit(app.run())
-
-
-def run_quick():
-    """Run TalkyBoi in quick record mode."""
-    logger.info("Initializing TalkyBoi quick mode")
-    app = QuickRecordApp()
-    sys.exit(app.run())
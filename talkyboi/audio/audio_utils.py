@@ -1,24 +1,237 @@
 """Audio utility functions."""
 
 import io
+import os
+import struct
+import wave
+from typing import BinaryIO, Callable, NamedTuple
 import numpy as np
-from scipy.io import wavfile
-from talkyboi.config import SAMPLE_RATE
+from talkyboi.config import (
+    SAMPLE_RATE,
+    CHANNELS,
+    VAD_FRAME_MS,
+    VAD_PADDING_MS,
+    VAD_MIN_ENERGY,
+    VAD_MIN_CONTRAST,
+    VAD_ZCR_THRESHOLD,
+    VAD_MAX_PAUSE_MS,
+)
 
+# Frames analysed per vectorized block, bounds the float32 working set
+_VAD_BLOCK_FRAMES = 4096
 
-def numpy_to_wav_bytes(audio_data: np.ndarray) -> bytes:
+
+# Canonical 44-byte PCM WAV header: RIFF chunk, fmt chunk, data chunk header
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+
+def numpy_to_wav_bytes(audio_data: np.ndarray) -> memoryview:
     """Convert a NumPy array to WAV bytes.
 
+    The header and samples are written into one preallocated buffer, so the
+    recording is copied exactly once.
+
     Args:
         audio_data: NumPy array of audio samples (int16)
 
     Returns:
-        WAV file bytes
+        WAV file bytes as a memoryview
+    """
+    data_size = audio_data.nbytes
+    sample_width = audio_data.dtype.itemsize
+    buffer = bytearray(_WAV_HEADER.size + data_size)
+    _WAV_HEADER.pack_into(
+        buffer, 0,
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, CHANNELS, SAMPLE_RATE,
+        SAMPLE_RATE * CHANNELS * sample_width, CHANNELS * sample_width, sample_width * 8,
+        b"data", data_size,
+    )
+    samples = np.frombuffer(
+        buffer, dtype=audio_data.dtype.newbyteorder("<"), offset=_WAV_HEADER.size
+    )
+    samples[:] = audio_data.reshape(-1)
+    return memoryview(buffer)
+
+
+class BufferReader(io.RawIOBase):
+    """Read-only, seekable file object over a bytes-like buffer.
+
+    Lets HTTP clients and decoders stream an encoded recording in chunks
+    instead of wrapping it in a BytesIO, which would copy it first.
     """
+
+    def __init__(self, buffer, name: str | None = None):
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+        if name:
+            self.name = name
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = min(len(b), len(self._view) - self._pos)
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+def _encode_with_soundfile(audio_data: np.ndarray, container: str, subtype: str) -> memoryview:
+    """Encode audio with libsndfile (FLAC, Ogg/Opus)."""
+    try:
+        import soundfile
+    except ImportError:
+        raise ValueError(
+            f"{container} encoding requires the 'soundfile' package. "
+            "Install with: pip install talkyboi[compression]"
+        )
     buffer = io.BytesIO()
-    wavfile.write(buffer, SAMPLE_RATE, audio_data)
-    buffer.seek(0)
-    return buffer.read()
+    soundfile.write(buffer, audio_data, SAMPLE_RATE, format=container, subtype=subtype)
+    return buffer.getbuffer()
+
+
+class AudioFormat(NamedTuple):
+    """An upload encoding: how to produce it and how to label it."""
+
+    mime_type: str
+    extension: str
+    encode: Callable[[np.ndarray], memoryview]
+
+
+AUDIO_FORMATS = {
+    "wav": AudioFormat("audio/wav", "wav", numpy_to_wav_bytes),
+    "flac": AudioFormat(
+        "audio/flac", "flac", lambda audio: _encode_with_soundfile(audio, "FLAC", "PCM_16")
+    ),
+    "opus": AudioFormat(
+        "audio/ogg", "ogg", lambda audio: _encode_with_soundfile(audio, "OGG", "OPUS")
+    ),
+}
+
+
+def get_audio_format(name: str) -> AudioFormat:
+    """Look up an upload encoding by name.
+
+    Args:
+        name: Format name: wav, flac, or opus
+
+    Returns:
+        The matching AudioFormat
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    try:
+        return AUDIO_FORMATS[name.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown audio format: {name}. Options: {', '.join(AUDIO_FORMATS)}"
+        )
+
+
+def encode_audio(audio_data: np.ndarray, audio_format: str = "wav") -> memoryview:
+    """Encode a NumPy array for upload.
+
+    Args:
+        audio_data: NumPy array of audio samples (int16)
+        audio_format: Format name: wav, flac, or opus
+
+    Returns:
+        Encoded audio file bytes as a memoryview
+    """
+    return get_audio_format(audio_format).encode(audio_data)
+
+
+def resample(audio_data: np.ndarray, rate: int, target_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Resample audio by linear interpolation.
+
+    Good enough for speech recognition input; no anti-aliasing filter.
+
+    Args:
+        audio_data: NumPy array of audio samples (int16)
+        rate: Sample rate of audio_data
+        target_rate: Sample rate to convert to
+
+    Returns:
+        NumPy array of int16 samples at target_rate
+    """
+    if rate == target_rate:
+        return audio_data
+    n_out = int(len(audio_data) * target_rate / rate)
+    positions = np.arange(n_out) * (rate / target_rate)
+    resampled = np.interp(positions, np.arange(len(audio_data)), audio_data)
+    return resampled.astype(np.int16)
+
+
+def load_audio_file(source: str | BinaryIO) -> np.ndarray:
+    """Read an audio file as mono int16 samples at SAMPLE_RATE.
+
+    PCM WAV is read with the standard library; other formats (FLAC, Ogg,
+    ...) need soundfile.
+
+    Args:
+        source: Path or seekable binary file object to read
+
+    Returns:
+        NumPy array of audio samples (int16)
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = name = str(source)
+    else:
+        name = getattr(source, "name", "audio data")
+    try:
+        with wave.open(source, "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError(f"{name}: only 16-bit PCM WAV is supported without soundfile")
+            rate = wav.getframerate()
+            channels = wav.getnchannels()
+            audio = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+    except (wave.Error, EOFError):
+        try:
+            import soundfile
+        except ImportError:
+            raise ValueError(
+                f"Reading {name} requires the 'soundfile' package. "
+                "Install with: pip install talkyboi[compression]"
+            )
+        if not isinstance(source, str):
+            source.seek(0)
+        try:
+            audio, rate = soundfile.read(source, dtype="int16", always_2d=True)
+        except soundfile.LibsndfileError:
+            raise ValueError(f"{name}: unsupported or corrupt audio file")
+        channels = audio.shape[1]
+        audio = audio.reshape(-1)
+
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return resample(audio, rate)
+
+
+def int16_to_float32(audio_data: np.ndarray) -> np.ndarray:
+    """Convert int16 samples to float32 in [-1, 1).
+
+    The cast happens inside the ufunc, so the only allocation is the result.
+
+    Args:
+        audio_data: NumPy array of audio samples (int16)
+
+    Returns:
+        NumPy array of float32 samples
+    """
+    return np.multiply(audio_data, 1 / 32768, dtype=np.float32)
 
 
 def get_audio_duration_ms(audio_data: np.ndarray) -> int:
@@ -31,3 +244,151 @@ def get_audio_duration_ms(audio_data: np.ndarray) -> int:
         Duration in milliseconds
     """
     return int(len(audio_data) / SAMPLE_RATE * 1000)
+
+
+def _frame_features(audio_data: np.ndarray, frame_samples: int) -> tuple[np.ndarray, np.ndarray]:
+    """Compute per-frame RMS energy and zero-crossing rate.
+
+    A trailing partial frame is ignored; callers clip regions to the audio length.
+    """
+    n_frames = len(audio_data) // frame_samples
+    frames = audio_data[:n_frames * frame_samples].reshape(n_frames, frame_samples)
+    rms = np.empty(n_frames, dtype=np.float32)
+    zcr = np.empty(n_frames, dtype=np.float32)
+    for start in range(0, n_frames, _VAD_BLOCK_FRAMES):
+        block = frames[start:start + _VAD_BLOCK_FRAMES].astype(np.float32)
+        rms[start:start + len(block)] = np.sqrt(np.mean(block * block, axis=1))
+        signs = np.signbit(block)
+        crossings = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1)
+        zcr[start:start + len(block)] = crossings / (frame_samples - 1)
+    return rms, zcr
+
+
+def detect_speech(audio_data: np.ndarray) -> np.ndarray:
+    """Find speech regions using frame energy and zero-crossing rate.
+
+    Thresholds adapt to the recording's noise floor, estimated from its
+    quietest frames when they are clearly quieter than its loudest; a clip
+    with no pause in it (continuous speech, a held vowel) has no such frames
+    and is judged against VAD_MIN_ENERGY alone. Frames above the high
+    energy threshold start speech; hysteresis keeps a region open while
+    frames stay above the low threshold (or look like quiet fricatives by
+    their zero-crossing rate), so word endings are not clipped.
+
+    Args:
+        audio_data: NumPy array of audio samples (int16)
+
+    Returns:
+        Array of shape (n, 2) with [start, end) sample offsets of each region
+    """
+    frame_samples = SAMPLE_RATE * VAD_FRAME_MS // 1000
+    rms, zcr = _frame_features(audio_data, frame_samples)
+    if len(rms) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    quiet, loud = np.percentile(rms, [10, 90])
+    noise_floor = float(quiet) if quiet * VAD_MIN_CONTRAST <= loud else 0.0
+    high = max(VAD_MIN_ENERGY, noise_floor * 4.0)
+    low = max(VAD_MIN_ENERGY / 2, noise_floor * 2.0)
+
+    strong = rms >= high
+    weak = strong | (rms >= low) | ((zcr >= VAD_ZCR_THRESHOLD) & (rms >= low / 2))
+
+    # Label runs of weak frames, then keep only runs containing a strong frame
+    run_starts = weak & ~np.concatenate(([False], weak[:-1]))
+    labels = np.cumsum(run_starts) * weak
+    has_strong = np.zeros(labels.max() + 1, dtype=bool)
+    has_strong[labels[strong]] = True
+    has_strong[0] = False
+    speech = has_strong[labels]
+
+    # Pad each region so onsets and trailing consonants survive trimming
+    pad = VAD_PADDING_MS // VAD_FRAME_MS
+    if pad:
+        speech = np.convolve(speech, np.ones(2 * pad + 1), mode="same") > 0
+
+    edges = np.diff(np.concatenate(([0], speech.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1) * frame_samples
+    ends = np.minimum(np.flatnonzero(edges == -1) * frame_samples, len(audio_data))
+    return np.column_stack((starts, ends))
+
+
+def get_speech_duration_ms(regions: np.ndarray) -> int:
+    """Get the total duration of speech regions in milliseconds.
+
+    Args:
+        regions: Speech regions as returned by detect_speech
+
+    Returns:
+        Duration in milliseconds
+    """
+    samples = int(np.sum(regions[:, 1] - regions[:, 0]))
+    return int(samples / SAMPLE_RATE * 1000)
+
+
+def find_pause(audio_data: np.ndarray, min_pause_ms: int) -> int | None:
+    """Find a cut point in the last sufficiently long pause after speech.
+
+    Pauses are measured between padded speech regions, so the actual silence
+    is VAD_PADDING_MS longer on each side.
+
+    Args:
+        audio_data: NumPy array of audio samples (int16)
+        min_pause_ms: Shortest gap between speech regions that counts as a pause
+
+    Returns:
+        Sample offset to cut at, or None if there is no speech followed by a pause
+    """
+    regions = detect_speech(audio_data)
+    if len(regions) == 0:
+        return None
+
+    min_gap = SAMPLE_RATE * min_pause_ms // 1000
+    # Trailing silence counts as a pause; cut early in it so the rest of the
+    # silence goes to the next segment.
+    if len(audio_data) - regions[-1, 1] >= min_gap:
+        return int(regions[-1, 1] + min_gap // 2)
+
+    gaps = regions[1:, 0] - regions[:-1, 1]
+    candidates = np.flatnonzero(gaps >= min_gap)
+    if len(candidates) == 0:
+        return None
+    i = candidates[-1]
+    return int((regions[i, 1] + regions[i + 1, 0]) // 2)
+
+
+def trim_silence(
+    audio_data: np.ndarray,
+    regions: np.ndarray,
+    max_pause_ms: int = VAD_MAX_PAUSE_MS,
+) -> np.ndarray:
+    """Drop leading/trailing silence and shorten long internal pauses.
+
+    Args:
+        audio_data: NumPy array of audio samples (int16)
+        regions: Speech regions as returned by detect_speech
+        max_pause_ms: Longest pause kept between speech regions
+
+    Returns:
+        Trimmed audio; a view when only the edges are cut, otherwise a copy
+    """
+    if len(regions) == 0:
+        return audio_data[:0]
+
+    # Extending every region inwards by half the allowed pause covers short
+    # gaps completely and leaves exactly max_pause_ms of longer ones.
+    half = SAMPLE_RATE * max_pause_ms // 2000
+    starts = regions[:, 0] - half
+    ends = regions[:, 1] + half
+    starts[0] = regions[0, 0]
+    ends[-1] = regions[-1, 1]
+
+    breaks = np.flatnonzero(starts[1:] > ends[:-1]) + 1
+    merged_starts = starts[np.concatenate(([0], breaks))]
+    merged_ends = ends[np.concatenate((breaks - 1, [len(ends) - 1]))]
+
+    if len(merged_starts) == 1:
+        return audio_data[merged_starts[0]:merged_ends[0]]
+    return np.concatenate([
+        audio_data[start:end] for start, end in zip(merged_starts, merged_ends)
+    ])
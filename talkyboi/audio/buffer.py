@@ -0,0 +1,114 @@
+"""Preallocated sample buffers for audio capture."""
+
+import threading
+import numpy as np
+from talkyboi.config import SAMPLE_RATE, DTYPE, CAPTURE_CHUNK_SECONDS
+
+
+class CaptureBuffer:
+    """Growable mono sample buffer written in place from the audio callback.
+
+    Storage is a single preallocated array that grows by whole chunks, so
+    appending a PortAudio block is a slice assignment with no per-block
+    allocation. The finished recording is handed out as a view, not a copy.
+
+    view() may be called from another thread while the audio callback
+    writes. A lock keeps it from pairing the array from before a grow
+    with the length after it; samples inside a view are never rewritten,
+    so it stays valid while writing continues.
+    """
+
+    def __init__(self, chunk_samples: int = SAMPLE_RATE * CAPTURE_CHUNK_SECONDS):
+        """Initialize the buffer.
+
+        Args:
+            chunk_samples: Number of samples to preallocate and to grow by
+        """
+        self._chunk_samples = chunk_samples
+        self._data = np.empty(chunk_samples, dtype=DTYPE)
+        self._length = 0
+        self._lock = threading.Lock()
+
+    def write(self, block: np.ndarray):
+        """Append a block of samples.
+
+        Args:
+            block: Samples as delivered by sounddevice, shape (frames,) or (frames, 1)
+        """
+        frames = len(block)
+        with self._lock:
+            end = self._length + frames
+            if end > len(self._data):
+                self._grow(end)
+            # Slice assignment copies straight into the preallocated storage;
+            # channel 0 of an (n, 1) block is a strided view, not a new array.
+            self._data[self._length:end] = block[:, 0] if block.ndim == 2 else block
+            self._length = end
+
+    def _grow(self, required: int):
+        """Reallocate storage to hold at least `required` samples (lock held)."""
+        chunks = -(-required // self._chunk_samples)
+        data = np.empty(chunks * self._chunk_samples, dtype=DTYPE)
+        data[:self._length] = self._data[:self._length]
+        self._data = data
+
+    def view(self) -> np.ndarray:
+        """Return a zero-copy view of the samples written so far."""
+        with self._lock:
+            return self._data[:self._length]
+
+    def __len__(self) -> int:
+        return self._length
+
+
+class PrerollRing:
+    """Fixed-size circular buffer holding the most recent samples.
+
+    Fed continuously by a warm input stream while not recording, so the
+    audio just before a PTT press can be prepended to the capture.
+    """
+
+    def __init__(self, capacity: int):
+        """Initialize the ring.
+
+        Args:
+            capacity: Number of most recent samples to retain
+        """
+        self._data = np.zeros(capacity, dtype=DTYPE)
+        self._pos = 0
+        self._filled = 0
+
+    def write(self, block: np.ndarray):
+        """Overwrite the oldest samples with a new block.
+
+        Args:
+            block: Samples as delivered by sounddevice, shape (frames,) or (frames, 1)
+        """
+        samples = block[:, 0] if block.ndim == 2 else block
+        capacity = len(self._data)
+        n = len(samples)
+        if n >= capacity:
+            self._data[:] = samples[n - capacity:]
+            self._pos = 0
+            self._filled = capacity
+            return
+
+        end = self._pos + n
+        if end <= capacity:
+            self._data[self._pos:end] = samples
+        else:
+            first = capacity - self._pos
+            self._data[self._pos:] = samples[:first]
+            self._data[:n - first] = samples[first:]
+        self._pos = end % capacity
+        self._filled = min(capacity, self._filled + n)
+
+    def drain_into(self, capture: CaptureBuffer):
+        """Append the retained samples, oldest first, to a capture buffer and empty the ring."""
+        if self._filled < len(self._data):
+            capture.write(self._data[:self._pos])
+        else:
+            capture.write(self._data[self._pos:])
+            capture.write(self._data[:self._pos])
+        self._pos = 0
+        self._filled = 0
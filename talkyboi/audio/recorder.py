@@ -1,10 +1,14 @@
 """Audio recording with sounddevice."""
 
+import functools
 import logging
+import threading
+import time
 import numpy as np
-import sounddevice as sd
-from PySide6.QtCore import QObject, Signal, QThread
-from talkyboi.config import SAMPLE_RATE, CHANNELS, DTYPE
+from PySide6.QtCore import QObject, Signal
+from talkyboi import timing
+from talkyboi.audio.buffer import CaptureBuffer, PrerollRing
+from talkyboi.config import SAMPLE_RATE, CHANNELS, DTYPE, AUDIO_WARM_STREAM, PREROLL_MS
 
 logger = logging.getLogger(__name__)
 
@@ -13,15 +17,76 @@ class AudioRecorder(QObject):
     """Records audio from the microphone.
 
     Emits recording_finished signal with audio data when recording stops.
+
+    In warm mode the input stream stays open between recordings and feeds a
+    pre-roll ring, so a recording starts without opening the device and
+    includes the last PREROLL_MS of audio before the press.
     """
 
     recording_finished = Signal(np.ndarray)
     error_occurred = Signal(str)
+    # Press-to-first-sample latency in milliseconds, once per recording
+    capture_started = Signal(float)
+
+    def __init__(self, warm: bool = AUDIO_WARM_STREAM):
+        """Initialize the recorder.
 
-    def __init__(self):
+        Args:
+            warm: Keep the input stream open between recordings
+        """
         super().__init__()
         self._is_recording = False
-        self._audio_buffer = []
+        self._stream = None
+        self._capture = None
+        self._warm = warm
+        self._warm_stream = None
+        self._lock = threading.Lock()
+        self._preroll = PrerollRing(SAMPLE_RATE * PREROLL_MS // 1000)
+        self._press_time = None
+        self._start_latency_ms = None
+        self._trace = None
+
+    def _open_stream(self, callback):
+        """Create and start an input stream with the configured format."""
+        # Imported on first use: loading PortAudio is not needed to show a window
+        import sounddevice as sd
+
+        logger.debug(f"Opening audio stream: {SAMPLE_RATE}Hz, {CHANNELS}ch, {DTYPE}")
+        stream = sd.InputStream(
+            samplerate=SAMPLE_RATE,
+            channels=CHANNELS,
+            dtype=DTYPE,
+            callback=callback,
+        )
+        stream.start()
+        return stream
+
+    def open_stream(self):
+        """Open the persistent input stream (warm mode only).
+
+        Called ahead of the first recording so that one does not pay for the
+        device open either. Falls back to per-recording streams on failure.
+        """
+        if not self._warm or self._warm_stream is not None:
+            return
+        try:
+            self._warm_stream = self._open_stream(self._warm_callback)
+            logger.info(f"Warm audio stream open ({PREROLL_MS}ms pre-roll)")
+        except Exception as e:
+            logger.error(f"Failed to open warm stream, falling back to cold starts: {e}")
+            self._warm = False
+
+    def close(self):
+        """Close the persistent input stream, if any."""
+        if self._warm_stream is None:
+            return
+        try:
+            self._warm_stream.stop()
+            self._warm_stream.close()
+            logger.debug("Warm audio stream closed")
+        except Exception as e:
+            logger.warning(f"Error closing warm stream: {e}")
+        self._warm_stream = None
 
     def start_recording(self):
         """Start recording audio from the default microphone."""
@@ -29,18 +94,29 @@ class AudioRecorder(QObject):
             logger.warning("Already recording, ignoring start request")
             return
 
+        self._press_time = time.perf_counter()
+        self._start_latency_ms = None
+        # Each recording is one utterance for stage timings
+        self._trace = timing.begin()
+        self.open_stream()
+
+        if self._warm:
+            with self._lock:
+                self._capture = CaptureBuffer()
+                self._preroll.drain_into(self._capture)
+                self._is_recording = True
+            logger.info(f"Recording started with {len(self._capture)} pre-roll samples")
+            return
+
+        # Fresh buffer per recording: the previous one is still referenced
+        # by the view handed to recording_finished.
+        self._capture = CaptureBuffer()
         self._is_recording = True
-        self._audio_buffer = []
 
         try:
-            logger.debug(f"Opening audio stream: {SAMPLE_RATE}Hz, {CHANNELS}ch, {DTYPE}")
-            self._stream = sd.InputStream(
-                samplerate=SAMPLE_RATE,
-                channels=CHANNELS,
-                dtype=DTYPE,
-                callback=self._audio_callback,
+            self._stream = self._open_stream(
+                functools.partial(self._audio_callback, self._capture)
             )
-            self._stream.start()
             logger.info("Recording started")
         except Exception as e:
             logger.error(f"Failed to start recording: {e}")
@@ -48,36 +124,102 @@ class AudioRecorder(QObject):
             self.error_occurred.emit(f"Failed to start recording: {e}")
 
     def stop_recording(self):
-        """Stop recording and emit the recorded audio."""
+        """Stop recording and emit the recorded audio.
+
+        Stream teardown waits for PortAudio to drain, so it runs on a helper
+        thread; recording_finished is delivered to the GUI thread as a queued
+        signal once the capture buffer is final.
+        """
         if not self._is_recording:
             logger.warning("Not recording, ignoring stop request")
             return
+        if self._trace is not None:
+            timing.record("recording", self._trace.start, time.monotonic(), self._trace)
+
+        if self._warm:
+            # The stream stays open; once the flag is cleared under the lock
+            # the callback no longer touches this capture.
+            with self._lock:
+                self._is_recording = False
+                capture = self._capture
+            self._emit_capture(capture)
+            return
 
         self._is_recording = False
-
+        stream, capture = self._stream, self._capture
+        self._stream = None
+        threading.Thread(
+            target=timing.bind(self._finalize), args=(stream, capture), daemon=True, name="capture-finalize"
+        ).start()
+
+    def _finalize(self, stream, capture: CaptureBuffer):
+        """Close the stream and emit the captured samples."""
         try:
-            self._stream.stop()
-            self._stream.close()
+            with timing.span("capture_teardown"):
+                stream.stop()
+                stream.close()
             logger.debug("Audio stream closed")
         except Exception as e:
             logger.warning(f"Error closing stream: {e}")
+        self._emit_capture(capture)
 
-        if self._audio_buffer:
-            audio_data = np.concatenate(self._audio_buffer)
+    def _emit_capture(self, capture: CaptureBuffer):
+        """Emit a finished capture, or an error if it is empty."""
+        if len(capture):
+            audio_data = capture.view()
             logger.info(f"Recording stopped: {len(audio_data)} samples captured")
             self.recording_finished.emit(audio_data)
         else:
             logger.warning("No audio data captured")
             self.error_occurred.emit("No audio recorded")
 
-    def _audio_callback(self, indata, frames, time, status):
-        """Callback for sounddevice stream - accumulates audio samples."""
+    def _note_first_sample(self):
+        """Record press-to-first-sample latency for the current recording."""
+        self._start_latency_ms = (time.perf_counter() - self._press_time) * 1000
+        if self._trace is not None:
+            timing.record("first_sample", self._trace.start, time.monotonic(), self._trace)
+        self.capture_started.emit(self._start_latency_ms)
+
+    def _audio_callback(self, capture, indata, frames, time, status):
+        """Callback for sounddevice stream - writes samples into the capture buffer."""
         if status:
             logger.warning(f"Audio stream status: {status}")
-        if self._is_recording:
-            self._audio_buffer.append(indata.copy().flatten())
+        # A stream being torn down may still deliver a block after a new
+        # recording has started; only the current capture accepts samples.
+        if self._is_recording and capture is self._capture:
+            if self._start_latency_ms is None:
+                self._note_first_sample()
+            capture.write(indata)
+
+    def _warm_callback(self, indata, frames, time, status):
+        """Callback for the warm stream - feeds the capture or the pre-roll ring."""
+        if status:
+            logger.warning(f"Audio stream status: {status}")
+        with self._lock:
+            if self._is_recording:
+                if self._start_latency_ms is None:
+                    self._note_first_sample()
+                self._capture.write(indata)
+            else:
+                self._preroll.write(indata)
+
+    def live_audio(self) -> np.ndarray | None:
+        """Return a view of the samples captured so far by the current recording.
+
+        Safe to call while the callback is writing: the view covers only
+        samples that were completely written when it was taken, and those
+        are never overwritten. Samples arriving later are not in it.
+        """
+        if not self._is_recording:
+            return None
+        return self._capture.view()
 
     @property
     def is_recording(self) -> bool:
         """Return whether currently recording."""
         return self._is_recording
+
+    @property
+    def start_latency_ms(self) -> float | None:
+        """Press-to-first-sample latency of the latest recording, if measured."""
+        return self._start_latency_ms
@@ -0,0 +1,223 @@
+"""Headless batch transcription of audio files.
+
+Usage:
+    talkyboi-batch PATH... [--output results.jsonl] [--workers 4] [--processes]
+
+Walks the given files and directories, transcribes every audio file with
+the configured provider and appends one JSON line per file to the output
+as soon as it is done. Files already transcribed successfully in the
+output are skipped, so an interrupted run continues where it stopped.
+No Qt is involved.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from talkyboi.audio.audio_utils import load_audio_file
+from talkyboi.config import SAMPLE_RATE
+from talkyboi.transcription import create_transcription_client
+from talkyboi.transcription.pipeline import transcribe_audio
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg", ".opus", ".mp3")
+
+# Client used by the jobs in this process
+_client = None
+
+
+def find_audio_files(paths: list[str], extensions: tuple[str, ...] = AUDIO_EXTENSIONS) -> Iterator[Path]:
+    """Yield audio files under the given paths, in sorted order.
+
+    Args:
+        paths: Files and directories; directories are walked recursively
+        extensions: Lower-case file extensions to include
+    """
+    for path in map(Path, paths):
+        if path.is_file():
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    yield Path(root) / name
+
+
+def completed_paths(output: Path) -> set[str]:
+    """Files already transcribed successfully in an earlier run's output."""
+    done = set()
+    if not output.exists():
+        return done
+    with output.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A run killed mid-write leaves a partial last line
+                continue
+            if record.get("status") == "ok":
+                done.add(record["path"])
+    return done
+
+
+def _init_client():
+    """Create this process's transcription client."""
+    global _client
+    _client = create_transcription_client()
+
+
+def _close_client():
+    """Close this process's transcription client, if it has one."""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+def transcribe_file(path: str) -> dict:
+    """Load and transcribe one file.
+
+    Returns:
+        Result record: path, status, text or error, duration_s and elapsed_s
+    """
+    started = time.monotonic()
+    record = {"path": path}
+    try:
+        audio = load_audio_file(path)
+        record["duration_s"] = round(len(audio) / SAMPLE_RATE, 3)
+        record["text"] = transcribe_audio(_client, audio, min_speech_ms=0)
+        record["status"] = "ok"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = str(e)
+    record["elapsed_s"] = round(time.monotonic() - started, 3)
+    return record
+
+
+def run_batch(
+    paths: list[str],
+    output: Path,
+    workers: int,
+    processes: bool = False,
+    restart: bool = False,
+) -> dict:
+    """Transcribe every audio file under paths into a JSONL file.
+
+    At most 2 * workers files are in flight at once, so the file list is
+    streamed rather than queued up front.
+
+    Args:
+        paths: Files and directories to transcribe
+        output: JSONL file to append results to
+        workers: Concurrent transcriptions; the cap for provider rate limits
+        processes: Use worker processes (each with its own client) instead of threads
+        restart: Ignore and overwrite results from an earlier run
+
+    Returns:
+        Totals: files ok/failed/skipped, audio seconds, wall seconds
+
+    Raises:
+        ValueError: If the transcription client cannot be created
+        BrokenProcessPool: If a worker process died
+    """
+    done = set() if restart else completed_paths(output)
+    pending = (str(p) for p in find_audio_files(paths) if str(p) not in done)
+    totals = {"ok": 0, "failed": 0, "skipped": len(done), "audio_s": 0.0}
+
+    # Fails here with one ValueError on a bad configuration, rather than in
+    # every worker process
+    _init_client()
+    if processes:
+        # Workers create their own clients; they are spawned rather than
+        # forked so none inherits this one's connections or threads
+        _close_client()
+        executor = ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_client
+        )
+    else:
+        executor = ThreadPoolExecutor(workers, thread_name_prefix="batch")
+
+    started = time.monotonic()
+    with executor, output.open("w" if restart else "a", encoding="utf-8") as out:
+        in_flight = set()
+        exhausted = False
+        while in_flight or not exhausted:
+            while not exhausted and len(in_flight) < 2 * workers:
+                path = next(pending, None)
+                if path is None:
+                    exhausted = True
+                else:
+                    in_flight.add(executor.submit(transcribe_file, path))
+            if not in_flight:
+                break
+
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                record = future.result()
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                _count(totals, record, time.monotonic() - started)
+    _close_client()
+
+    totals["wall_s"] = time.monotonic() - started
+    return totals
+
+
+def _count(totals: dict, record: dict, wall_s: float):
+    """Add a result to the totals and log progress."""
+    if record["status"] == "ok":
+        totals["ok"] += 1
+        totals["audio_s"] += record["duration_s"]
+        rate = totals["audio_s"] / wall_s if wall_s else 0.0
+        logger.info(f"{record['path']}: {record['duration_s']:.1f}s in {record['elapsed_s']:.1f}s "
+                    f"({rate:.1f} audio-s/s overall)")
+    else:
+        totals["failed"] += 1
+        logger.warning(f"{record['path']}: {record['error']}")
+
+
+def main(argv: list[str] | None = None):
+    """Run the batch CLI."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="Audio files or directories")
+    parser.add_argument("--output", "-o", default="transcripts.jsonl", help="JSONL results file")
+    parser.add_argument("--workers", "-j", type=int, default=4, help="Concurrent transcriptions")
+    parser.add_argument("--processes", action="store_true",
+                        help="Use worker processes instead of threads (e.g. for local Whisper)")
+    parser.add_argument("--restart", action="store_true", help="Ignore earlier results and start over")
+    args = parser.parse_args(argv)
+
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s",
+                            datefmt="%H:%M:%S")
+
+    try:
+        totals = run_batch(args.paths, Path(args.output), args.workers, args.processes, args.restart)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    except BrokenProcessPool as e:
+        print(f"A worker process died ({e}). Finished files are in {args.output}; "
+              "run again to continue.", file=sys.stderr)
+        sys.exit(1)
+
+    rate = totals["audio_s"] / totals["wall_s"] if totals["wall_s"] else 0.0
+    print(
+        f"{totals['ok']} transcribed, {totals['failed']} failed, {totals['skipped']} already done; "
+        f"{totals['audio_s']:.0f}s of audio in {totals['wall_s']:.0f}s ({rate:.1f} audio-s/s)",
+        file=sys.stderr,
+    )
+    sys.exit(1 if totals["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark local Whisper inference profiles and save the fastest.
+
+Usage:
+    talkyboi-calibrate AUDIO [--model base] [--runs 2] [--beam-sizes 1 5] [--dry-run]
+
+Every combination of compute type, CPU thread count and batched decoding
+that this machine supports transcribes AUDIO; the profile with the lowest
+real-time factor is written to ~/.config/talkyboi/whisper_profile.json,
+where WhisperClient picks it up. Decoding options that change the
+transcript (language, VAD filter, timestamps) are kept as configured.
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import sys
+import time
+from talkyboi.audio.audio_utils import load_audio_file
+from talkyboi.config import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# Batch size tried for BatchedInferencePipeline
+_CALIBRATION_BATCH_SIZE = 8
+
+
+def _resolve_device(device: str) -> str:
+    """Turn "auto" into the device CTranslate2 would pick."""
+    import ctranslate2
+
+    if device != "auto":
+        return device
+    return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+
+def candidate_profiles(base, duration_s: float, beam_sizes: list[int]) -> list:
+    """Profiles worth comparing on this machine.
+
+    Args:
+        base: InferenceProfile whose decoding options are kept
+        duration_s: Length of the calibration clip
+        beam_sizes: Beam sizes to try
+
+    Returns:
+        InferenceProfile candidates
+    """
+    import ctranslate2
+
+    device = _resolve_device(base.device)
+    supported = ctranslate2.get_supported_compute_types(device)
+    preferred = ("int8", "int8_float16", "int8_float32", "float16", "float32")
+    compute_types = [c for c in preferred if c in supported]
+
+    if device == "cpu":
+        cores = os.cpu_count() or 1
+        threads = sorted({max(1, cores // 2), cores, min(cores, 4)})
+    else:
+        threads = [0]
+
+    # The batched pipeline only pays off once a clip spans several windows
+    batch_sizes = [0, _CALIBRATION_BATCH_SIZE] if duration_s >= 60 else [0]
+
+    return [
+        base._replace(
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            beam_size=beam_size,
+            batch_size=batch_size,
+        )
+        for compute_type, cpu_threads, beam_size, batch_size in itertools.product(
+            compute_types, threads, beam_sizes, batch_sizes
+        )
+    ]
+
+
+def time_profile(model_size: str, profile, audio, runs: int) -> tuple[float, float]:
+    """Load a model with a profile and time transcriptions of a clip.
+
+    Returns:
+        (load seconds, fastest transcription seconds)
+    """
+    from talkyboi.transcription.whisper_client import WhisperClient
+
+    client = WhisperClient(model_size, idle_timeout_s=0, profile=profile)
+    started = time.perf_counter()
+    client.prewarm()
+    load_s = time.perf_counter() - started
+
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        client.transcribe_array(audio)
+        best = min(best, time.perf_counter() - started)
+    client.unload()
+    return load_s, best
+
+
+def main(argv: list[str] | None = None):
+    """Run the calibration."""
+    try:
+        from talkyboi.transcription.whisper_client import WHISPER_MODEL
+    except ImportError:
+        print(
+            "Calibration requires the 'faster-whisper' package. "
+            "Install with: pip install talkyboi[whisper]",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    from talkyboi.transcription.whisper_profile import (
+        PROFILE_PATH,
+        load_inference_profile,
+        save_inference_profile,
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("audio", help="Speech recording to calibrate on (WAV, or any format soundfile reads)")
+    parser.add_argument("--model", default=WHISPER_MODEL, help="Whisper model size")
+    parser.add_argument("--runs", type=int, default=2, help="Timed transcriptions per profile")
+    parser.add_argument("--beam-sizes", type=int, nargs="+", help="Beam sizes to try (default: configured)")
+    parser.add_argument("--dry-run", action="store_true", help="Report only, do not save")
+    args = parser.parse_args(argv)
+
+    audio = load_audio_file(args.audio)
+    duration_s = len(audio) / SAMPLE_RATE
+    base = load_inference_profile()
+    profiles = candidate_profiles(base, duration_s, args.beam_sizes or [base.beam_size])
+    print(f"Calibrating Whisper '{args.model}' on {duration_s:.1f}s of audio, {len(profiles)} profiles")
+
+    results = []
+    for profile in profiles:
+        try:
+            load_s, best_s = time_profile(args.model, profile, audio, args.runs)
+        except (ValueError, RuntimeError) as e:
+            print(f"  {profile.describe():<40} failed: {e}")
+            continue
+        results.append((best_s, profile))
+        print(f"  {profile.describe():<40} {best_s:6.2f}s  RTF {best_s / duration_s:.3f}  (load {load_s:.1f}s)")
+
+    if not results:
+        print("No profile could be run", file=sys.stderr)
+        sys.exit(1)
+
+    best_s, best = min(results, key=lambda r: r[0])
+    print(f"\nFastest: {best.describe()} ({best_s:.2f}s, RTF {best_s / duration_s:.3f})")
+    if args.dry_run:
+        return
+    save_inference_profile(best)
+    print(f"Saved to {PROFILE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
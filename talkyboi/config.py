@@ -1,22 +1,88 @@
 """Configuration constants for TalkyBoi."""
 
 import os
-from pynput import keyboard
 
 # Audio settings
 SAMPLE_RATE = 16000  # 16kHz - good for speech
 CHANNELS = 1  # Mono
 DTYPE = "int16"  # 16-bit signed
+CAPTURE_CHUNK_SECONDS = 30  # Capture buffer grows in chunks of this length
 
-# Push-to-talk key
-PTT_KEY = keyboard.Key.ctrl_r  # Right Ctrl
+# Warm mode keeps the input stream open so PTT starts instantly and includes
+# the audio from just before the press
+AUDIO_WARM_STREAM = os.environ.get("AUDIO_WARM_STREAM", "0") == "1"
+PREROLL_MS = int(os.environ.get("PREROLL_MS", "300"))
+
+# Push-to-talk key, as a pynput keyboard.Key name (pynput loads only when used)
+PTT_KEY = "ctrl_r"  # Right Ctrl
 
 # Transcription provider: gemini, openai, or whisper
 TRANSCRIPTION_PROVIDER = os.environ.get("TRANSCRIPTION_PROVIDER", "gemini")
 
+# Give up on a transcription after this many seconds (0 = wait forever).
+# Off by default: an abandoned local decode keeps using the CPU anyway
+TRANSCRIPTION_DEADLINE_S = float(os.environ.get("TRANSCRIPTION_DEADLINE_S", "0"))
+# Providers to fail over to, in order, e.g. "openai,whisper"
+TRANSCRIPTION_FALLBACKS = [
+    p.strip().lower() for p in os.environ.get("TRANSCRIPTION_FALLBACKS", "").split(",") if p.strip()
+]
+# Send a backup request when the provider is slower than its usual p95
+# latency for clips of that length; HEDGE_DELAY_S is used until enough
+# latencies have been seen
+TRANSCRIPTION_HEDGE = os.environ.get("TRANSCRIPTION_HEDGE", "0") == "1"
+HEDGE_DELAY_S = float(os.environ.get("HEDGE_DELAY_S", "3"))
+
+# Cloud providers: how long an idle HTTP connection is kept open for reuse,
+# and how long to wait for a response
+HTTP_KEEPALIVE_S = float(os.environ.get("HTTP_KEEPALIVE_S", "120"))
+HTTP_TIMEOUT_S = float(os.environ.get("HTTP_TIMEOUT_S", "60"))
+
+# Transcript cache: identical audio sent to the same provider/model/prompt
+# is answered from here instead of being transcribed (and billed) again
+TRANSCRIPT_CACHE = os.environ.get("TRANSCRIPT_CACHE", "1") == "1"
+# Also keep transcripts on disk, as plaintext files readable only by this
+# user; off by default since they are a record of everything dictated
+TRANSCRIPT_CACHE_DISK = os.environ.get("TRANSCRIPT_CACHE_DISK", "0") == "1"
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "talkyboi", "transcripts"
+)
+CACHE_MEMORY_ENTRIES = 128
+CACHE_MAX_MB = int(os.environ.get("CACHE_MAX_MB", "50"))
+
+# Recordings longer than LONG_AUDIO_S (after silence trimming) are split at
+# pauses into roughly CHUNK_S-second chunks (overlapping by CHUNK_OVERLAP_S
+# where no pause was found), transcribed CHUNK_WORKERS at a time; failed chunks are retried CHUNK_RETRIES times
+LONG_AUDIO_S = float(os.environ.get("LONG_AUDIO_S", "90"))
+CHUNK_S = float(os.environ.get("CHUNK_S", "30"))
+CHUNK_OVERLAP_S = float(os.environ.get("CHUNK_OVERLAP_S", "1"))
+CHUNK_WORKERS = int(os.environ.get("CHUNK_WORKERS", "4"))
+CHUNK_RETRIES = 2
+
+# Local Whisper models run in parallel worker processes (1 = in-process)
+WHISPER_REPLICAS = int(os.environ.get("WHISPER_REPLICAS", "1"))
+
+# Concurrent transcriptions, and recordings allowed to wait behind them
+TRANSCRIPTION_WORKERS = int(os.environ.get("TRANSCRIPTION_WORKERS", "2"))
+TRANSCRIPTION_QUEUE_SIZE = int(os.environ.get("TRANSCRIPTION_QUEUE_SIZE", "4"))
+
+# talkyboi-serve: concurrent transcriptions, requests allowed to wait, upload limit
+SERVER_HOST = os.environ.get("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.environ.get("SERVER_PORT", "8765"))
+SERVER_CONCURRENCY = int(os.environ.get("SERVER_CONCURRENCY", "4"))
+SERVER_QUEUE_SIZE = int(os.environ.get("SERVER_QUEUE_SIZE", "16"))
+SERVER_MAX_UPLOAD_MB = int(os.environ.get("SERVER_MAX_UPLOAD_MB", "25"))
+
 # Gemini settings
 GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-2.5-flash")
 
+# OpenAI model: whisper-1, or gpt-4o-transcribe / gpt-4o-mini-transcribe to
+# get partial results while transcribing
+OPENAI_MODEL = os.environ.get("OPENAI_MODEL", "whisper-1")
+
+# Upload encoding per cloud provider: wav, flac, or opus (flac/opus need soundfile)
+GEMINI_AUDIO_FORMAT = os.environ.get("GEMINI_AUDIO_FORMAT", "wav")
+OPENAI_AUDIO_FORMAT = os.environ.get("OPENAI_AUDIO_FORMAT", "wav")
+
 # Transcription prompt
 TRANSCRIPTION_PROMPT = """Transcribe this audio and clean it up for readability.
 
@@ -32,5 +98,21 @@ Instructions:
 
 Output only the cleaned transcription, nothing else."""
 
+# Voice activity detection (silence trimming before upload)
+VAD_ENABLED = os.environ.get("VAD_ENABLED", "1") == "1"
+VAD_MAX_PAUSE_MS = int(os.environ.get("VAD_MAX_PAUSE_MS", "700"))  # Longer pauses are squashed
+VAD_FRAME_MS = 20  # Analysis frame length
+VAD_PADDING_MS = 200  # Silence kept around each speech region
+VAD_MIN_ENERGY = 150  # RMS (int16 units) below which a frame is never speech
+VAD_ZCR_THRESHOLD = 0.25  # Zero-crossing rate that marks quiet fricatives as speech
+VAD_MIN_CONTRAST = 8.0  # Loud/quiet frame RMS ratio needed to estimate a noise floor
+
+# Local Whisper streaming: transcribe finished phrases while still recording
+WHISPER_STREAMING = os.environ.get("WHISPER_STREAMING", "0") == "1"
+STREAMING_PAUSE_MS = 400  # Gap between speech regions that ends a segment
+STREAMING_MIN_SEGMENT_S = 3  # Don't cut segments shorter than this
+STREAMING_MAX_SEGMENT_S = 25  # Force a cut if nobody pauses for this long
+STREAMING_POLL_MS = 250  # How often the live buffer is checked for pauses
+
 # UI settings
-MIN_RECORDING_DURATION_MS = 500  # Ignore recordings shorter than this
+MIN_RECORDING_DURATION_MS = 500  # Ignore recordings with less speech than this
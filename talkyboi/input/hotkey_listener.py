@@ -16,7 +16,8 @@ class HotkeyListener(QObject):
 
     def __init__(self, ptt_key=PTT_KEY):
         super().__init__()
-        self.ptt_key = ptt_key
+        # Accept a keyboard.Key name from config as well as a pynput key
+        self.ptt_key = getattr(keyboard.Key, ptt_key) if isinstance(ptt_key, str) else ptt_key
         self._is_pressed = False
         self._listener = None
 
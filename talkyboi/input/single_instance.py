@@ -0,0 +1,125 @@
+"""Local socket hand-off between talkyboi-quick and a running TalkyBoi."""
+
+import functools
+import getpass
+import logging
+import os
+from collections.abc import Callable
+from PySide6.QtCore import QObject
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+logger = logging.getLogger(__name__)
+
+# Commands understood by the resident instance
+QUICK_RECORD = "quick"
+
+# Replies to a command
+ACCEPTED = "ok"
+BUSY = "busy"
+
+
+@functools.cache
+def _socket_name() -> str:
+    """Name of the local socket, one per user.
+
+    Falls back to the numeric user id where there is no login name, as in
+    containers without a passwd entry for the user.
+    """
+    try:
+        user = getpass.getuser()
+    except (KeyError, OSError):
+        user = str(os.getuid())
+    return f"talkyboi-{user}"
+
+
+def forward_to_running_instance(command: str, timeout_ms: int = 1000) -> str | None:
+    """Ask a running TalkyBoi to handle a command instead of starting up.
+
+    Args:
+        command: Command to send, e.g. QUICK_RECORD
+        timeout_ms: How long to wait for the connection and the reply
+
+    Returns:
+        The instance's reply (ACCEPTED, BUSY, ...), or None if no instance
+        answered
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(_socket_name())
+    if not socket.waitForConnected(timeout_ms):
+        return None
+
+    socket.write(f"{command}\n".encode())
+    socket.waitForBytesWritten(timeout_ms)
+    reply = None
+    if socket.waitForReadyRead(timeout_ms):
+        reply = bytes(socket.readLine()).decode(errors="replace").strip()
+    socket.disconnectFromServer()
+    return reply
+
+
+class InstanceServer(QObject):
+    """Listens for commands from other TalkyBoi processes.
+
+    Calls quick_handler when talkyboi-quick hands a recording over; the
+    handler returns whether it took the recording, and the reply tells
+    talkyboi-quick whether to record on its own instead.
+    """
+
+    def __init__(self, quick_handler: Callable[[], bool]):
+        """Initialize the server.
+
+        Args:
+            quick_handler: Starts a quick recording, returning False if it cannot
+        """
+        super().__init__()
+        self._quick_handler = quick_handler
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+
+    def listen(self) -> bool:
+        """Start listening, taking over a stale socket left by a crashed instance.
+
+        Returns:
+            True if listening; False if another instance already owns the socket
+        """
+        if self._server.listen(_socket_name()):
+            logger.info(f"Listening for quick record requests on '{_socket_name()}'")
+            return True
+
+        probe = QLocalSocket()
+        probe.connectToServer(_socket_name())
+        if probe.waitForConnected(200):
+            probe.disconnectFromServer()
+            logger.warning("Another TalkyBoi instance is already running; not taking over quick record")
+            return False
+
+        QLocalServer.removeServer(_socket_name())
+        if self._server.listen(_socket_name()):
+            logger.info(f"Replaced stale socket '{_socket_name()}'")
+            return True
+        logger.warning(f"Could not listen on '{_socket_name()}': {self._server.errorString()}")
+        return False
+
+    def close(self):
+        """Stop listening."""
+        self._server.close()
+
+    def _on_new_connection(self):
+        """Read commands from a newly connected client."""
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def _on_ready_read(self, socket: QLocalSocket):
+        """Dispatch each complete command line and reply whether it was accepted."""
+        while socket.canReadLine():
+            command = bytes(socket.readLine()).decode(errors="replace").strip()
+            if command == QUICK_RECORD:
+                reply = ACCEPTED if self._quick_handler() else BUSY
+                socket.write(f"{reply}\n".encode())
+            else:
+                logger.warning(f"Unknown instance command: {command!r}")
+                socket.write(b"error\n")
+            socket.flush()
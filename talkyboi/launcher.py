@@ -0,0 +1,65 @@
+"""Entry points for TalkyBoi.
+
+Kept deliberately light: each entry point imports only what its mode
+needs, so talkyboi-quick can hand off to a running instance without
+loading the UI, NumPy or any provider SDK.
+"""
+
+import logging
+import sys
+from talkyboi import startup
+
+logger = logging.getLogger(__name__)
+
+
+def _enable_profiling(profile: bool):
+    """Profile each PTT cycle if asked to, here or with --profile on the command line."""
+    if profile or "--profile" in sys.argv[1:]:
+        from talkyboi import profiling
+
+        profiling.set_enabled(True)
+
+
+def run(profile: bool = False):
+    """Run the TalkyBoi application.
+
+    Args:
+        profile: Profile each push-to-talk cycle, see talkyboi.profiling
+    """
+    from talkyboi.app import TalkyBoiApp
+
+    _enable_profiling(profile)
+
+    logger.info("Initializing TalkyBoi")
+    app = TalkyBoiApp()
+    sys.exit(app.run())
+
+
+def run_quick(profile: bool = False):
+    """Run TalkyBoi in quick record mode.
+
+    Hands the request to a running TalkyBoi if there is one, which starts
+    recording immediately; otherwise, or if it is busy recording or still
+    loading, starts a standalone quick recorder.
+
+    Args:
+        profile: Profile the recording when running standalone; a running
+            TalkyBoi profiles according to its own setting
+    """
+    from talkyboi.input.single_instance import forward_to_running_instance, ACCEPTED, QUICK_RECORD
+
+    reply = forward_to_running_instance(QUICK_RECORD)
+    if reply == ACCEPTED:
+        startup.mark("forwarded")
+        logger.info("Quick record handed to running TalkyBoi")
+        sys.exit(0)
+    if reply is not None:
+        logger.info(f"Running TalkyBoi declined quick record ({reply}), recording standalone")
+
+    from talkyboi.app import QuickRecordApp
+
+    _enable_profiling(profile)
+
+    logger.info("Initializing TalkyBoi quick mode")
+    app = QuickRecordApp()
+    sys.exit(app.run())
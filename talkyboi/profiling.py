@@ -0,0 +1,272 @@
+"""On-demand profiling of push-to-talk cycles.
+
+While profiling is on (--profile, TALKYBOI_PROFILE=1 or the Profile
+button in the main window), each cycle from the PTT press to the
+transcript being shown runs under cProfile and tracemalloc. One cycle is
+profiled at a time; a press while one is still in progress is not
+profiled. Every profiled cycle writes to TALKYBOI_PROFILE_DIR:
+
+    <stamp>-<n>.pstats      cProfile stats, for pstats or snakeviz
+    <stamp>-<n>.alloc.txt   tracemalloc peak and top allocating lines
+    <stamp>-<n>.collapsed   sampled stacks of every thread, one
+                            "frame;frame;... count" per line, for
+                            flamegraph.pl or speedscope
+
+Before Python 3.12 cProfile only sees the thread that enabled it, so
+the GUI thread and the transcription worker are profiled separately and
+merged; threads the worker hands work to (chunks, hedged requests) only
+show up in the collapsed stacks.
+"""
+
+import contextlib
+import cProfile
+import itertools
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.environ.get("TALKYBOI_PROFILE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "talkyboi", "profiles"
+)
+# Interval between stack samples for the collapsed output
+PROFILE_SAMPLE_MS = float(os.environ.get("TALKYBOI_PROFILE_SAMPLE_MS", "5"))
+
+# Allocating lines listed per report
+_TOP_ALLOCATIONS = 25
+# From 3.12 cProfile hooks every thread through sys.monitoring
+_ALL_THREADS = sys.version_info >= (3, 12)
+
+_NULL = contextlib.nullcontext()
+_ids = itertools.count(1)
+_local = threading.local()
+_enabled = os.environ.get("TALKYBOI_PROFILE") == "1"
+# The session being profiled, if any
+_active = None
+
+
+class StackSampler:
+    """Samples the stacks of all threads and counts them in collapsed form."""
+
+    def __init__(self, interval_s: float = PROFILE_SAMPLE_MS / 1000):
+        self.interval_s = interval_s
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="profile-sampler")
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.counts[";".join(reversed(stack))] += 1
+
+    def write(self, path: str):
+        """Write the samples as collapsed stacks, most frequent first."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Session:
+    """Profilers, allocation tracing and stack samples of one PTT cycle."""
+
+    def __init__(self):
+        self.id = next(_ids)
+        self.name = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.id}"
+        self.start = time.monotonic()
+        self.finished = False
+        self._profile = cProfile.Profile()
+        self._thread_profiles = []
+        self._sampler = StackSampler()
+        self._baseline = None
+        self._own_tracemalloc = False
+        self._lock = threading.Lock()
+
+    def begin(self):
+        """Start tracing allocations, sampling stacks and profiling this thread."""
+        if tracemalloc.is_tracing():
+            # Someone else traces too; report only what this cycle added
+            self._baseline = tracemalloc.take_snapshot()
+        else:
+            tracemalloc.start()
+            self._own_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._sampler.start()
+        try:
+            self._profile.enable()
+        except ValueError as e:
+            logger.warning(f"cProfile unavailable, another profiler is active: {e}")
+            self._profile = None
+
+    @contextlib.contextmanager
+    def profile_thread(self):
+        """Profile the calling thread for the duration, where cProfile needs it."""
+        if _ALL_THREADS or self.finished:
+            yield
+            return
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                self._thread_profiles.append(profile)
+
+    def stop(self, status: str):
+        """Stop collecting and write the reports on a background thread."""
+        self.finished = True
+        if self._profile is not None:
+            self._profile.disable()
+        self._sampler.stop()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if self._own_tracemalloc:
+            tracemalloc.stop()
+        elapsed = time.monotonic() - self.start
+        threading.Thread(
+            target=self._write, args=(snapshot, peak, status, elapsed), daemon=True, name="profile-writer"
+        ).start()
+
+    def _write(self, snapshot: tracemalloc.Snapshot, peak: int, status: str, elapsed: float):
+        base = os.path.join(PROFILE_DIR, self.name)
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            self._write_stats(base + ".pstats")
+            self._write_allocations(base + ".alloc.txt", snapshot, peak)
+            self._sampler.write(base + ".collapsed")
+        except OSError as e:
+            logger.warning(f"Could not write profile to {PROFILE_DIR}: {e}")
+            return
+        logger.info(f"Profile of utterance {self.id} ({status}, {elapsed:.2f}s) written to {base}.*")
+
+    def _write_stats(self, path: str):
+        """Merge the cycle's profiles into one .pstats file."""
+        with self._lock:
+            profiles = [p for p in (self._profile, *self._thread_profiles) if p is not None]
+        stats = None
+        for profile in profiles:
+            try:
+                if stats is None:
+                    stats = pstats.Stats(profile)
+                else:
+                    stats.add(profile)
+            except TypeError:
+                # A profile that saw no calls
+                continue
+        if stats is not None:
+            stats.dump_stats(path)
+
+    def _write_allocations(self, path: str, snapshot: tracemalloc.Snapshot, peak: int):
+        """Write the peak and the lines that allocated most during the cycle."""
+        ignore = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        )
+        snapshot = snapshot.filter_traces(ignore)
+        if self._baseline is not None:
+            top = snapshot.compare_to(self._baseline.filter_traces(ignore), "lineno")
+        else:
+            top = snapshot.statistics("lineno")
+        lines = [
+            f"Peak traced memory: {peak / 2**20:.1f} MiB",
+            f"Top {_TOP_ALLOCATIONS} lines by memory allocated during the cycle and still live at its end:",
+            "",
+            *(str(stat) for stat in top[:_TOP_ALLOCATIONS]),
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def set_enabled(enabled: bool):
+    """Turn profiling of upcoming PTT cycles on or off.
+
+    A cycle already being profiled still finishes and is written.
+    """
+    global _enabled
+    if enabled != _enabled:
+        logger.info(f"Profiling {'enabled, writing to ' + PROFILE_DIR if enabled else 'disabled'}")
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    """Whether upcoming PTT cycles are profiled."""
+    return _enabled
+
+
+def begin() -> Session | None:
+    """Start a PTT cycle on this thread, profiling it if profiling is on.
+
+    Returns:
+        The session, or None if this cycle is not profiled
+    """
+    global _active
+    session = None
+    if _enabled:
+        if _active is None:
+            session = _active = Session()
+            session.begin()
+        else:
+            logger.debug(f"Utterance {_active.id} is still being profiled, not profiling this one")
+    _local.session = session
+    return session
+
+
+def current() -> Session | None:
+    """This thread's unfinished session, if any."""
+    session = getattr(_local, "session", None)
+    return session if session is not None and not session.finished else None
+
+
+@contextlib.contextmanager
+def activate(session: Session | None):
+    """Context manager making session current on this thread for its duration."""
+    previous = getattr(_local, "session", None)
+    _local.session = session
+    try:
+        yield session
+    finally:
+        _local.session = previous
+
+
+def profile_thread(session: Session | None):
+    """Context manager profiling this thread as part of session, if any."""
+    return _NULL if session is None else session.profile_thread()
+
+
+def finish(session: Session | None = None, status: str = "ok"):
+    """End a profiled cycle and write its reports.
+
+    Args:
+        session: Session to end; the current one if not given
+        status: Outcome logged with it (ok, error, ...)
+    """
+    global _active
+    session = session or current()
+    if session is None or session.finished:
+        return
+    if _active is session:
+        _active = None
+    session.stop(status)
@@ -0,0 +1,462 @@
+"""OpenAI-compatible transcription server.
+
+Usage:
+    talkyboi-serve [--host 127.0.0.1] [--port 8765] [--concurrency 4] [--queue 16]
+
+Serves POST /v1/audio/transcriptions with the multipart form of the
+OpenAI API, so OpenAI SDKs and scripts work against TalkyBoi by pointing
+their base URL here. Requests are transcribed by the configured provider
+stack. GET /metrics reports counters in Prometheus text format.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from talkyboi.audio.audio_utils import BufferReader, load_audio_file
+from talkyboi.config import (
+    SAMPLE_RATE,
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_CONCURRENCY,
+    SERVER_QUEUE_SIZE,
+    SERVER_MAX_UPLOAD_MB,
+)
+from talkyboi.transcription import create_transcription_client
+from talkyboi.transcription.base import TranscriptionClient
+from talkyboi.transcription.pipeline import transcribe_audio
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPTIONS_PATH = "/v1/audio/transcriptions"
+METRICS_PATH = "/metrics"
+
+# Request line plus headers, and a multipart part's headers
+_MAX_HEADER_BYTES = 16 * 1024
+# Text form fields (model, prompt, response_format, ...)
+_MAX_FIELD_BYTES = 64 * 1024
+# Body bytes read from the socket at a time
+_READ_SIZE = 64 * 1024
+# Close keep-alive connections idle for this long
+_IDLE_TIMEOUT_S = 60
+
+# Upper bounds of the request duration histogram, in seconds
+_LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 30, 60, 120)
+
+
+class HttpError(Exception):
+    """A request that gets an error response instead of a transcript."""
+
+    def __init__(self, status: int, message: str, headers: dict[str, str] | None = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class MultipartParser:
+    """Incremental multipart/form-data parser over a request body.
+
+    The body is read in _READ_SIZE pieces and the "file" part is appended
+    straight into one bytearray as it arrives, so an upload is held in
+    memory once. Other parts are small text fields.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, boundary: bytes, length: int, max_file_bytes: int):
+        """Prepare to parse a body.
+
+        Args:
+            reader: Connection stream, positioned at the start of the body
+            boundary: Boundary from the Content-Type header
+            length: Content-Length of the body
+            max_file_bytes: Largest upload accepted
+        """
+        self._reader = reader
+        self._remaining = length
+        self._buffer = bytearray()
+        self._delimiter = b"--" + boundary
+        self.max_file_bytes = max_file_bytes
+        self.fields: dict[str, str] = {}
+        self.file: bytearray | None = None
+        self.filename = "audio"
+
+    async def parse(self):
+        """Read the whole body into fields and file."""
+        await self._read_until(self._delimiter)
+        separator = b"\r\n" + self._delimiter
+        while True:
+            while len(self._buffer) < 2:
+                await self._fill()
+            if self._buffer[:2] == b"--":
+                break
+            name, filename = _parse_disposition(await self._read_until(b"\r\n\r\n"))
+            if name == "file":
+                self.file = bytearray()
+                self.filename = filename or self.filename
+                await self._read_part(self.file, separator, self.max_file_bytes)
+            else:
+                value = bytearray()
+                await self._read_part(value, separator, _MAX_FIELD_BYTES)
+                self.fields[name] = value.decode("utf-8", "replace")
+        await self.drain()
+
+    async def drain(self):
+        """Discard the rest of the body so the connection can be reused."""
+        while self._remaining > 0:
+            await self._fill()
+            self._buffer.clear()
+
+    async def _fill(self):
+        """Append the next piece of the body to the buffer."""
+        if self._remaining <= 0:
+            raise HttpError(400, "Malformed multipart body")
+        chunk = await self._reader.read(min(_READ_SIZE, self._remaining))
+        if not chunk:
+            raise HttpError(400, "Connection closed during upload")
+        self._remaining -= len(chunk)
+        self._buffer += chunk
+
+    async def _read_until(self, marker: bytes) -> bytes:
+        """Consume the buffer up to and including marker; return what preceded it."""
+        while (index := self._buffer.find(marker)) < 0:
+            if len(self._buffer) > _MAX_HEADER_BYTES:
+                raise HttpError(400, "Malformed multipart body")
+            await self._fill()
+        data = bytes(self._buffer[:index])
+        del self._buffer[:index + len(marker)]
+        return data
+
+    async def _read_part(self, target: bytearray, separator: bytes, limit: int):
+        """Move a part's content into target, up to the next separator.
+
+        Everything but a separator-sized tail is moved on each read, so the
+        buffer stays small however large the part is.
+        """
+        keep = len(separator) - 1
+        while (index := self._buffer.find(separator)) < 0:
+            if len(self._buffer) > keep:
+                moved = len(self._buffer) - keep
+                with memoryview(self._buffer) as view:
+                    target += view[:moved]
+                del self._buffer[:moved]
+                if len(target) > limit:
+                    raise HttpError(413, f"Upload larger than {limit // (1024 * 1024)} MB")
+            await self._fill()
+        with memoryview(self._buffer) as view:
+            target += view[:index]
+        del self._buffer[:index + len(separator)]
+        if len(target) > limit:
+            raise HttpError(413, f"Upload larger than {limit // (1024 * 1024)} MB")
+
+
+def _parse_disposition(headers: bytes) -> tuple[str, str | None]:
+    """Get the field name and file name from a part's headers."""
+    for line in headers.decode("utf-8", "replace").split("\r\n"):
+        key, _, value = line.partition(":")
+        if key.strip().lower() != "content-disposition":
+            continue
+        params = {}
+        for item in value.split(";")[1:]:
+            k, _, v = item.strip().partition("=")
+            params[k.lower()] = v.strip('"')
+        return params.get("name", ""), params.get("filename")
+    raise HttpError(400, "Multipart part without Content-Disposition")
+
+
+class ServerMetrics:
+    """Request counters, rendered in Prometheus text format.
+
+    Only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(self):
+        self.responses = Counter()
+        self.upload_bytes = 0
+        self.audio_seconds = 0.0
+        self.latency_buckets = [0] * len(_LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.latency_count = 0
+
+    def observe(self, seconds: float):
+        """Record the duration of a transcription request."""
+        self.latency_sum += seconds
+        self.latency_count += 1
+        for i, bound in enumerate(_LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.latency_buckets[i] += 1
+
+    def render(self, active: int, queued: int) -> str:
+        """Format all metrics.
+
+        Args:
+            active: Requests being transcribed
+            queued: Requests uploading or waiting for a transcription slot
+        """
+        lines = [
+            "# TYPE talkyboi_responses_total counter",
+            *(f'talkyboi_responses_total{{code="{code}"}} {n}' for code, n in sorted(self.responses.items())),
+            "# TYPE talkyboi_requests_active gauge",
+            f"talkyboi_requests_active {active}",
+            "# TYPE talkyboi_requests_queued gauge",
+            f"talkyboi_requests_queued {queued}",
+            "# TYPE talkyboi_upload_bytes_total counter",
+            f"talkyboi_upload_bytes_total {self.upload_bytes}",
+            "# TYPE talkyboi_audio_seconds_total counter",
+            f"talkyboi_audio_seconds_total {self.audio_seconds:.3f}",
+            "# TYPE talkyboi_request_duration_seconds histogram",
+            *(
+                f'talkyboi_request_duration_seconds_bucket{{le="{bound}"}} {n}'
+                for bound, n in zip(_LATENCY_BUCKETS, self.latency_buckets)
+            ),
+            f'talkyboi_request_duration_seconds_bucket{{le="+Inf"}} {self.latency_count}',
+            f"talkyboi_request_duration_seconds_sum {self.latency_sum:.3f}",
+            f"talkyboi_request_duration_seconds_count {self.latency_count}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class TranscriptionServer:
+    """Serves transcriptions over HTTP/1.1 on asyncio.
+
+    At most `concurrency` requests are transcribed at once, on a thread
+    pool; up to `queue_size` more may be uploading or waiting for a slot.
+    Anything beyond that is refused with 429 before its body is read.
+    """
+
+    def __init__(
+        self,
+        client: TranscriptionClient,
+        concurrency: int = SERVER_CONCURRENCY,
+        queue_size: int = SERVER_QUEUE_SIZE,
+        max_upload_bytes: int = SERVER_MAX_UPLOAD_MB * 1024 * 1024,
+    ):
+        """Set up the server around a transcription client.
+
+        Args:
+            client: Client that transcribes every request
+            concurrency: Requests transcribed at the same time
+            queue_size: Further requests allowed to wait
+            max_upload_bytes: Largest audio file accepted
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.max_upload_bytes = max_upload_bytes
+        self.metrics = ServerMetrics()
+        self._slots = asyncio.Semaphore(concurrency)
+        self._executor = ThreadPoolExecutor(concurrency, thread_name_prefix="serve")
+        self._admitted = 0
+        self._active = 0
+
+    async def serve(self, host: str = SERVER_HOST, port: int = SERVER_PORT):
+        """Accept connections until cancelled."""
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=_MAX_HEADER_BYTES)
+        logger.info(
+            f"Listening on http://{host}:{port}{TRANSCRIPTIONS_PATH} "
+            f"({self.concurrency} concurrent, {self.queue_size} queued)"
+        )
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until either side closes it."""
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    method, path, headers = await asyncio.wait_for(_read_head(reader), _IDLE_TIMEOUT_S)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except (asyncio.LimitOverrunError, ValueError):
+                    await self._respond(writer, HttpError(400, "Malformed request"), False)
+                    break
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    status, body, content_type = await self._dispatch(method, path, headers, reader)
+                except HttpError as e:
+                    # The body may be unread, so the connection cannot be reused
+                    keep_alive = False
+                    await self._respond(writer, e, keep_alive)
+                    continue
+                self.metrics.responses[status] += 1
+                writer.write(_response_head(status, len(body), content_type, keep_alive) + body)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, error: HttpError, keep_alive: bool):
+        """Send an error in the OpenAI error format."""
+        self.metrics.responses[error.status] += 1
+        body = json.dumps({
+            "error": {"message": str(error), "type": "invalid_request_error" if error.status < 500 else "server_error"}
+        }).encode()
+        writer.write(_response_head(error.status, len(body), "application/json", keep_alive, error.headers) + body)
+        await writer.drain()
+
+    async def _dispatch(self, method: str, path: str, headers: dict, reader) -> tuple[int, bytes, str]:
+        """Route a request.
+
+        Returns:
+            (status, body, content type)
+        """
+        path = path.split("?", 1)[0]
+        if path == TRANSCRIPTIONS_PATH:
+            if method != "POST":
+                raise HttpError(405, f"{method} not allowed", {"Allow": "POST"})
+            started = time.monotonic()
+            try:
+                return await self._transcribe(headers, reader)
+            finally:
+                self.metrics.observe(time.monotonic() - started)
+        if path == METRICS_PATH:
+            if method != "GET":
+                raise HttpError(405, f"{method} not allowed", {"Allow": "GET"})
+            text = self.metrics.render(self._active, self._admitted - self._active)
+            return 200, text.encode(), "text/plain; version=0.0.4"
+        raise HttpError(404, f"No route for {path}")
+
+    async def _transcribe(self, headers: dict, reader) -> tuple[int, bytes, str]:
+        """Handle an upload: admit or refuse it, read it, then transcribe it."""
+        if self._admitted >= self.concurrency + self.queue_size:
+            logger.warning("Refusing request: transcription queue full")
+            raise HttpError(429, "Too many requests waiting, retry shortly", {"Retry-After": "1"})
+
+        if "content-length" not in headers:
+            raise HttpError(411, "Content-Length required")
+        try:
+            length = int(headers["content-length"])
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HttpError(400, "Invalid Content-Length")
+        if length > self.max_upload_bytes + _MAX_FIELD_BYTES:
+            raise HttpError(413, f"Upload larger than {self.max_upload_bytes // (1024 * 1024)} MB")
+        content_type, _, params = headers.get("content-type", "").partition(";")
+        boundary = params.strip().partition("boundary=")[2].strip('"')
+        if content_type.strip().lower() != "multipart/form-data" or not boundary:
+            raise HttpError(400, "Expected multipart/form-data")
+
+        self._admitted += 1
+        try:
+            parser = MultipartParser(reader, boundary.encode(), length, self.max_upload_bytes)
+            await parser.parse()
+            if parser.file is None:
+                raise HttpError(400, "Missing 'file' field")
+            response_format = parser.fields.get("response_format", "json")
+            if response_format not in ("json", "text"):
+                raise HttpError(400, f"Unsupported response_format: {response_format}")
+            self.metrics.upload_bytes += len(parser.file)
+
+            async with self._slots:
+                self._active += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    text, duration_s = await loop.run_in_executor(
+                        self._executor, self._transcribe_upload, parser.file, parser.filename
+                    )
+                finally:
+                    self._active -= 1
+        finally:
+            self._admitted -= 1
+
+        self.metrics.audio_seconds += duration_s
+        if response_format == "text":
+            return 200, text.encode(), "text/plain; charset=utf-8"
+        return 200, json.dumps({"text": text}, ensure_ascii=False).encode(), "application/json"
+
+    def _transcribe_upload(self, data: bytearray, filename: str) -> tuple[str, float]:
+        """Decode and transcribe an upload (runs on the thread pool).
+
+        Returns:
+            (transcript, audio seconds)
+        """
+        try:
+            audio = load_audio_file(BufferReader(data, name=filename))
+        except ValueError as e:
+            raise HttpError(400, f"Could not decode audio: {e}")
+        duration_s = len(audio) / SAMPLE_RATE
+        logger.info(f"Transcribing {filename} ({duration_s:.1f}s)")
+        try:
+            return transcribe_audio(self.client, audio, min_speech_ms=0), duration_s
+        except TimeoutError as e:
+            raise HttpError(504, f"Transcription timed out: {e}")
+        except Exception as e:
+            logger.error(f"Transcription of {filename} failed: {e}")
+            raise HttpError(502, f"Transcription failed: {e}")
+
+
+async def _read_head(reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str]]:
+    """Read a request line and headers.
+
+    Returns:
+        (method, path, headers with lower-case names)
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+    method, path, _version = request_line.split(" ")
+    headers = {}
+    for line in header_lines:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return method, path, headers
+
+
+def _response_head(
+    status: int, length: int, content_type: str, keep_alive: bool, extra: dict[str, str] | None = None
+) -> bytes:
+    """Build a response's status line and headers."""
+    lines = [
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+        f"Content-Type: {content_type}",
+        f"Content-Length: {length}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        *(f"{name}: {value}" for name, value in (extra or {}).items()),
+    ]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def main(argv: list[str] | None = None):
+    """Run the server."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=SERVER_HOST, help="Address to listen on")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="Port to listen on")
+    parser.add_argument("--concurrency", type=int, default=SERVER_CONCURRENCY, help="Concurrent transcriptions")
+    parser.add_argument("--queue", type=int, default=SERVER_QUEUE_SIZE, help="Requests allowed to wait before 429")
+    args = parser.parse_args(argv)
+
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s",
+                            datefmt="%H:%M:%S")
+
+    try:
+        client = create_transcription_client()
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    try:
+        client.prewarm()
+    except Exception as e:
+        logger.warning(f"Transcription client prewarm failed: {e}")
+
+    server = TranscriptionServer(client, args.concurrency, args.queue)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""Startup milestones for measuring time-to-window and time-to-first-sample.
+
+With TALKYBOI_STARTUP_TRACE=1 each milestone is written to stderr as
+"talkyboi-startup <event> <monotonic seconds>". CLOCK_MONOTONIC is shared
+by all processes, so a harness can subtract its own launch timestamp.
+TALKYBOI_STARTUP_PROBE=1 additionally starts a recording as soon as the
+window is up and exits once the first audio sample arrives.
+"""
+
+import os
+import sys
+import time
+
+STARTUP_TRACE = os.environ.get("TALKYBOI_STARTUP_TRACE") == "1"
+STARTUP_PROBE = os.environ.get("TALKYBOI_STARTUP_PROBE") == "1"
+
+MARK_PREFIX = "talkyboi-startup"
+
+
+def mark(event: str):
+    """Record a startup milestone if tracing is enabled."""
+    if STARTUP_TRACE:
+        print(f"{MARK_PREFIX} {event} {time.monotonic():.6f}", file=sys.stderr, flush=True)
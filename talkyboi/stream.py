@@ -0,0 +1,254 @@
+"""Transcribe a continuous raw PCM stream from stdin or a FIFO.
+
+Usage:
+    arecord -f S16_LE -r 16000 -c 1 -t raw | talkyboi-stream
+    ffmpeg -i input.mp4 -f s16le -ac 1 -ar 16000 - | talkyboi-stream
+    talkyboi-stream /path/to/fifo [--workers 2]
+
+Input is 16 kHz mono signed 16-bit little-endian PCM. The stream is cut
+into segments at pauses, the same way the live recorder is during
+incremental transcription, and each segment's transcript is written to
+stdout as one JSON line, in stream order, as soon as it is ready.
+"""
+
+import argparse
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from typing import BinaryIO
+import numpy as np
+from talkyboi.audio.audio_utils import find_pause
+from talkyboi.config import (
+    SAMPLE_RATE,
+    STREAMING_PAUSE_MS,
+    STREAMING_MIN_SEGMENT_S,
+    STREAMING_MAX_SEGMENT_S,
+    STREAMING_POLL_MS,
+)
+from talkyboi.transcription import create_transcription_client
+from talkyboi.transcription.base import TranscriptionClient
+from talkyboi.transcription.pipeline import transcribe_audio
+
+logger = logging.getLogger(__name__)
+
+# Chunks read ahead of the segmenter (about 16 s at the default chunk size)
+_READ_AHEAD_CHUNKS = 64
+
+
+class PauseSegmenter:
+    """Cuts a stream of samples into segments at pauses.
+
+    Samples accumulate in a fixed buffer of max_s seconds; once at least
+    min_s seconds are pending, every poll_ms of new audio is checked for a
+    pause. A full buffer is cut even without one, so memory stays bounded
+    however long the stream runs.
+    """
+
+    def __init__(
+        self,
+        pause_ms: int = STREAMING_PAUSE_MS,
+        min_s: float = STREAMING_MIN_SEGMENT_S,
+        max_s: float = STREAMING_MAX_SEGMENT_S,
+        poll_ms: int = STREAMING_POLL_MS,
+    ):
+        """Set up the segmenter.
+
+        Args:
+            pause_ms: Gap between speech regions that ends a segment
+            min_s: Don't cut segments shorter than this
+            max_s: Force a cut if nobody pauses for this long
+            poll_ms: Audio to collect between pause checks
+        """
+        self.pause_ms = pause_ms
+        self._min = int(min_s * SAMPLE_RATE)
+        self._poll = SAMPLE_RATE * poll_ms // 1000
+        self._buffer = np.empty(int(max_s * SAMPLE_RATE), dtype=np.int16)
+        self._fill = 0
+        self._unchecked = 0
+        # Stream position of the first pending sample
+        self.offset = 0
+
+    def push(self, samples: np.ndarray) -> list[tuple[int, np.ndarray]]:
+        """Add samples and return any segments they complete.
+
+        Returns:
+            (start sample in the stream, segment samples) per finished segment
+        """
+        segments = []
+        while len(samples):
+            take = min(len(samples), len(self._buffer) - self._fill)
+            self._buffer[self._fill:self._fill + take] = samples[:take]
+            self._fill += take
+            self._unchecked += take
+            samples = samples[take:]
+
+            full = self._fill == len(self._buffer)
+            if full or (self._fill >= self._min and self._unchecked >= self._poll):
+                self._unchecked = 0
+                cut = find_pause(self._buffer[:self._fill], self.pause_ms)
+                if cut is None and full:
+                    logger.debug("No pause found, forcing a segment cut")
+                    cut = self._fill
+                if cut:
+                    segments.append(self._take(cut))
+        return segments
+
+    def flush(self) -> tuple[int, np.ndarray] | None:
+        """Return whatever is still pending as a final segment."""
+        return self._take(self._fill) if self._fill else None
+
+    def _take(self, cut: int) -> tuple[int, np.ndarray]:
+        """Remove the first cut samples from the buffer as a segment."""
+        segment = self._buffer[:cut].copy()
+        self._buffer[:self._fill - cut] = self._buffer[cut:self._fill]
+        self._fill -= cut
+        start = self.offset
+        self.offset += cut
+        return start, segment
+
+
+class StreamTranscriber:
+    """Reads, segments and transcribes a PCM stream in a pipeline.
+
+    reader -> segmenter -> workers -> ordered writer, connected by bounded
+    queues: reading and segmenting continue while earlier segments are
+    encoded and transcribed. If transcription falls behind, the queues fill
+    and reading stops, which backs the pressure up into the producing
+    process instead of growing memory.
+    """
+
+    def __init__(self, client: TranscriptionClient, workers: int = 2, chunk_ms: int = STREAMING_POLL_MS):
+        """Set up the pipeline.
+
+        Args:
+            client: Transcription client shared by the workers
+            workers: Segments transcribed at the same time
+            chunk_ms: Audio read from the input at a time
+        """
+        self.client = client
+        self.workers = workers
+        self.chunk_bytes = 2 * (SAMPLE_RATE * chunk_ms // 1000)
+        self._chunks = queue.Queue(maxsize=_READ_AHEAD_CHUNKS)
+        self._segments = queue.Queue(maxsize=workers)
+        self._results = queue.Queue()
+
+    def run(self, source: BinaryIO, out) -> int:
+        """Transcribe the stream until it ends.
+
+        Args:
+            source: Binary input of raw PCM
+            out: Text output for the JSON lines
+
+        Returns:
+            Number of segments that failed
+        """
+        threads = [
+            threading.Thread(target=self._read, args=(source,), name="stream-reader", daemon=True),
+            threading.Thread(target=self._segment, name="stream-segmenter", daemon=True),
+        ] + [
+            threading.Thread(target=self._transcribe, name=f"stream-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        return self._write(out)
+
+    def _read(self, source: BinaryIO):
+        """Read fixed-size chunks until end of input."""
+        while chunk := source.read(self.chunk_bytes):
+            if len(chunk) % 2:
+                chunk = chunk[:-1]
+            self._chunks.put(np.frombuffer(chunk, dtype="<i2"))
+        self._chunks.put(None)
+
+    def _segment(self):
+        """Cut chunks into segments and hand them to the workers."""
+        segmenter = PauseSegmenter()
+        index = 0
+        while (chunk := self._chunks.get()) is not None:
+            for start, samples in segmenter.push(chunk):
+                self._segments.put((index, start, samples, time.monotonic()))
+                index += 1
+        if tail := segmenter.flush():
+            self._segments.put((index, *tail, time.monotonic()))
+            index += 1
+        logger.info(f"End of input after {segmenter.offset / SAMPLE_RATE:.1f}s, {index} segments")
+        for _ in range(self.workers):
+            self._segments.put(None)
+        self._results.put((index, None))
+
+    def _transcribe(self):
+        """Transcribe segments until told to stop."""
+        while (item := self._segments.get()) is not None:
+            index, start, samples, cut_at = item
+            record = {
+                "segment": index,
+                "start_s": round(start / SAMPLE_RATE, 3),
+                "end_s": round((start + len(samples)) / SAMPLE_RATE, 3),
+            }
+            try:
+                record["text"] = transcribe_audio(self.client, samples, min_speech_ms=0)
+            except Exception as e:
+                logger.error(f"Segment {index} failed: {e}")
+                record["error"] = str(e)
+            record["latency_s"] = round(time.monotonic() - cut_at, 3)
+            self._results.put((index, record))
+
+    def _write(self, out) -> int:
+        """Write results in segment order as they arrive; return the failure count."""
+        held = {}
+        next_index = 0
+        total = None
+        failed = 0
+        while total is None or next_index < total:
+            index, record = self._results.get()
+            if record is None:
+                total = index
+                continue
+            held[index] = record
+            while next_index in held:
+                record = held.pop(next_index)
+                next_index += 1
+                if "error" in record:
+                    failed += 1
+                elif not record["text"]:
+                    continue
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+        return failed
+
+
+def main(argv: list[str] | None = None):
+    """Run the streaming CLI."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", nargs="?", default="-", help="FIFO or file of raw PCM (default: stdin)")
+    parser.add_argument("--workers", "-j", type=int, default=2, help="Segments transcribed at the same time")
+    args = parser.parse_args(argv)
+
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s",
+                            datefmt="%H:%M:%S", stream=sys.stderr)
+
+    try:
+        client = create_transcription_client()
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    try:
+        failed = StreamTranscriber(client, args.workers).run(source, sys.stdout)
+    except KeyboardInterrupt:
+        failed = 0
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        client.close()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Per-utterance stage timings.
+
+With TALKYBOI_TIMING=1 each recording gets a Trace, and every pipeline
+stage it passes through (capture teardown, queueing, VAD, encoding,
+upload, provider processing, decoding, UI update) adds a span with
+monotonic start and end times. Finished traces are appended to
+TALKYBOI_TIMING_FILE as JSON lines; with TALKYBOI_TIMING_PROM set, a
+Prometheus textfile summarizing all stages is rewritten after each one.
+
+Disabled, span() and bind() return shared no-ops, so instrumented code
+pays one call and a flag test per stage.
+
+Stages run on several threads. The trace of the work in progress is
+thread-local: code handing work to another thread wraps it with bind(),
+or captures current() and re-enters it there with activate().
+"""
+
+import contextlib
+import itertools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+TIMING_ENABLED = os.environ.get("TALKYBOI_TIMING") == "1"
+TIMING_FILE = os.environ.get("TALKYBOI_TIMING_FILE") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "talkyboi", "timings.jsonl"
+)
+TIMING_PROM = os.environ.get("TALKYBOI_TIMING_PROM", "")
+
+# Upper bounds of the utterance latency histogram, in seconds
+_LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 30, 60)
+
+_NULL = contextlib.nullcontext()
+_ids = itertools.count(1)
+_local = threading.local()
+
+
+class Trace:
+    """Stage timings of one utterance."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.id = next(_ids)
+        self.start = time.monotonic()
+        self.end = None
+        self.spans = []
+        self.attrs = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, start: float, end: float):
+        """Record a stage that ran from start to end (monotonic seconds)."""
+        with self._lock:
+            self.spans.append((stage, start, end, threading.current_thread().name))
+
+    def latency(self) -> float:
+        """Seconds from the end of recording (release) to the end of the trace."""
+        released = max((end for stage, _, end, _ in self.spans if stage == "recording"), default=self.start)
+        return self.end - released
+
+    def to_dict(self) -> dict:
+        """The trace as a JSON-serializable record, times in ms from its start."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "total_ms": round((self.end - self.start) * 1000, 3),
+            "latency_ms": round(self.latency() * 1000, 3),
+            **self.attrs,
+            "stages": [
+                {
+                    "stage": stage,
+                    "at_ms": round((start - self.start) * 1000, 3),
+                    "ms": round((end - start) * 1000, 3),
+                    "thread": thread,
+                }
+                for stage, start, end, thread in sorted(self.spans, key=lambda s: s[1])
+            ],
+        }
+
+
+class _Span:
+    """Context manager adding one span to a trace."""
+
+    __slots__ = ("trace", "stage", "start")
+
+    def __init__(self, trace: Trace, stage: str):
+        self.trace = trace
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.monotonic()
+
+    def __exit__(self, *exc):
+        self.trace.add(self.stage, self.start, time.monotonic())
+
+
+def begin(name: str = "utterance") -> Trace | None:
+    """Start a trace and make it this thread's current one.
+
+    Returns:
+        The trace, or None if timing is disabled
+    """
+    if not TIMING_ENABLED:
+        return None
+    trace = _local.trace = Trace(name)
+    return trace
+
+
+def current() -> Trace | None:
+    """This thread's unfinished trace, if any."""
+    if not TIMING_ENABLED:
+        return None
+    trace = getattr(_local, "trace", None)
+    return trace if trace is not None and trace.end is None else None
+
+
+def activate(trace: Trace | None):
+    """Context manager making trace current on this thread for its duration."""
+    if not TIMING_ENABLED:
+        return _NULL
+    return _activate(trace)
+
+
+@contextlib.contextmanager
+def _activate(trace: Trace | None):
+    previous = getattr(_local, "trace", None)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+def bind(fn: Callable) -> Callable:
+    """Wrap fn to run under the current trace, for handing to another thread."""
+    trace = current()
+    if trace is None:
+        return fn
+
+    def traced(*args, **kwargs):
+        with _activate(trace):
+            return fn(*args, **kwargs)
+
+    return traced
+
+
+def span(stage: str):
+    """Context manager timing a stage of the current trace, if any."""
+    if not TIMING_ENABLED:
+        return _NULL
+    trace = current()
+    return _NULL if trace is None else _Span(trace, stage)
+
+
+def record(stage: str, start: float, end: float, trace: Trace | None = None):
+    """Add a stage measured elsewhere (monotonic seconds) to a trace.
+
+    Args:
+        stage: Stage name
+        start: When it started
+        end: When it ended
+        trace: Trace to add to; the current one if not given
+    """
+    trace = trace or current()
+    if trace is not None:
+        trace.add(stage, start, end)
+
+
+def note(**attrs):
+    """Attach attributes (sizes, provider, ...) to the current trace."""
+    trace = current()
+    if trace is not None:
+        trace.attrs.update(attrs)
+
+
+def finish(trace: Trace | None = None, status: str = "ok"):
+    """End a trace and export it.
+
+    Args:
+        trace: Trace to end; the current one if not given
+        status: Outcome recorded with it (ok, error, ...)
+    """
+    trace = trace or current()
+    if trace is None or trace.end is not None:
+        return
+    trace.end = time.monotonic()
+    trace.attrs["status"] = status
+    _exporter.export(trace)
+
+
+class _Exporter:
+    """Writes finished traces and keeps the per-stage totals for Prometheus."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._latency_buckets = [0] * len(_LATENCY_BUCKETS)
+        self._latency_sum = 0.0
+        self._latency_count = 0
+
+    def export(self, trace: Trace):
+        record = trace.to_dict()
+        stages = ", ".join(f"{s['stage']} {s['ms']:.0f}ms" for s in record["stages"])
+        logger.info(f"Utterance {trace.id} {record['status']}, {record['latency_ms']:.0f}ms after release: {stages}")
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(TIMING_FILE), exist_ok=True)
+                with open(TIMING_FILE, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError as e:
+                logger.warning(f"Could not write timings to {TIMING_FILE}: {e}")
+            if TIMING_PROM:
+                self._update(trace)
+                self._write_prometheus()
+
+    def _update(self, trace: Trace):
+        """Add a trace to the running totals (lock held)."""
+        for stage, start, end, _ in trace.spans:
+            count, total = self._stages.get(stage, (0, 0.0))
+            self._stages[stage] = (count + 1, total + end - start)
+        seconds = trace.latency()
+        self._latency_sum += seconds
+        self._latency_count += 1
+        for i, bound in enumerate(_LATENCY_BUCKETS):
+            if seconds <= bound:
+                self._latency_buckets[i] += 1
+
+    def _write_prometheus(self):
+        """Atomically rewrite the textfile (lock held)."""
+        lines = [
+            "# TYPE talkyboi_stage_seconds summary",
+            *(
+                line
+                for stage, (count, total) in sorted(self._stages.items())
+                for line in (
+                    f'talkyboi_stage_seconds_sum{{stage="{stage}"}} {total:.6f}',
+                    f'talkyboi_stage_seconds_count{{stage="{stage}"}} {count}',
+                )
+            ),
+            "# HELP talkyboi_utterance_seconds Release-to-text latency",
+            "# TYPE talkyboi_utterance_seconds histogram",
+            *(
+                f'talkyboi_utterance_seconds_bucket{{le="{bound}"}} {n}'
+                for bound, n in zip(_LATENCY_BUCKETS, self._latency_buckets)
+            ),
+            f'talkyboi_utterance_seconds_bucket{{le="+Inf"}} {self._latency_count}',
+            f"talkyboi_utterance_seconds_sum {self._latency_sum:.6f}",
+            f"talkyboi_utterance_seconds_count {self._latency_count}",
+        ]
+        directory = os.path.dirname(os.path.abspath(TIMING_PROM))
+        try:
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".talkyboi-", suffix=".prom")
+            with os.fdopen(fd, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(tmp, TIMING_PROM)
+        except OSError as e:
+            logger.warning(f"Could not write {TIMING_PROM}: {e}")
+
+
+_exporter = _Exporter()
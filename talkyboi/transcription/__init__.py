@@ -2,7 +2,14 @@
 
 import logging
 from talkyboi.transcription.base import TranscriptionClient
-from talkyboi.config import TRANSCRIPTION_PROVIDER
+from talkyboi.config import (
+    TRANSCRIPTION_PROVIDER,
+    TRANSCRIPTION_FALLBACKS,
+    TRANSCRIPTION_DEADLINE_S,
+    TRANSCRIPTION_HEDGE,
+    TRANSCRIPT_CACHE,
+    WHISPER_REPLICAS,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +18,11 @@ def create_transcription_client() -> TranscriptionClient:
     """Create a transcription client based on the configured provider.
 
     The provider is selected via TRANSCRIPTION_PROVIDER environment variable.
-    Options: gemini (default), openai, whisper
+    Options: gemini (default), openai, whisper, stub
+
+    With a deadline, fallbacks or hedging configured, requests go through a
+    HedgedTranscriptionClient; unless TRANSCRIPT_CACHE is off, the result is
+    wrapped in a transcript cache.
 
     Returns:
         TranscriptionClient instance for the configured provider
@@ -21,7 +32,27 @@ def create_transcription_client() -> TranscriptionClient:
     """
     provider = TRANSCRIPTION_PROVIDER.lower()
     logger.info(f"Creating transcription client for provider: {provider}")
+    client = _create_provider_client(provider)
+
+    if TRANSCRIPTION_DEADLINE_S or TRANSCRIPTION_FALLBACKS or TRANSCRIPTION_HEDGE:
+        from talkyboi.transcription.hedged import HedgedTranscriptionClient
+        fallbacks = [_create_provider_client(name) for name in TRANSCRIPTION_FALLBACKS]
+        if fallbacks:
+            logger.info(f"Falling back to: {', '.join(TRANSCRIPTION_FALLBACKS)}")
+        client = HedgedTranscriptionClient([client] + fallbacks, hedge=TRANSCRIPTION_HEDGE)
+
+    if TRANSCRIPT_CACHE:
+        from talkyboi.transcription.cache import CachedTranscriptionClient
+        client = CachedTranscriptionClient(client)
+    return client
+
+
+def _create_provider_client(provider: str) -> TranscriptionClient:
+    """Create the client for a provider name.
 
+    Raises:
+        ValueError: If the provider is unknown or dependencies are missing
+    """
     if provider == "gemini":
         from talkyboi.transcription.gemini_client import GeminiClient
         return GeminiClient()
@@ -38,6 +69,9 @@ def create_transcription_client() -> TranscriptionClient:
 
     elif provider == "whisper":
         try:
+            if WHISPER_REPLICAS > 1:
+                from talkyboi.transcription.whisper_pool import WhisperReplicaPool
+                return WhisperReplicaPool()
             from talkyboi.transcription.whisper_client import WhisperClient
             return WhisperClient()
         except ImportError:
@@ -46,8 +80,12 @@ def create_transcription_client() -> TranscriptionClient:
                 "Install with: pip install talkyboi[whisper]"
             )
 
+    elif provider == "stub":
+        from talkyboi.transcription.stub_client import StubClient
+        return StubClient()
+
     else:
         raise ValueError(
             f"Unknown transcription provider: {provider}. "
-            "Options: gemini, openai, whisper"
+            "Options: gemini, openai, whisper, stub"
         )
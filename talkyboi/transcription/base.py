@@ -1,19 +1,167 @@
 """Abstract base class for transcription clients."""
 
+import logging
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from typing import NamedTuple
+import numpy as np
+from talkyboi import timing
+from talkyboi.audio.audio_utils import encode_audio
+
+logger = logging.getLogger(__name__)
+
+# Encoded audio handed to clients: anything exposing the buffer protocol
+AudioBuffer = bytes | bytearray | memoryview
+
+
+class TranscriptSegment(NamedTuple):
+    """A piece of a streamed transcript."""
+
+    text: str
+    # Seconds into the audio, for providers that report timestamps
+    start: float | None = None
+    end: float | None = None
 
 
 class TranscriptionClient(ABC):
     """Base class for all transcription providers."""
 
+    # Upload encoding the provider expects (see audio_utils.AUDIO_FORMATS)
+    audio_format = "wav"
+    # Whether transcribe_array can take raw samples, skipping encoding entirely
+    supports_array_input = False
+    # Whether transcribe_stream yields text while the provider is still working
+    supports_streaming = False
+
     @abstractmethod
-    def transcribe(self, audio_bytes: bytes) -> str:
+    def transcribe(self, audio_bytes: AudioBuffer) -> str:
         """Transcribe audio to text.
 
         Args:
-            audio_bytes: WAV audio data as bytes
+            audio_bytes: Audio file encoded as self.audio_format, as any
+                bytes-like object; clients should avoid copying it
+
+        Returns:
+            Transcribed text
+        """
+        pass
+
+    def transcribe_array(self, audio_data: np.ndarray) -> str:
+        """Transcribe raw samples without encoding them first.
+
+        Only called when supports_array_input is True.
+
+        Args:
+            audio_data: NumPy array of audio samples (int16) at SAMPLE_RATE
 
         Returns:
             Transcribed text
         """
+        raise NotImplementedError
+
+    def transcribe_stream(self, audio_bytes: AudioBuffer) -> Iterator[TranscriptSegment]:
+        """Transcribe audio, yielding the text in pieces as it is produced.
+
+        Concatenating the pieces' text gives the transcript. The default
+        yields the whole result of transcribe() once.
+
+        Args:
+            audio_bytes: Audio file encoded as self.audio_format
+
+        Yields:
+            Transcript segments
+        """
+        yield TranscriptSegment(self.transcribe(audio_bytes))
+
+    def transcribe_array_stream(self, audio_data: np.ndarray) -> Iterator[TranscriptSegment]:
+        """Stream a transcript of raw samples without encoding them first.
+
+        Only called when supports_array_input and supports_streaming are True.
+
+        Args:
+            audio_data: NumPy array of audio samples (int16) at SAMPLE_RATE
+
+        Yields:
+            Transcript segments
+        """
+        raise NotImplementedError
+
+    def transcribe_samples(self, audio_data: np.ndarray) -> str:
+        """Transcribe samples by whichever route the client supports.
+
+        Clients that take raw samples get them directly, with no encoding
+        step; others get them encoded as self.audio_format.
+
+        Args:
+            audio_data: NumPy array of audio samples (int16) at SAMPLE_RATE
+
+        Returns:
+            Transcribed text
+        """
+        if self.supports_array_input:
+            logger.info(f"Transcribing {len(audio_data)} samples directly")
+            with timing.span("transcribe"):
+                return self.transcribe_array(audio_data)
+
+        logger.debug(f"Encoding audio as {self.audio_format}")
+        with timing.span("encode"):
+            audio_bytes = encode_audio(audio_data, self.audio_format)
+        logger.info(f"Transcribing {len(audio_bytes)} bytes of {self.audio_format} audio")
+        with timing.span("transcribe"):
+            return self.transcribe(audio_bytes)
+
+    def stream_samples(self, audio_data: np.ndarray) -> Iterator[TranscriptSegment]:
+        """Stream a transcript of samples if the client supports streaming.
+
+        Otherwise yields the result of transcribe_samples() once.
+
+        Args:
+            audio_data: NumPy array of audio samples (int16) at SAMPLE_RATE
+
+        Yields:
+            Transcript segments
+        """
+        if not self.supports_streaming:
+            yield TranscriptSegment(self.transcribe_samples(audio_data))
+            return
+
+        if self.supports_array_input:
+            logger.info(f"Streaming transcription of {len(audio_data)} samples")
+            yield from self.transcribe_array_stream(audio_data)
+            return
+
+        with timing.span("encode"):
+            audio_bytes = encode_audio(audio_data, self.audio_format)
+        logger.info(f"Streaming transcription of {len(audio_bytes)} bytes of {self.audio_format} audio")
+        yield from self.transcribe_stream(audio_bytes)
+
+    def cache_identity(self) -> str:
+        """Everything besides the audio that determines the transcript.
+
+        Used in transcript cache keys; include the provider, model, prompt
+        and any decoding options.
+        """
+        return type(self).__name__
+
+    def answered_as_configured(self) -> bool:
+        """Whether this thread's latest result matches cache_identity().
+
+        False after a composite client took its answer from a different
+        backend, such as a fallback provider; that result must not be
+        cached under this client's identity.
+        """
+        return True
+
+    def prewarm(self) -> None:
+        """Get ready for an imminent request, e.g. by loading a model.
+
+        Blocking; callers run it off the GUI thread. The default does nothing.
+        """
+        pass
+
+    def close(self) -> None:
+        """Release processes and connections held by the client.
+
+        Called once at shutdown. The default does nothing.
+        """
         pass
@@ -0,0 +1,246 @@
+"""Content-addressed transcription cache."""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from pathlib import Path
+import numpy as np
+from talkyboi.config import CACHE_DIR, CACHE_MEMORY_ENTRIES, CACHE_MAX_MB, TRANSCRIPT_CACHE_DISK
+from talkyboi.transcription.base import TranscriptionClient, TranscriptSegment, AudioBuffer
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptCache:
+    """Two-tier cache of transcripts keyed by content hash.
+
+    Recent entries live in an in-memory LRU; with a directory, every entry
+    is also written to a small text file there, readable only by the
+    owner, evicted oldest-access-first once the directory grows past
+    max_bytes. Safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = CACHE_DIR if TRANSCRIPT_CACHE_DISK else None,
+        memory_entries: int = CACHE_MEMORY_ENTRIES,
+        max_bytes: int = CACHE_MAX_MB * 1024 * 1024,
+    ):
+        """Initialize the cache.
+
+        Args:
+            directory: Where to keep the disk tier, or None for memory only
+            memory_entries: Entries kept in the in-memory LRU
+            max_bytes: Size limit of the disk tier
+        """
+        self.directory = Path(directory) if directory else None
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._disk_bytes = None
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> str | None:
+        """Look up a transcript, promoting disk hits into memory."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+        text = self._read_disk(key)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, text)
+        return text
+
+    def put(self, key: str, text: str):
+        """Store a transcript in both tiers."""
+        with self._lock:
+            self._remember(key, text)
+        self._write_disk(key, text)
+
+    def stats(self) -> dict[str, int]:
+        """Hit and miss counters."""
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+    def _remember(self, key: str, text: str):
+        """Insert into the memory tier (lock held)."""
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.txt"
+
+    def _read_disk(self, key: str) -> str | None:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Could not read cached transcript {path}: {e}")
+            return None
+        # Bump the access time used for eviction
+        path.touch(exist_ok=True)
+        return text
+
+    def _write_disk(self, key: str, text: str):
+        if self.directory is None:
+            return
+        data = text.encode("utf-8")
+        path = self._path(key)
+        try:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            # Write-then-rename so readers never see a partial file; mkstemp
+            # creates it readable by the owner only
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write transcript cache: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(p.stat().st_size for p in self.directory.glob("*.txt"))
+            else:
+                self._disk_bytes += len(data) - replaced
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used files until under max_bytes (lock held)."""
+        entries = []
+        for path in self.directory.glob("*.txt"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self._disk_bytes = total
+        logger.debug(f"Evicted {removed} cached transcripts, {total} bytes remain")
+
+
+class CachedTranscriptionClient(TranscriptionClient):
+    """Serves repeated audio from a TranscriptCache instead of the provider.
+
+    Keys hash the audio content together with the wrapped client's
+    cache_identity(), so changing the model or prompt never returns a
+    stale transcript. Empty transcripts are not cached, nor are answers a
+    composite client took from a fallback backend.
+    """
+
+    def __init__(self, client: TranscriptionClient, cache: TranscriptCache | None = None):
+        """Wrap a client.
+
+        Args:
+            client: Client to forward cache misses to
+            cache: Cache to use; a default TranscriptCache if not given
+        """
+        self.client = client
+        self.cache = cache or TranscriptCache()
+        self.audio_format = client.audio_format
+        self.supports_array_input = client.supports_array_input
+        self.supports_streaming = client.supports_streaming
+        self._identity = client.cache_identity().encode("utf-8")
+
+    def cache_identity(self) -> str:
+        return self.client.cache_identity()
+
+    def answered_as_configured(self) -> bool:
+        return self.client.answered_as_configured()
+
+    def prewarm(self) -> None:
+        self.client.prewarm()
+
+    def close(self) -> None:
+        self.client.close()
+
+    def transcribe(self, audio_bytes: AudioBuffer) -> str:
+        """Transcribe encoded audio, or return its cached transcript."""
+        key = self._key(b"encoded", audio_bytes)
+        return self._cached(key, lambda: self.client.transcribe(audio_bytes))
+
+    def transcribe_array(self, audio_data: np.ndarray) -> str:
+        """Transcribe raw samples, or return their cached transcript."""
+        key = self._key(b"pcm", np.ascontiguousarray(audio_data))
+        return self._cached(key, lambda: self.client.transcribe_array(audio_data))
+
+    def transcribe_stream(self, audio_bytes: AudioBuffer) -> Iterator[TranscriptSegment]:
+        """Stream a transcript, or yield the cached one at once."""
+        key = self._key(b"encoded", audio_bytes)
+        yield from self._cached_stream(key, lambda: self.client.transcribe_stream(audio_bytes))
+
+    def transcribe_array_stream(self, audio_data: np.ndarray) -> Iterator[TranscriptSegment]:
+        """Stream a transcript of raw samples, or yield the cached one at once."""
+        key = self._key(b"pcm", np.ascontiguousarray(audio_data))
+        yield from self._cached_stream(key, lambda: self.client.transcribe_array_stream(audio_data))
+
+    def _cached_stream(self, key: str, stream) -> Iterator[TranscriptSegment]:
+        text = self.cache.get(key)
+        if text is not None:
+            logger.info(f"Transcript cache hit ({self.cache.stats()})")
+            yield TranscriptSegment(text)
+            return
+
+        pieces = []
+        for segment in stream():
+            pieces.append(segment.text)
+            yield segment
+        text = "".join(pieces).strip()
+        if text and self.client.answered_as_configured():
+            self.cache.put(key, text)
+        logger.debug(f"Transcript cache miss ({self.cache.stats()})")
+
+    def _key(self, kind: bytes, data) -> str:
+        digest = hashlib.sha256(self._identity)
+        digest.update(b"\0" + kind + b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _cached(self, key: str, transcribe) -> str:
+        text = self.cache.get(key)
+        if text is not None:
+            logger.info(f"Transcript cache hit ({self.cache.stats()})")
+            return text
+
+        text = transcribe()
+        if text and self.client.answered_as_configured():
+            self.cache.put(key, text)
+        logger.debug(f"Transcript cache miss ({self.cache.stats()})")
+        return text
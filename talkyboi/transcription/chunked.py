@@ -0,0 +1,161 @@
+"""Parallel transcription of long recordings in overlapping chunks."""
+
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from talkyboi import timing
+from talkyboi.audio.audio_utils import detect_speech
+from talkyboi.config import SAMPLE_RATE, CHUNK_S, CHUNK_OVERLAP_S, CHUNK_WORKERS, CHUNK_RETRIES
+from talkyboi.transcription.base import TranscriptionClient
+
+logger = logging.getLogger(__name__)
+
+# Longest run of repeated words looked for where two chunks meet
+_MAX_OVERLAP_WORDS = 20
+
+
+def plan_chunks(
+    audio_data: np.ndarray,
+    chunk_s: float = CHUNK_S,
+    overlap_s: float = CHUNK_OVERLAP_S,
+) -> list[tuple[int, int]]:
+    """Choose chunk boundaries, preferring pauses between speech.
+
+    Each cut goes in the longest pause between half and the full chunk
+    length after the previous cut; with no pause there, the audio is cut at
+    exactly chunk_s. A chunk after such a hard cut starts overlap_s before
+    it so a word split by the cut is heard whole at least once; a cut in a
+    pause splits no words, so the next chunk starts right at it.
+
+    Args:
+        audio_data: NumPy array of audio samples (int16)
+        chunk_s: Target chunk length in seconds
+        overlap_s: Audio repeated at the start of a chunk after a hard cut
+
+    Returns:
+        [start, end) sample offsets of each chunk
+    """
+    chunk = int(chunk_s * SAMPLE_RATE)
+    overlap = int(overlap_s * SAMPLE_RATE)
+    total = len(audio_data)
+
+    regions = detect_speech(audio_data)
+    gap_starts = regions[:-1, 1]
+    gap_ends = regions[1:, 0]
+    cut_points = (gap_starts + gap_ends) // 2
+    gap_lengths = gap_ends - gap_starts
+
+    cuts = []
+    starts = [0]
+    position = 0
+    # Let the last chunk run up to a quarter over rather than leave a sliver
+    while total - position > chunk * 5 // 4:
+        in_window = (cut_points >= position + chunk // 2) & (cut_points <= position + chunk)
+        if in_window.any():
+            candidates = np.flatnonzero(in_window)
+            position = int(cut_points[candidates[np.argmax(gap_lengths[candidates])]])
+            starts.append(position)
+        else:
+            position += chunk
+            starts.append(max(0, position - overlap))
+        cuts.append(position)
+
+    ends = cuts + [total]
+    return list(zip(starts, ends))
+
+
+def _normalize(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def stitch(
+    texts: list[str],
+    overlapped: list[bool] | None = None,
+    max_overlap: int = _MAX_OVERLAP_WORDS,
+) -> str:
+    """Join chunk transcripts, dropping words repeated across an overlap.
+
+    Where two chunks overlap, the longest run of words (ignoring case and
+    punctuation) that ends one transcript and starts the next is kept only
+    once. Where they do not, the speaker really said any repeated words
+    ("that that"), so they are kept.
+
+    Args:
+        texts: Transcripts of consecutive chunks
+        overlapped: Whether each chunk after the first overlaps the one
+            before it; all of them by default
+        max_overlap: Longest repeated run to look for
+
+    Returns:
+        The combined transcript
+    """
+    if overlapped is None:
+        overlapped = [True] * (len(texts) - 1)
+    words = []
+    for i, text in enumerate(texts):
+        new = text.split()
+        if i == 0 or not overlapped[i - 1]:
+            words.extend(new)
+            continue
+        tail = [_normalize(w) for w in words[-max_overlap:]]
+        head = [_normalize(w) for w in new[:max_overlap]]
+        repeated = 0
+        for n in range(min(len(tail), len(head)), 0, -1):
+            if tail[-n:] == head[:n]:
+                repeated = n
+                break
+        words.extend(new[repeated:])
+    return " ".join(words)
+
+
+def transcribe_chunked(
+    client: TranscriptionClient,
+    audio_data: np.ndarray,
+    workers: int = CHUNK_WORKERS,
+    retries: int = CHUNK_RETRIES,
+) -> str:
+    """Transcribe long audio as overlapping chunks on a thread pool.
+
+    Chunks that fail are retried, without redoing the ones that succeeded.
+
+    Args:
+        client: Transcription client to use
+        audio_data: NumPy array of audio samples (int16)
+        workers: Chunks transcribed concurrently
+        retries: Extra attempts for each failed chunk
+
+    Returns:
+        Stitched transcript of all chunks
+
+    Raises:
+        RuntimeError: If a chunk still fails after all retries
+    """
+    chunks = plan_chunks(audio_data)
+    logger.info(f"Transcribing {len(audio_data) / SAMPLE_RATE:.0f}s of audio as {len(chunks)} chunks")
+
+    texts = [None] * len(chunks)
+    errors = {}
+    with ThreadPoolExecutor(workers, thread_name_prefix="chunk") as executor:
+        todo = list(range(len(chunks)))
+        for attempt in range(retries + 1):
+            futures = {}
+            for i in todo:
+                start, end = chunks[i]
+                futures[i] = executor.submit(timing.bind(client.transcribe_samples), audio_data[start:end])
+            errors = {}
+            for i, future in futures.items():
+                try:
+                    texts[i] = future.result()
+                except Exception as e:
+                    errors[i] = e
+            if not errors:
+                break
+            todo = sorted(errors)
+            logger.warning(f"{len(errors)} of {len(chunks)} chunks failed (attempt {attempt + 1})")
+
+    if errors:
+        first = min(errors)
+        raise RuntimeError(f"{len(errors)} of {len(chunks)} chunks failed: {errors[first]}")
+    overlapped = [start < end for (start, _), (_, end) in zip(chunks[1:], chunks)]
+    return stitch(texts, overlapped)
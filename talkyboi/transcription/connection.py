@@ -0,0 +1,133 @@
+"""Persistent HTTP connections for the cloud transcription clients."""
+
+import logging
+import threading
+import time
+import httpx
+from talkyboi import timing
+from talkyboi.config import HTTP_KEEPALIVE_S, HTTP_TIMEOUT_S
+
+logger = logging.getLogger(__name__)
+
+# Stage timings taken from a request's trace: (stage, httpcore phase)
+_STAGES = (
+    ("connect", "connection.connect_tcp"),
+    ("tls", "connection.start_tls"),
+    ("upload", "send_request_body"),
+    ("provider", "receive_response_headers"),
+    ("download", "receive_response_body"),
+)
+
+# Treat a connection as cold slightly before keepalive_expiry drops it, so a
+# prewarm never races the pool closing it
+_WARM_MARGIN_S = 0.5
+
+
+class _RequestTrace:
+    """Collects httpcore trace events for one request.
+
+    httpcore calls the trace extension with "<phase>.started" and
+    "<phase>.complete" events; a reused connection has no connect_tcp or
+    start_tls phase at all.
+    """
+
+    def __init__(self, connection: "HttpConnection", request: httpx.Request):
+        self.connection = connection
+        self.request = request
+        self.events = {}
+
+    def __call__(self, event_name: str, info: dict):
+        self.events[event_name] = time.perf_counter()
+        if event_name.endswith("response_closed.complete"):
+            self.connection._record(self)
+
+    def duration_ms(self, phase: str) -> float:
+        """Milliseconds spent in a phase, or 0 if it did not happen."""
+        started = self.events.get(f"{phase}.started")
+        completed = self.events.get(f"{phase}.complete")
+        if started is None or completed is None:
+            return 0.0
+        return (completed - started) * 1000
+
+    def phase(self, name: str) -> tuple[float, float] | None:
+        """(started, completed) perf_counter times of a phase, whatever its protocol prefix."""
+        started = completed = None
+        for event, t in self.events.items():
+            if event.endswith(f"{name}.started"):
+                started = t
+            elif event.endswith(f"{name}.complete"):
+                completed = t
+        return None if started is None or completed is None else (started, completed)
+
+    def span_ms(self, first_suffix: str, last_suffix: str) -> float:
+        """Milliseconds from the first event ending in one suffix to the last ending in another."""
+        starts = [t for name, t in self.events.items() if name.endswith(first_suffix)]
+        ends = [t for name, t in self.events.items() if name.endswith(last_suffix)]
+        if not starts or not ends:
+            return 0.0
+        return (max(ends) - min(starts)) * 1000
+
+
+class HttpConnection:
+    """A keep-alive httpx client that reports handshake and transfer time.
+
+    One instance is shared by all requests of a transcription client, so the
+    TCP and TLS handshakes are paid once and the connection is reused for
+    as long as it stays alive.
+    """
+
+    def __init__(self, keepalive_s: float = HTTP_KEEPALIVE_S, timeout_s: float = HTTP_TIMEOUT_S):
+        """Create the underlying client.
+
+        Args:
+            keepalive_s: How long an idle connection is kept open
+            timeout_s: Read/write timeout for a request
+        """
+        self.keepalive_s = keepalive_s
+        self.client = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=keepalive_s),
+            timeout=httpx.Timeout(timeout_s, connect=10.0),
+            event_hooks={"request": [self._on_request]},
+        )
+        self._lock = threading.Lock()
+        self._last_used = None
+        self.last_handshake_ms = 0.0
+        self.last_transfer_ms = 0.0
+
+    def is_warm(self) -> bool:
+        """Whether a recently used connection is likely still open."""
+        with self._lock:
+            if self._last_used is None:
+                return False
+            return time.monotonic() - self._last_used < self.keepalive_s - _WARM_MARGIN_S
+
+    def close(self):
+        """Close all pooled connections."""
+        self.client.close()
+
+    def _on_request(self, request: httpx.Request):
+        """Attach a trace collector to an outgoing request."""
+        request.extensions["trace"] = _RequestTrace(self, request)
+
+    def _record(self, trace: _RequestTrace):
+        """Log handshake and transfer time of a finished request."""
+        handshake_ms = trace.duration_ms("connection.connect_tcp") + trace.duration_ms("connection.start_tls")
+        transfer_ms = trace.span_ms("send_request_headers.started", "receive_response_body.complete")
+        with self._lock:
+            self._last_used = time.monotonic()
+            self.last_handshake_ms = handshake_ms
+            self.last_transfer_ms = transfer_ms
+
+        # Trace events run on the requesting thread, under its utterance's trace
+        if timing.current() is not None:
+            offset = time.monotonic() - time.perf_counter()
+            for stage, name in _STAGES:
+                times = trace.phase(name)
+                if times is not None:
+                    timing.record(stage, times[0] + offset, times[1] + offset)
+
+        host = trace.request.url.host
+        if "connection.connect_tcp.started" in trace.events:
+            logger.info(f"{host}: new connection, handshake {handshake_ms:.0f}ms, transfer {transfer_ms:.0f}ms")
+        else:
+            logger.info(f"{host}: reused connection, transfer {transfer_ms:.0f}ms")
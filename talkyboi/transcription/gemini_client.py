@@ -2,10 +2,14 @@
 
 import logging
 import os
+from collections.abc import Iterator
 from google import genai
 from google.genai import types
-from talkyboi.config import GEMINI_MODEL, TRANSCRIPTION_PROMPT
-from talkyboi.transcription.base import TranscriptionClient
+from talkyboi import timing
+from talkyboi.audio.audio_utils import get_audio_format
+from talkyboi.config import GEMINI_MODEL, GEMINI_AUDIO_FORMAT, TRANSCRIPTION_PROMPT
+from talkyboi.transcription.base import TranscriptionClient, TranscriptSegment, AudioBuffer
+from talkyboi.transcription.connection import HttpConnection
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +17,8 @@ logger = logging.getLogger(__name__)
 class GeminiClient(TranscriptionClient):
     """Client for transcribing audio using Gemini API."""
 
+    supports_streaming = True
+
     def __init__(self, api_key: str | None = None):
         """Initialize the Gemini client.
 
@@ -24,27 +30,79 @@ class GeminiClient(TranscriptionClient):
             raise ValueError(
                 "GEMINI_API_KEY not found. Set it in .env or pass to constructor."
             )
-        self.client = genai.Client(api_key=api_key)
+        self.connection = HttpConnection()
+        self.client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(httpx_client=self.connection.client),
+        )
         self.model = GEMINI_MODEL
-        logger.info(f"Gemini client initialized with model: {self.model}")
+        self.audio_format = GEMINI_AUDIO_FORMAT
+        self._mime_type = get_audio_format(self.audio_format).mime_type
+        logger.info(f"Gemini client initialized with model: {self.model} ({self.audio_format} uploads)")
+
+    def cache_identity(self) -> str:
+        return f"gemini|{self.model}|{TRANSCRIPTION_PROMPT}"
 
-    def transcribe(self, audio_bytes: bytes) -> str:
+    def close(self) -> None:
+        """Close the pooled HTTPS connections."""
+        self.connection.close()
+
+    def prewarm(self) -> None:
+        """Open a connection to the API unless a warm one is already pooled."""
+        if self.connection.is_warm():
+            return
+        logger.debug("Opening connection to Gemini API")
+        self.client.models.get(model=self.model)
+
+    def transcribe(self, audio_bytes: AudioBuffer) -> str:
         """Transcribe audio and clean it up.
 
         Args:
-            audio_bytes: WAV audio data as bytes
+            audio_bytes: Audio file encoded as self.audio_format
 
         Returns:
             Cleaned transcription text
         """
         logger.debug(f"Sending {len(audio_bytes)} bytes to Gemini API")
+        timing.note(provider="gemini", model=self.model, upload_bytes=len(audio_bytes))
         response = self.client.models.generate_content(
             model=self.model,
-            contents=[
-                TRANSCRIPTION_PROMPT,
-                types.Part.from_bytes(data=audio_bytes, mime_type="audio/wav"),
-            ],
+            contents=self._contents(audio_bytes),
         )
         result = response.text.strip()
         logger.debug(f"Received transcription: {len(result)} chars")
         return result
+
+    def transcribe_stream(self, audio_bytes: AudioBuffer) -> Iterator[TranscriptSegment]:
+        """Transcribe audio, yielding text as Gemini generates it.
+
+        Args:
+            audio_bytes: Audio file encoded as self.audio_format
+
+        Yields:
+            Text deltas without timestamps; leading whitespace of the
+            transcript is dropped
+        """
+        logger.debug(f"Streaming {len(audio_bytes)} bytes to Gemini API")
+        timing.note(provider="gemini", model=self.model, upload_bytes=len(audio_bytes))
+        started = False
+        for chunk in self.client.models.generate_content_stream(
+            model=self.model,
+            contents=self._contents(audio_bytes),
+        ):
+            text = chunk.text
+            if not started and text:
+                text = text.lstrip()
+            if text:
+                started = True
+                yield TranscriptSegment(text)
+
+    def _contents(self, audio_bytes: AudioBuffer) -> list:
+        """Build the request: the prompt followed by the audio."""
+        # Inline data is base64-encoded into the JSON body, which needs real bytes
+        if not isinstance(audio_bytes, bytes):
+            audio_bytes = bytes(audio_bytes)
+        return [
+            TRANSCRIPTION_PROMPT,
+            types.Part.from_bytes(data=audio_bytes, mime_type=self._mime_type),
+        ]
@@ -0,0 +1,280 @@
+"""Deadlines, hedged requests and failover across transcription providers."""
+
+import bisect
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+from talkyboi import timing
+from talkyboi.audio.audio_utils import encode_audio
+from talkyboi.config import SAMPLE_RATE, TRANSCRIPTION_DEADLINE_S, HEDGE_DELAY_S
+from talkyboi.transcription.base import TranscriptionClient, TranscriptSegment, AudioBuffer
+
+logger = logging.getLogger(__name__)
+
+# Latencies remembered per backend and clip length for the hedge delay estimate
+_HISTORY_SIZE = 50
+# Below this many samples the configured HEDGE_DELAY_S is used instead
+_MIN_HISTORY = 5
+# Clip lengths (seconds) separating the latency histories; clips of unknown
+# length get a history of their own
+_BUCKET_EDGES_S = (2, 5, 15, 60)
+# The hedge delay never exceeds this multiple of the median latency, so a
+# slow mode making up the p95 still gets hedged
+_MAX_DELAY_MEDIANS = 2.0
+
+
+class HedgedTranscriptionClient(TranscriptionClient):
+    """Sends a request to a primary client with a deadline and a backup plan.
+
+    If the primary has not answered after the hedge delay (its observed p95
+    latency for clips of similar length, once enough requests have been
+    seen), the same request is also sent to the next backend, which gets its
+    own delay in turn; the first successful answer wins. A backend
+    that fails is replaced by the next untried one. Backends are tried in
+    order and the list wraps, so a single client hedges against itself.
+
+    Losers cannot be interrupted mid-request: requests that have not started
+    are cancelled, and the results of running ones are discarded.
+    """
+
+    # Each backend gets samples or its own encoding, see transcribe_array
+    supports_array_input = True
+
+    def __init__(
+        self,
+        clients: list[TranscriptionClient],
+        deadline_s: float = TRANSCRIPTION_DEADLINE_S,
+        hedge: bool = True,
+        hedge_delay_s: float = HEDGE_DELAY_S,
+    ):
+        """Initialize the composite client.
+
+        Args:
+            clients: Primary client first, then fallbacks in order of preference
+            deadline_s: Give up on a request after this long (0 = no deadline)
+            hedge: Send backup requests after the hedge delay; otherwise
+                only fail over when a backend errors
+            hedge_delay_s: Hedge delay until enough latencies are known
+        """
+        self.clients = clients
+        self.deadline_s = deadline_s
+        self.hedge = hedge
+        self.hedge_delay_s = hedge_delay_s
+        self.audio_format = clients[0].audio_format
+        self.supports_streaming = clients[0].supports_streaming
+        # Per backend: clip length bucket -> recent latencies
+        self._latencies = [{} for _ in clients]
+        self._lock = threading.Lock()
+        # Index of the backend that produced each thread's latest result
+        self._local = threading.local()
+        # Room for abandoned requests still running alongside new ones
+        self._executor = ThreadPoolExecutor(4 * len(clients), thread_name_prefix="hedged")
+
+    def cache_identity(self) -> str:
+        return self.clients[0].cache_identity()
+
+    def answered_as_configured(self) -> bool:
+        """Whether the latest result on this thread came from the primary."""
+        return getattr(self._local, "winner", 0) == 0
+
+    def prewarm(self) -> None:
+        """Prewarm every backend so a fallback is ready when needed."""
+        for client in self.clients:
+            client.prewarm()
+
+    def close(self) -> None:
+        """Close every backend once abandoned requests have finished."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for client in self.clients:
+            client.close()
+
+    def hedge_delay(self, index: int = 0, audio_s: float | None = None) -> float:
+        """Seconds to wait on a backend before hedging.
+
+        Args:
+            index: Backend being waited on
+            audio_s: Length of the clip, if known
+
+        Returns:
+            The backend's p95 latency on clips of similar length, capped at
+            _MAX_DELAY_MEDIANS times its median
+        """
+        with self._lock:
+            history = sorted(self._latencies[index].get(_bucket(audio_s), ()))
+        if len(history) < _MIN_HISTORY:
+            return self.hedge_delay_s
+        p95 = history[int(0.95 * (len(history) - 1))]
+        return min(p95, _MAX_DELAY_MEDIANS * history[len(history) // 2])
+
+    def transcribe(self, audio_bytes: AudioBuffer) -> str:
+        """Transcribe encoded audio; every backend gets the same upload."""
+        return self._race(lambda client: client.transcribe(audio_bytes))
+
+    def transcribe_array(self, audio_data: np.ndarray) -> str:
+        """Transcribe samples, encoding them once per format a backend needs."""
+        encoded = {}
+        lock = threading.Lock()
+        audio_s = len(audio_data) / SAMPLE_RATE
+
+        def call(client):
+            if client.supports_array_input:
+                return client.transcribe_array(audio_data)
+            with lock:
+                if client.audio_format not in encoded:
+                    with timing.span("encode"):
+                        encoded[client.audio_format] = encode_audio(audio_data, client.audio_format)
+            return client.transcribe(encoded[client.audio_format])
+
+        return self._race(call, audio_s)
+
+    def transcribe_stream(self, audio_bytes: AudioBuffer) -> Iterator[TranscriptSegment]:
+        """Stream encoded audio from the primary client, see _stream."""
+        yield from self._stream(
+            lambda: self.clients[0].transcribe_stream(audio_bytes),
+            lambda client: client.transcribe(audio_bytes),
+        )
+
+    def transcribe_array_stream(self, audio_data: np.ndarray) -> Iterator[TranscriptSegment]:
+        """Stream samples from the primary client, see _stream."""
+        yield from self._stream(
+            lambda: self.clients[0].stream_samples(audio_data),
+            lambda client: client.transcribe_samples(audio_data),
+            len(audio_data) / SAMPLE_RATE,
+        )
+
+    def _stream(self, open_stream, call, audio_s: float | None = None) -> Iterator[TranscriptSegment]:
+        """Stream from the primary client within the deadline.
+
+        A stream cannot be hedged, so there is no backup request; if the
+        primary fails before producing any text, a regular request with
+        failover is made instead.
+
+        Raises:
+            TimeoutError: If the stream did not finish within the deadline
+        """
+        deadline = time.monotonic() + self.deadline_s if self.deadline_s else None
+        deltas = queue.Queue()
+
+        def pump():
+            try:
+                for segment in open_stream():
+                    deltas.put((True, segment))
+            except Exception as e:
+                deltas.put((False, e))
+            else:
+                deltas.put((True, None))
+
+        self._executor.submit(timing.bind(pump))
+        self._local.winner = 0
+        produced = False
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                ok, value = deltas.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(f"Transcription did not finish within {self.deadline_s:g}s")
+            if not ok:
+                if produced or len(self.clients) == 1:
+                    raise value
+                logger.warning(f"Streaming from primary failed, falling back: {value}")
+                yield TranscriptSegment(self._race(call, audio_s))
+                return
+            if value is None:
+                return
+            produced = True
+            yield value
+
+    def _race(self, call, audio_s: float | None = None) -> str:
+        """Run call against the backends until one succeeds.
+
+        Each hedge is sent once the latest backend has taken longer than its
+        own hedge delay for a clip of audio_s seconds.
+
+        Raises:
+            TimeoutError: If no backend answered within the deadline
+            Exception: The last backend error, if every backend failed
+        """
+        started = time.monotonic()
+        deadline = started + self.deadline_s if self.deadline_s else None
+        # One hedge per backend, and a single client may hedge against itself
+        max_launches = max(2, len(self.clients)) if self.hedge else len(self.clients)
+        running = {}
+        next_index = 0
+        hedge_at = None
+        last_error = None
+        timed_out = False
+
+        def launch():
+            nonlocal next_index, hedge_at
+            index = next_index % len(self.clients)
+            next_index += 1
+            client = self.clients[index]
+            future = self._executor.submit(timing.bind(self._timed), index, client, call, audio_s)
+            running[future] = index
+            hedge_at = time.monotonic() + self.hedge_delay(index, audio_s)
+            if next_index > 1:
+                logger.info(f"Sending request to backup {type(client).__name__} (#{index})")
+
+        launch()
+        while running:
+            now = time.monotonic()
+            timeout = None if deadline is None else deadline - now
+            if self.hedge and next_index < max_launches:
+                timeout = hedge_at - now if timeout is None else min(timeout, hedge_at - now)
+            if timeout is not None and timeout <= 0:
+                if deadline is not None and now >= deadline:
+                    timed_out = True
+                    break
+                launch()
+                continue
+
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"Backend #{index} failed: {e}")
+                    last_error = e
+                    continue
+                self._cancel(running)
+                self._local.winner = index
+                logger.debug(f"Backend #{index} won after {time.monotonic() - started:.2f}s")
+                return result
+
+            # Fail over right away instead of waiting for the hedge delay
+            if not running and next_index < max_launches:
+                launch()
+
+        self._cancel(running)
+        if timed_out:
+            raise TimeoutError(f"Transcription did not finish within {self.deadline_s:g}s")
+        raise last_error
+
+    def _timed(self, index: int, client: TranscriptionClient, call, audio_s: float | None) -> str:
+        """Call a backend and remember how long a successful call took."""
+        started = time.monotonic()
+        result = call(client)
+        with self._lock:
+            history = self._latencies[index].setdefault(_bucket(audio_s), deque(maxlen=_HISTORY_SIZE))
+            history.append(time.monotonic() - started)
+        return result
+
+    def _cancel(self, running: dict):
+        """Stop requests that have not started and abandon the rest."""
+        for future in running:
+            future.cancel()
+        if running:
+            logger.debug(f"Abandoned {len(running)} slower request(s)")
+
+
+def _bucket(audio_s: float | None) -> int:
+    """Latency history bucket for a clip length."""
+    if audio_s is None:
+        return -1
+    return bisect.bisect_right(_BUCKET_EDGES_S, audio_s)
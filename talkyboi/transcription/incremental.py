@@ -0,0 +1,149 @@
+"""Incremental transcription of a recording while it is still in progress."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PySide6.QtCore import QObject, QTimer, Signal
+from talkyboi import profiling, timing
+from talkyboi.audio.audio_utils import find_pause
+from talkyboi.audio.recorder import AudioRecorder
+from talkyboi.config import (
+    MIN_RECORDING_DURATION_MS,
+    SAMPLE_RATE,
+    STREAMING_PAUSE_MS,
+    STREAMING_MIN_SEGMENT_S,
+    STREAMING_MAX_SEGMENT_S,
+    STREAMING_POLL_MS,
+)
+from talkyboi.transcription.base import TranscriptionClient
+from talkyboi.transcription.pipeline import transcribe_audio
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalTranscriber(QObject):
+    """Transcribes finished phrases in the background while recording continues.
+
+    The live capture buffer is polled for pauses; everything up to a pause is
+    cut off as a segment and queued on a single worker thread (one local model
+    can only decode one segment at a time). When the recording ends only the
+    unfinished tail is left to decode, so release-to-text latency no longer
+    grows with the length of the recording.
+    """
+
+    finished = Signal(str)
+    error = Signal(str)
+    _utterance_done = Signal(object)
+
+    def __init__(self, client: TranscriptionClient, recorder: AudioRecorder):
+        super().__init__()
+        self.client = client
+        self.recorder = recorder
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="incremental")
+        self._futures = []
+        self._cut = 0
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(STREAMING_POLL_MS)
+        self._poll_timer.timeout.connect(self._poll)
+        self._utterance_done.connect(self._on_utterance_done)
+
+    def start(self):
+        """Begin watching a new recording."""
+        self._futures = []
+        self._cut = 0
+        self._poll_timer.start()
+
+    def cancel(self):
+        """Stop watching and discard the current recording's segments."""
+        self._poll_timer.stop()
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+
+    def finish(self, audio_data: np.ndarray):
+        """Queue the unfinished tail and emit the full text once all segments are done.
+
+        Args:
+            audio_data: The complete recording
+        """
+        self._poll_timer.stop()
+        tail = audio_data[self._cut:]
+        logger.info(
+            f"Recording finished after {len(self._futures)} segments, "
+            f"{len(tail) / SAMPLE_RATE:.1f}s tail left to decode"
+        )
+        # With no segment cut yet the tail is the whole recording, so it gets
+        # the usual minimum-speech check
+        self._submit(tail, 0 if self._futures else MIN_RECORDING_DURATION_MS)
+        futures, self._futures = self._futures, []
+        # Receivers finish this recording's trace and profile, even if the
+        # next recording has begun by the time the result arrives
+        done = (futures, timing.current(), profiling.current())
+        # Segments run in order on one worker, so the last one finishing means all did
+        futures[-1].add_done_callback(lambda _: self._utterance_done.emit(done))
+
+    def shutdown(self):
+        """Stop the worker thread, waiting for queued segments."""
+        self._poll_timer.stop()
+        self._executor.shutdown(wait=True)
+
+    def _poll(self):
+        """Cut a segment off the live buffer if the speaker has paused."""
+        live = self.recorder.live_audio()
+        if live is None:
+            return
+        pending = live[self._cut:]
+        if len(pending) < STREAMING_MIN_SEGMENT_S * SAMPLE_RATE:
+            return
+
+        cut = find_pause(pending, STREAMING_PAUSE_MS)
+        if cut is None:
+            if len(pending) < STREAMING_MAX_SEGMENT_S * SAMPLE_RATE:
+                return
+            cut = len(pending)
+            logger.debug("No pause found, forcing a segment cut")
+
+        self._submit(pending[:cut])
+        self._cut += cut
+
+    def _submit(self, segment: np.ndarray, min_speech_ms: int = 0):
+        """Queue one segment for transcription.
+
+        Args:
+            segment: Samples to transcribe
+            min_speech_ms: Minimum speech to transcribe it; by default only
+                silent segments are skipped, as short phrases are fine
+                mid-recording
+        """
+        logger.debug(f"Queueing {len(segment) / SAMPLE_RATE:.1f}s segment")
+        self._futures.append(
+            self._executor.submit(timing.bind(transcribe_audio), self.client, segment, min_speech_ms)
+        )
+
+    def _on_utterance_done(self, done):
+        """Emit the result of a finished recording under its trace and profile."""
+        futures, trace, session = done
+        with timing.activate(trace), profiling.activate(session):
+            self._emit_result(futures)
+
+    def _emit_result(self, futures):
+        """Join segment results in order and emit them."""
+        texts = []
+        for future in futures:
+            if future.cancelled():
+                return
+            try:
+                text = future.result()
+            except Exception as e:
+                logger.error(f"Segment transcription failed: {e}")
+                self.error.emit(str(e))
+                return
+            if text:
+                texts.append(text.strip())
+
+        if texts:
+            self.finished.emit(" ".join(texts))
+        else:
+            logger.warning("No speech detected in audio")
+            self.error.emit("No speech detected")
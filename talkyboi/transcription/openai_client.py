@@ -1,14 +1,22 @@
 """OpenAI Whisper API client for transcription."""
 
-import io
 import logging
 import os
+from collections.abc import Iterator
 from openai import OpenAI
-from talkyboi.transcription.base import TranscriptionClient
+from talkyboi import timing
+from talkyboi.audio.audio_utils import get_audio_format, BufferReader
+from talkyboi.config import OPENAI_MODEL, OPENAI_AUDIO_FORMAT
+from talkyboi.transcription.base import TranscriptionClient, TranscriptSegment, AudioBuffer
+from talkyboi.transcription.connection import HttpConnection
 
 logger = logging.getLogger(__name__)
 
 
+# Models that can stream transcripts; whisper-1 only returns whole ones
+_STREAMING_MODELS = ("gpt-4o-transcribe", "gpt-4o-mini-transcribe")
+
+
 class OpenAIClient(TranscriptionClient):
     """Client for transcribing audio using OpenAI Whisper API."""
 
@@ -23,29 +31,72 @@ class OpenAIClient(TranscriptionClient):
             raise ValueError(
                 "OPENAI_API_KEY not found. Set it in .env or pass to constructor."
             )
-        self.client = OpenAI(api_key=api_key)
-        logger.info("OpenAI Whisper client initialized")
+        self.connection = HttpConnection()
+        self.client = OpenAI(api_key=api_key, http_client=self.connection.client)
+        self.model = OPENAI_MODEL
+        self.supports_streaming = self.model.startswith(_STREAMING_MODELS)
+        self.audio_format = OPENAI_AUDIO_FORMAT
+        self._file_name = f"audio.{get_audio_format(self.audio_format).extension}"
+        logger.info(f"OpenAI client initialized with model: {self.model} ({self.audio_format} uploads)")
+
+    def cache_identity(self) -> str:
+        return f"openai|{self.model}"
+
+    def close(self) -> None:
+        """Close the pooled HTTPS connections."""
+        self.connection.close()
 
-    def transcribe(self, audio_bytes: bytes) -> str:
+    def prewarm(self) -> None:
+        """Open a connection to the API unless a warm one is already pooled."""
+        if self.connection.is_warm():
+            return
+        logger.debug("Opening connection to OpenAI API")
+        self.client.models.retrieve(self.model)
+
+    def transcribe(self, audio_bytes: AudioBuffer) -> str:
         """Transcribe audio using OpenAI Whisper API.
 
         Args:
-            audio_bytes: WAV audio data as bytes
+            audio_bytes: Audio file encoded as self.audio_format
 
         Returns:
             Transcribed text (raw, no cleanup)
         """
-        logger.debug(f"Sending {len(audio_bytes)} bytes to OpenAI Whisper API")
+        logger.debug(f"Sending {len(audio_bytes)} bytes to OpenAI {self.model} API")
+        timing.note(provider="openai", model=self.model, upload_bytes=len(audio_bytes))
 
-        # Wrap bytes in a file-like object with a name
-        audio_file = io.BytesIO(audio_bytes)
-        audio_file.name = "audio.wav"
+        # Stream the buffer into the multipart body without copying it;
+        # the API infers the format from the file name
+        audio_file = BufferReader(audio_bytes, name=self._file_name)
 
         response = self.client.audio.transcriptions.create(
-            model="whisper-1",
+            model=self.model,
             file=audio_file,
         )
 
         result = response.text.strip()
         logger.debug(f"Received transcription: {len(result)} chars")
         return result
+
+    def transcribe_stream(self, audio_bytes: AudioBuffer) -> Iterator[TranscriptSegment]:
+        """Transcribe audio, yielding text deltas as the model produces them.
+
+        Only used when supports_streaming is True (a gpt-4o transcribe model).
+
+        Args:
+            audio_bytes: Audio file encoded as self.audio_format
+
+        Yields:
+            Text deltas without timestamps
+        """
+        logger.debug(f"Streaming {len(audio_bytes)} bytes to OpenAI {self.model} API")
+        timing.note(provider="openai", model=self.model, upload_bytes=len(audio_bytes))
+        audio_file = BufferReader(audio_bytes, name=self._file_name)
+        stream = self.client.audio.transcriptions.create(
+            model=self.model,
+            file=audio_file,
+            stream=True,
+        )
+        for event in stream:
+            if event.type == "transcript.text.delta":
+                yield TranscriptSegment(event.delta)
@@ -0,0 +1,78 @@
+"""Qt-free transcription pipeline: silence trimming, chunking, encoding."""
+
+import logging
+import time
+from collections.abc import Callable
+import numpy as np
+from talkyboi import timing
+from talkyboi.audio.audio_utils import (
+    detect_speech,
+    get_audio_duration_ms,
+    get_speech_duration_ms,
+    trim_silence,
+)
+from talkyboi.config import SAMPLE_RATE, VAD_ENABLED, MIN_RECORDING_DURATION_MS, LONG_AUDIO_S
+from talkyboi.transcription.base import TranscriptionClient
+from talkyboi.transcription.chunked import transcribe_chunked
+
+logger = logging.getLogger(__name__)
+
+
+def transcribe_audio(
+    client: TranscriptionClient,
+    audio_data: np.ndarray,
+    min_speech_ms: int = MIN_RECORDING_DURATION_MS,
+    on_partial: Callable[[str, float], None] | None = None,
+) -> str:
+    """Trim silence, encode in the client's format and transcribe.
+
+    Clients that take raw samples get them directly, with no encoding step.
+    Audio longer than LONG_AUDIO_S is split into chunks transcribed in parallel.
+
+    Args:
+        client: Transcription client to use
+        audio_data: NumPy array of audio samples (int16)
+        min_speech_ms: Skip audio with less detected speech than this (or,
+            with VAD disabled, audio shorter than this)
+        on_partial: Called with the transcript so far while a streaming
+            client is still producing it, and the fraction of the audio it
+            covers (0 if the provider reports no timestamps)
+
+    Returns:
+        Transcribed text, or an empty string if there was no speech
+    """
+    timing.note(audio_s=round(len(audio_data) / SAMPLE_RATE, 3))
+    if VAD_ENABLED:
+        with timing.span("vad"):
+            regions = detect_speech(audio_data)
+            speech_ms = get_speech_duration_ms(regions)
+            if speech_ms < min_speech_ms or len(regions) == 0:
+                logger.warning(f"Too little speech ({speech_ms}ms < {min_speech_ms}ms)")
+                return ""
+            trimmed = trim_silence(audio_data, regions)
+        logger.debug(f"Trimmed silence: {len(audio_data)} -> {len(trimmed)} samples")
+        audio_data = trimmed
+    else:
+        # Without VAD the whole recording counts as speech
+        duration_ms = get_audio_duration_ms(audio_data)
+        if duration_ms < min_speech_ms:
+            logger.warning(f"Recording too short ({duration_ms}ms < {min_speech_ms}ms)")
+            return ""
+
+    if LONG_AUDIO_S and get_audio_duration_ms(audio_data) > LONG_AUDIO_S * 1000:
+        with timing.span("chunked"):
+            return transcribe_chunked(client, audio_data)
+    if on_partial is None or not client.supports_streaming:
+        return client.transcribe_samples(audio_data)
+
+    duration_s = len(audio_data) / SAMPLE_RATE
+    text = ""
+    started = time.monotonic()
+    for segment in client.stream_samples(audio_data):
+        if started is not None:
+            timing.record("first_text", started, time.monotonic())
+            started = None
+        text += segment.text
+        progress = min(segment.end / duration_s, 1.0) if segment.end is not None else 0.0
+        on_partial(text, progress)
+    return text.strip()
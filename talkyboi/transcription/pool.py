@@ -0,0 +1,148 @@
+"""Bounded transcription worker pool with in-order result delivery."""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+from talkyboi import profiling, timing
+from talkyboi.config import TRANSCRIPTION_WORKERS, TRANSCRIPTION_QUEUE_SIZE
+from talkyboi.transcription.base import TranscriptionClient
+from talkyboi.transcription.pipeline import transcribe_audio
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionPool(QObject):
+    """Transcribes recordings on a fixed set of worker threads.
+
+    At most max_workers transcriptions run at once and at most max_queued
+    more wait behind them; submit() refuses work beyond that. Results are
+    delivered in submission order, so a short clip that finishes early is
+    held back until every earlier recording has been delivered.
+
+    Each submission carries an opaque context object that is passed back
+    with its result, letting callers route results to the right window.
+
+    With a streaming client, partial carries the transcript so far of the
+    oldest undelivered recording and the fraction of its audio covered;
+    partials of later recordings are held back like their results.
+    """
+
+    finished = Signal(object, str)
+    error = Signal(object, str)
+    partial = Signal(object, str, float)
+    _completed = Signal(int, bool, str)
+    _partial_ready = Signal(int, str, float)
+
+    def __init__(
+        self,
+        client: TranscriptionClient,
+        max_workers: int = TRANSCRIPTION_WORKERS,
+        max_queued: int = TRANSCRIPTION_QUEUE_SIZE,
+    ):
+        """Initialize the pool.
+
+        Args:
+            client: Transcription client shared by all workers
+            max_workers: Transcriptions allowed to run concurrently
+            max_queued: Recordings allowed to wait for a free worker
+        """
+        super().__init__()
+        self.client = client
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="transcription")
+        self._capacity = max_workers + max_queued
+        self._next_seq = 0
+        self._next_delivery = 0
+        self._contexts = {}
+        self._traces = {}
+        self._profiles = {}
+        self._results = {}
+        self._partials = {}
+        self._completed.connect(self._on_completed)
+        self._partial_ready.connect(self._on_partial)
+
+    def submit(self, audio_data: np.ndarray, context=None) -> bool:
+        """Queue a recording for transcription.
+
+        Args:
+            audio_data: NumPy array of audio samples (int16)
+            context: Passed back unchanged with the result
+
+        Returns:
+            False if the pool is full and the recording was not queued
+        """
+        if self.pending >= self._capacity:
+            logger.warning(f"Transcription queue full ({self.pending} pending), rejecting recording")
+            return False
+
+        seq = self._next_seq
+        self._next_seq += 1
+        self._contexts[seq] = context
+        self._traces[seq] = timing.current()
+        self._profiles[seq] = profiling.current()
+        self._executor.submit(timing.bind(self._run), seq, audio_data, time.monotonic())
+        logger.debug(f"Queued transcription #{seq} ({self.pending} pending)")
+        return True
+
+    @property
+    def pending(self) -> int:
+        """Number of recordings submitted but not yet delivered."""
+        return self._next_seq - self._next_delivery
+
+    def shutdown(self):
+        """Wait for every queued transcription to finish and stop the workers."""
+        logger.debug(f"Draining transcription pool ({self.pending} pending)")
+        self._executor.shutdown(wait=True)
+
+    def _run(self, seq: int, audio_data: np.ndarray, queued_at: float):
+        """Transcribe one recording (worker thread)."""
+        timing.record("queue_wait", queued_at, time.monotonic())
+        try:
+            with profiling.profile_thread(self._profiles[seq]):
+                result = transcribe_audio(
+                    self.client,
+                    audio_data,
+                    on_partial=lambda text, progress: self._partial_ready.emit(seq, text, progress),
+                )
+        except Exception as e:
+            logger.error(f"Transcription #{seq} failed: {e}")
+            self._completed.emit(seq, False, str(e))
+            return
+        if result:
+            logger.info(f"Transcription #{seq} successful")
+            self._completed.emit(seq, True, result)
+        else:
+            logger.warning(f"No speech detected in recording #{seq}")
+            self._completed.emit(seq, False, "No speech detected")
+
+    def _on_partial(self, seq: int, text: str, progress: float):
+        """Show a partial transcript if its recording is next in line (GUI thread)."""
+        if seq < self._next_delivery or seq in self._results:
+            return
+        if seq == self._next_delivery:
+            self.partial.emit(self._contexts[seq], text, progress)
+        else:
+            self._partials[seq] = (text, progress)
+
+    def _on_completed(self, seq: int, ok: bool, message: str):
+        """Deliver every result that is now next in line (GUI thread)."""
+        self._results[seq] = (ok, message)
+        self._partials.pop(seq, None)
+        while self._next_delivery in self._results:
+            ok, message = self._results.pop(self._next_delivery)
+            context = self._contexts.pop(self._next_delivery)
+            trace = self._traces.pop(self._next_delivery)
+            profile = self._profiles.pop(self._next_delivery)
+            self._next_delivery += 1
+            # Receivers finish the recording's trace, not the GUI thread's latest
+            with timing.activate(trace), profiling.activate(profile):
+                if ok:
+                    self.finished.emit(context, message)
+                else:
+                    self.error.emit(context, message)
+
+        # The new head of the line may have streamed text while it waited
+        held = self._partials.pop(self._next_delivery, None)
+        if held is not None:
+            self.partial.emit(self._contexts[self._next_delivery], *held)
@@ -0,0 +1,84 @@
+"""Stub transcription provider for tests and benchmarks."""
+
+import logging
+import os
+import random
+import threading
+import time
+from talkyboi.transcription.base import TranscriptionClient, AudioBuffer
+
+logger = logging.getLogger(__name__)
+
+# Simulated service behaviour, all overridable per instance
+STUB_LATENCY_MS = float(os.environ.get("STUB_LATENCY_MS", "300"))
+STUB_JITTER_MS = float(os.environ.get("STUB_JITTER_MS", "50"))
+# Fraction of requests that take STUB_SLOW_MS instead (the latency tail)
+STUB_SLOW_RATE = float(os.environ.get("STUB_SLOW_RATE", "0"))
+STUB_SLOW_MS = float(os.environ.get("STUB_SLOW_MS", "5000"))
+STUB_FAILURE_RATE = float(os.environ.get("STUB_FAILURE_RATE", "0"))
+# Upload bandwidth in kbit/s (0 = unlimited)
+STUB_BANDWIDTH_KBPS = float(os.environ.get("STUB_BANDWIDTH_KBPS", "0"))
+
+
+class StubClient(TranscriptionClient):
+    """Pretends to be a cloud provider without touching the network.
+
+    Sleeps for a simulated upload plus service latency, occasionally much
+    longer or failing, and returns a transcript describing the input.
+    """
+
+    def __init__(
+        self,
+        name: str = "stub",
+        latency_ms: float = STUB_LATENCY_MS,
+        jitter_ms: float = STUB_JITTER_MS,
+        slow_rate: float = STUB_SLOW_RATE,
+        slow_ms: float = STUB_SLOW_MS,
+        failure_rate: float = STUB_FAILURE_RATE,
+        bandwidth_kbps: float = STUB_BANDWIDTH_KBPS,
+        seed: int | None = None,
+    ):
+        """Initialize the stub.
+
+        Args:
+            name: Included in transcripts and the cache identity
+            latency_ms: Mean service time per request
+            jitter_ms: Uniform +/- variation of the service time
+            slow_rate: Fraction of requests that take slow_ms instead
+            slow_ms: Service time of a slow request
+            failure_rate: Fraction of requests that raise RuntimeError
+            bandwidth_kbps: Simulated upload speed (0 = unlimited)
+            seed: Seed for reproducible behaviour
+        """
+        self.name = name
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.failure_rate = failure_rate
+        self.bandwidth_kbps = bandwidth_kbps
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        logger.info(f"Stub client '{name}' initialized ({latency_ms:.0f}ms latency)")
+
+    def cache_identity(self) -> str:
+        return f"stub|{self.name}"
+
+    def transcribe(self, audio_bytes: AudioBuffer) -> str:
+        """Simulate transcribing an encoded upload."""
+        with self._lock:
+            self.requests += 1
+            slow = self._random.random() < self.slow_rate
+            fail = self._random.random() < self.failure_rate
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+
+        upload_s = 0.0
+        if self.bandwidth_kbps:
+            upload_s = len(audio_bytes) * 8 / (self.bandwidth_kbps * 1000)
+        service_ms = self.slow_ms if slow else max(0.0, self.latency_ms + jitter)
+        time.sleep(upload_s + service_ms / 1000)
+
+        if fail:
+            raise RuntimeError(f"Stub '{self.name}' simulated failure")
+        return f"{self.name} transcript of {len(audio_bytes)} bytes"
@@ -3,30 +3,36 @@
 import logging
 import numpy as np
 from PySide6.QtCore import QThread, Signal
-from talkyboi.audio.audio_utils import numpy_to_wav_bytes
+from talkyboi import profiling, timing
 from talkyboi.transcription.base import TranscriptionClient
+from talkyboi.transcription.pipeline import transcribe_audio
 
 logger = logging.getLogger(__name__)
 
 
 class TranscriptionThread(QThread):
-    """Thread that transcribes audio and emits result."""
+    """Thread that transcribes audio and emits result.
+
+    Emits partial with the transcript so far and the fraction of the audio
+    it covers while a streaming client works.
+    """
 
     finished = Signal(str)
     error = Signal(str)
+    partial = Signal(str, float)
 
     def __init__(self, client: TranscriptionClient, audio_data: np.ndarray):
         super().__init__()
         self.client = client
         self.audio_data = audio_data
+        self.trace = timing.current()
+        self.profile = profiling.current()
 
     def run(self):
         """Run the transcription."""
         try:
-            logger.debug("Converting audio to WAV format")
-            wav_bytes = numpy_to_wav_bytes(self.audio_data)
-            logger.info(f"Transcribing {len(wav_bytes)} bytes of audio")
-            result = self.client.transcribe(wav_bytes)
+            with timing.activate(self.trace), profiling.profile_thread(self.profile):
+                result = transcribe_audio(self.client, self.audio_data, on_partial=self.partial.emit)
             if result:
                 logger.info("Transcription successful")
                 self.finished.emit(result)
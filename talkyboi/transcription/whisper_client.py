@@ -1,10 +1,17 @@
 """Local Whisper client for transcription using faster-whisper."""
 
-import io
+import gc
 import logging
 import os
-from faster_whisper import WhisperModel
-from talkyboi.transcription.base import TranscriptionClient
+import threading
+from collections.abc import Iterator
+import numpy as np
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+from talkyboi import timing
+from talkyboi.audio.audio_utils import BufferReader, int16_to_float32
+from talkyboi.config import SAMPLE_RATE
+from talkyboi.transcription.base import TranscriptionClient, TranscriptSegment, AudioBuffer
+from talkyboi.transcription.whisper_profile import InferenceProfile, load_inference_profile
 
 logger = logging.getLogger(__name__)
 
@@ -12,43 +19,171 @@ logger = logging.getLogger(__name__)
 # Options: tiny, base, small, medium, large-v2, large-v3
 WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "base")
 
+# Unload the model after this many idle seconds to free memory (0 = never)
+WHISPER_IDLE_TIMEOUT_S = int(os.environ.get("WHISPER_IDLE_TIMEOUT_S", "900"))
+
 
 class WhisperClient(TranscriptionClient):
-    """Client for transcribing audio using local Whisper model."""
+    """Client for transcribing audio using local Whisper model.
+
+    The model is loaded on first use (or by prewarm) rather than in the
+    constructor, and unloaded again after WHISPER_IDLE_TIMEOUT_S without
+    requests. Requests arriving while the model loads wait for it.
+
+    How the model is loaded and decodes comes from an InferenceProfile:
+    the one saved by talkyboi-calibrate, overridden by WHISPER_* env vars.
+    """
 
-    def __init__(self, model_size: str | None = None):
+    # faster-whisper takes float32 samples directly; no WAV round-trip needed
+    supports_array_input = True
+    # and decodes segment by segment, each with timestamps
+    supports_streaming = True
+
+    def __init__(
+        self,
+        model_size: str | None = None,
+        idle_timeout_s: int = WHISPER_IDLE_TIMEOUT_S,
+        profile: InferenceProfile | None = None,
+    ):
         """Initialize the local Whisper client.
 
         Args:
             model_size: Whisper model size. If not provided, reads from WHISPER_MODEL env var.
                        Options: tiny, base, small, medium, large-v2, large-v3
+            idle_timeout_s: Seconds without requests before the model is unloaded (0 = never)
+            profile: Inference settings; the configured profile if not given
         """
-        model_size = model_size or WHISPER_MODEL
-        logger.info(f"Loading Whisper model: {model_size} (this may take a moment on first run)")
+        self.model_size = model_size or WHISPER_MODEL
+        self.idle_timeout_s = idle_timeout_s
+        self.profile = profile or load_inference_profile()
+        self._model = None
+        self._batched = None
+        self._active = 0
+        self._lock = threading.Lock()
+        self._idle_timer = None
+
+    def cache_identity(self) -> str:
+        options = self.profile.decode_options()
+        return f"whisper|{self.model_size}|" + "|".join(f"{k}={v}" for k, v in sorted(options.items()))
 
-        # Use CPU by default, auto-detect CUDA if available
-        # int8 quantization for faster inference on CPU
-        self.model = WhisperModel(model_size, device="auto", compute_type="auto")
-        logger.info(f"Whisper model '{model_size}' loaded successfully")
+    def prewarm(self) -> None:
+        """Load the model if it is not loaded yet."""
+        self._acquire_model()
+        self._release_model()
 
-    def transcribe(self, audio_bytes: bytes) -> str:
+    def unload(self):
+        """Drop the model to free its memory, unless a request is using it."""
+        with self._lock:
+            if self._model is None or self._active:
+                return
+            self._model = None
+            self._batched = None
+        gc.collect()
+        logger.info(f"Whisper model '{self.model_size}' unloaded after {self.idle_timeout_s}s idle")
+
+    def _acquire_model(self) -> WhisperModel:
+        """Return the loaded model, loading it first if needed, and mark it in use."""
+        with self._lock:
+            if self._idle_timer:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            if self._model is None:
+                logger.info(f"Loading Whisper model: {self.model_size} (this may take a moment on first run)")
+                profile = self.profile
+                with timing.span("model_load"):
+                    self._model = WhisperModel(
+                        self.model_size,
+                        device=profile.device,
+                        compute_type=profile.compute_type,
+                        cpu_threads=profile.cpu_threads,
+                        num_workers=profile.num_workers,
+                    )
+                    if profile.batch_size:
+                        self._batched = BatchedInferencePipeline(model=self._model)
+                logger.info(f"Whisper model '{self.model_size}' loaded successfully ({profile.describe()})")
+            self._active += 1
+            return self._model
+
+    def _release_model(self):
+        """Mark a request finished and start the idle countdown if none remain."""
+        with self._lock:
+            self._active -= 1
+            if self._active == 0 and self.idle_timeout_s > 0:
+                self._idle_timer = threading.Timer(self.idle_timeout_s, self.unload)
+                self._idle_timer.daemon = True
+                self._idle_timer.start()
+
+    def transcribe(self, audio_bytes: AudioBuffer) -> str:
         """Transcribe audio using local Whisper model.
 
         Args:
-            audio_bytes: WAV audio data as bytes
+            audio_bytes: WAV audio data as any bytes-like object
 
         Returns:
             Transcribed text (raw, no cleanup)
         """
         logger.debug(f"Transcribing {len(audio_bytes)} bytes with local Whisper")
+        timing.note(provider="whisper", model=self.model_size)
 
         # faster-whisper can read from file-like objects
-        audio_file = io.BytesIO(audio_bytes)
+        return self._transcribe(BufferReader(audio_bytes))
+
+    def transcribe_array(self, audio_data: np.ndarray) -> str:
+        """Transcribe raw samples using local Whisper model.
+
+        Args:
+            audio_data: NumPy array of audio samples (int16) at 16kHz
+
+        Returns:
+            Transcribed text (raw, no cleanup)
+        """
+        logger.debug(f"Transcribing {len(audio_data)} samples with local Whisper")
+        timing.note(provider="whisper", model=self.model_size)
+        return self._transcribe(int16_to_float32(audio_data))
 
-        segments, info = self.model.transcribe(audio_file, language="en")
+    def transcribe_array_stream(self, audio_data: np.ndarray) -> Iterator[TranscriptSegment]:
+        """Transcribe raw samples, yielding each segment as it is decoded.
 
-        # Concatenate all segments
-        text = " ".join(segment.text.strip() for segment in segments)
+        Args:
+            audio_data: NumPy array of audio samples (int16) at 16kHz
+
+        Yields:
+            Segments with their start and end time in seconds
+        """
+        logger.debug(f"Streaming transcription of {len(audio_data)} samples with local Whisper")
+        timing.note(provider="whisper", model=self.model_size)
+        yield from self._segments(int16_to_float32(audio_data))
 
-        logger.debug(f"Received transcription: {len(text)} chars (detected language: {info.language})")
+    def _transcribe(self, audio) -> str:
+        """Run the model on a file-like object or float32 sample array."""
+        text = "".join(segment.text for segment in self._segments(audio))
+        logger.debug(f"Received transcription: {len(text)} chars")
         return text
+
+    def _segments(self, audio) -> Iterator[TranscriptSegment]:
+        """Decode segments lazily, holding the model until the last one."""
+        model = self._acquire_model()
+        try:
+            with timing.span("decode"):
+                if self._use_batched(audio):
+                    logger.debug(f"Decoding in batches of {self.profile.batch_size}")
+                    options = self.profile.batched_decode_options(len(audio), SAMPLE_RATE)
+                    segments, info = self._batched.transcribe(audio, batch_size=self.profile.batch_size, **options)
+                else:
+                    segments, info = model.transcribe(audio, **self.profile.decode_options())
+                logger.debug(f"Detected language: {info.language}")
+                separator = ""
+                for segment in segments:
+                    text = segment.text.strip()
+                    if not text:
+                        continue
+                    yield TranscriptSegment(separator + text, segment.start, segment.end)
+                    separator = " "
+        finally:
+            self._release_model()
+
+    def _use_batched(self, audio) -> bool:
+        """Whether a clip is long enough for the batched pipeline."""
+        if self._batched is None or not isinstance(audio, np.ndarray):
+            return False
+        return len(audio) >= self.profile.batched_min_s * SAMPLE_RATE
@@ -0,0 +1,157 @@
+"""Several local Whisper models in worker processes, for concurrent requests."""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from talkyboi.config import SAMPLE_RATE, WHISPER_REPLICAS
+from talkyboi.transcription.base import TranscriptionClient, AudioBuffer
+from talkyboi.transcription.whisper_client import WhisperClient, WHISPER_MODEL
+from talkyboi.transcription.whisper_profile import InferenceProfile, load_inference_profile
+
+logger = logging.getLogger(__name__)
+
+# Clips up to this long may use the short-clip lane (replica 0)
+WHISPER_SHORT_CLIP_S = float(os.environ.get("WHISPER_SHORT_CLIP_S", "20"))
+
+# The replica's client, in each worker process
+_worker_client = None
+
+
+def _init_worker(model_size: str, profile: dict):
+    """Create the worker process's client; the model loads on first use."""
+    global _worker_client
+    _worker_client = WhisperClient(model_size, profile=InferenceProfile(**profile))
+
+
+def _worker_prewarm():
+    _worker_client.prewarm()
+
+
+def _worker_transcribe_array(audio_data: np.ndarray) -> str:
+    return _worker_client.transcribe_array(audio_data)
+
+
+def _worker_transcribe(audio_bytes: bytes) -> str:
+    return _worker_client.transcribe(audio_bytes)
+
+
+class WhisperReplicaPool(TranscriptionClient):
+    """Spreads transcriptions over several Whisper models in separate processes.
+
+    Each replica is a single-worker process with its own model and an equal
+    share of the CPU threads, so replicas decode in parallel without
+    contending for the GIL. Each request goes to the replica with the
+    least audio still queued. Replica 0 is a short-clip lane: clips longer
+    than short_clip_s never go there, so quick dictation is not stuck
+    behind a long file.
+
+    Segments are not streamed across the process boundary, so this client
+    returns whole transcripts.
+    """
+
+    supports_array_input = True
+
+    def __init__(
+        self,
+        replicas: int = WHISPER_REPLICAS,
+        model_size: str | None = None,
+        profile: InferenceProfile | None = None,
+        short_clip_s: float = WHISPER_SHORT_CLIP_S,
+    ):
+        """Start the replica processes.
+
+        Args:
+            replicas: Number of models to run
+            model_size: Whisper model size; WHISPER_MODEL if not given
+            profile: Inference settings; cpu_threads is the total split
+                between replicas (0 = all cores)
+            short_clip_s: Longest clip allowed on the short-clip lane
+        """
+        self.model_size = model_size or WHISPER_MODEL
+        profile = profile or load_inference_profile()
+        total_threads = profile.cpu_threads or os.cpu_count() or 1
+        self.profile = profile._replace(cpu_threads=max(1, total_threads // replicas))
+        self.short_clip_s = short_clip_s
+        self._identity = WhisperClient(self.model_size, profile=self.profile).cache_identity()
+
+        context = multiprocessing.get_context("spawn")
+        self._replicas = [
+            ProcessPoolExecutor(
+                1,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.model_size, self.profile._asdict()),
+            )
+            for _ in range(replicas)
+        ]
+        self._queued_s = [0.0] * replicas
+        self._lock = threading.Lock()
+        self._prewarmed = None
+        logger.info(
+            f"Whisper replica pool: {replicas} x '{self.model_size}' "
+            f"({self.profile.cpu_threads} threads each)"
+        )
+
+    def cache_identity(self) -> str:
+        return self._identity
+
+    def prewarm(self) -> None:
+        """Load the model in every replica, once.
+
+        The first call queues the load on every replica and waits for it;
+        later calls, such as the one on each PTT press, return at once
+        instead of queueing behind the replicas' work. A replica that has
+        unloaded its idle model reloads it on its next request.
+        """
+        with self._lock:
+            first = self._prewarmed is None
+            if first:
+                self._prewarmed = [replica.submit(_worker_prewarm) for replica in self._replicas]
+        if first:
+            for future in self._prewarmed:
+                future.result()
+
+    def transcribe(self, audio_bytes: AudioBuffer) -> str:
+        """Transcribe an encoded file; its length is estimated from 16-bit PCM."""
+        duration_s = len(audio_bytes) / (2 * SAMPLE_RATE)
+        return self._run(duration_s, _worker_transcribe, bytes(audio_bytes))
+
+    def transcribe_array(self, audio_data: np.ndarray) -> str:
+        """Transcribe raw samples on the least loaded suitable replica."""
+        return self._run(len(audio_data) / SAMPLE_RATE, _worker_transcribe_array, audio_data)
+
+    def close(self) -> None:
+        """Stop the replica processes once their queued work is done."""
+        for replica in self._replicas:
+            replica.shutdown(wait=True)
+
+    def choose_replica(self, duration_s: float) -> int:
+        """Pick the replica for a clip (lock held by the caller).
+
+        Args:
+            duration_s: Clip length in seconds
+
+        Returns:
+            Index of the replica with the least queued audio among those
+            allowed to take the clip
+        """
+        candidates = range(len(self._replicas))
+        if len(self._replicas) > 1 and duration_s > self.short_clip_s:
+            candidates = range(1, len(self._replicas))
+        return min(candidates, key=lambda i: self._queued_s[i])
+
+    def _run(self, duration_s: float, task, audio) -> str:
+        """Queue a task on a replica and wait for its result."""
+        with self._lock:
+            index = self.choose_replica(duration_s)
+            self._queued_s[index] += duration_s
+            queued = self._queued_s[index]
+        logger.debug(f"Replica {index}: {duration_s:.1f}s clip, {queued:.1f}s queued")
+        try:
+            return self._replicas[index].submit(task, audio).result()
+        finally:
+            with self._lock:
+                self._queued_s[index] -= duration_s
@@ -0,0 +1,134 @@
+"""Inference settings for local Whisper.
+
+Kept free of faster-whisper imports so the settings can be loaded, shown
+and saved without loading the engine.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Where talkyboi-calibrate records the fastest profile for this machine
+PROFILE_PATH = Path(
+    os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+) / "talkyboi" / "whisper_profile.json"
+
+# Whisper decodes 30 s windows; the batched pipeline decodes several at once
+_BATCH_WINDOW_S = 30
+
+
+class InferenceProfile(NamedTuple):
+    """How faster-whisper loads the model and decodes audio."""
+
+    device: str = "auto"
+    # int8, int8_float16, int8_float32, float16, float32 or auto
+    compute_type: str = "auto"
+    # CPU threads per decode (0 = CTranslate2 default)
+    cpu_threads: int = 0
+    # Decodes that may run concurrently on one model
+    num_workers: int = 1
+    beam_size: int = 5
+    # Skip non-speech with Silero VAD before decoding
+    vad_filter: bool = False
+    # Faster, but segment times only cover whole 30 s windows
+    without_timestamps: bool = False
+    # Empty string = detect the language
+    language: str = "en"
+    # Clips at least batched_min_s long go through BatchedInferencePipeline
+    # in batches of batch_size (0 = never)
+    batch_size: int = 0
+    batched_min_s: float = 60.0
+
+    def decode_options(self) -> dict:
+        """Keyword arguments for WhisperModel.transcribe."""
+        return {
+            "language": self.language or None,
+            "beam_size": self.beam_size,
+            "vad_filter": self.vad_filter,
+            "without_timestamps": self.without_timestamps,
+        }
+
+    def batched_decode_options(self, num_samples: int, sample_rate: int) -> dict:
+        """Keyword arguments for BatchedInferencePipeline.transcribe.
+
+        The batched pipeline needs the clip split into windows up front. Its
+        own VAD does that when vad_filter is set; otherwise the clip is cut
+        into fixed 30 s windows, as WhisperModel.transcribe would decode it.
+        """
+        options = self.decode_options()
+        if not self.vad_filter:
+            window = _BATCH_WINDOW_S * sample_rate
+            options["clip_timestamps"] = [
+                {"start": start, "end": min(start + window, num_samples)}
+                for start in range(0, num_samples, window)
+            ]
+        return options
+
+    def describe(self) -> str:
+        """Short summary for logs and calibration output."""
+        threads = self.cpu_threads or "default"
+        batched = f", batch {self.batch_size}" if self.batch_size else ""
+        return f"{self.compute_type}, {threads} threads, beam {self.beam_size}{batched}"
+
+
+# Environment variable for each field; values override the saved profile
+_ENV_FIELDS = {
+    "device": "WHISPER_DEVICE",
+    "compute_type": "WHISPER_COMPUTE_TYPE",
+    "cpu_threads": "WHISPER_CPU_THREADS",
+    "num_workers": "WHISPER_NUM_WORKERS",
+    "beam_size": "WHISPER_BEAM_SIZE",
+    "vad_filter": "WHISPER_VAD_FILTER",
+    "without_timestamps": "WHISPER_WITHOUT_TIMESTAMPS",
+    "language": "WHISPER_LANGUAGE",
+    "batch_size": "WHISPER_BATCH_SIZE",
+    "batched_min_s": "WHISPER_BATCHED_MIN_S",
+}
+
+
+def _parse(field: str, value: str):
+    """Convert an environment string to the type of a profile field."""
+    kind = type(InferenceProfile._field_defaults[field])
+    if kind is bool:
+        return value == "1"
+    return kind(value)
+
+
+def load_inference_profile(path: Path = PROFILE_PATH) -> InferenceProfile:
+    """Build the active profile: defaults, then the saved profile, then env vars.
+
+    Args:
+        path: Saved profile written by talkyboi-calibrate
+
+    Returns:
+        The profile to use
+    """
+    values = {}
+    if path.exists():
+        try:
+            saved = json.loads(path.read_text())
+            values.update({k: v for k, v in saved.items() if k in InferenceProfile._fields})
+            logger.debug(f"Loaded Whisper profile from {path}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable Whisper profile {path}: {e}")
+
+    for field, env in _ENV_FIELDS.items():
+        if env in os.environ:
+            values[field] = _parse(field, os.environ[env])
+    return InferenceProfile(**values)
+
+
+def save_inference_profile(profile: InferenceProfile, path: Path = PROFILE_PATH):
+    """Record a profile as this machine's default.
+
+    Args:
+        profile: Profile to save
+        path: Where to write it
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(profile._asdict(), indent=2) + "\n")
+    logger.info(f"Saved Whisper profile to {path}")
@@ -43,12 +43,16 @@ class MainWindow(QMainWindow):
     # Signals for keyboard PTT
     ptt_pressed = Signal()
     ptt_released = Signal()
+    # Profile button toggled, with whether upcoming recordings are profiled
+    profiling_toggled = Signal(bool)
 
     def __init__(self):
         super().__init__()
         self.setWindowTitle("TalkyBoi")
         self.setMinimumSize(500, 400)
         self._ptt_key_held = False
+        # Text before a partial transcription shown at the end, if one is shown
+        self._committed_text = None
 
         # Central widget
         central = QWidget()
@@ -98,6 +102,11 @@ class MainWindow(QMainWindow):
         button_layout.addWidget(self.clear_btn)
         button_layout.addWidget(self.copy_btn)
         button_layout.addStretch()
+        self.profile_btn = QPushButton("Profile")
+        self.profile_btn.setCheckable(True)
+        self.profile_btn.setToolTip("Profile each recording with cProfile and tracemalloc")
+        self.profile_btn.toggled.connect(self._on_profile_toggled)
+        button_layout.addWidget(self.profile_btn)
         layout.addLayout(button_layout)
 
         # Install event filter to catch all key events
@@ -132,6 +141,8 @@ class MainWindow(QMainWindow):
     def clear_text(self):
         """Clear the text area."""
         self.text_area.clear()
+        if self._committed_text is not None:
+            self._committed_text = ""
 
     @Slot()
     def copy_all(self):
@@ -141,6 +152,17 @@ class MainWindow(QMainWindow):
             QApplication.clipboard().setText(text)
             self.status_label.setText("Copied to clipboard!")
 
+    def set_profiling(self, enabled: bool):
+        """Show whether recordings are profiled, without emitting profiling_toggled."""
+        self.profile_btn.blockSignals(True)
+        self.profile_btn.setChecked(enabled)
+        self.profile_btn.blockSignals(False)
+
+    @Slot(bool)
+    def _on_profile_toggled(self, enabled: bool):
+        self.status_label.setText("Profiling each recording" if enabled else "Profiling off")
+        self.profiling_toggled.emit(enabled)
+
     def set_recording(self, is_recording: bool):
         """Update UI to show recording state."""
         if is_recording:
@@ -165,9 +187,38 @@ class MainWindow(QMainWindow):
         """Update UI to show transcribing state."""
         self.status_label.setText("Transcribing...")
 
+    def show_partial(self, text: str, progress: float = 0.0):
+        """Show a transcription that is still being generated.
+
+        It is replaced by the next partial, and by the final text once
+        append_transcription is called.
+
+        Args:
+            text: Transcript so far
+            progress: Fraction of the recording covered, 0 if unknown
+        """
+        if self._committed_text is None:
+            self._committed_text = self.text_area.toPlainText()
+        self._show_text(self._committed_text, text)
+        if progress:
+            self.status_label.setText(f"Transcribing... {progress:.0%}")
+        else:
+            self.status_label.setText("Transcribing...")
+
     def append_transcription(self, text: str):
         """Append transcribed text to the text area."""
-        current = self.text_area.toPlainText()
+        self._show_text(self._take_committed_text(), text)
+        self.status_label.setText("Ready")
+
+    def _take_committed_text(self) -> str:
+        """Current text without any partial transcription, which is dropped."""
+        if self._committed_text is None:
+            return self.text_area.toPlainText()
+        current, self._committed_text = self._committed_text, None
+        return current
+
+    def _show_text(self, current: str, text: str):
+        """Show text after the current text and scroll to it."""
         if current:
             self.text_area.setPlainText(current + "\n\n" + text)
         else:
@@ -175,9 +226,10 @@ class MainWindow(QMainWindow):
         # Scroll to bottom
         scrollbar = self.text_area.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
-        self.status_label.setText("Ready")
 
     def show_error(self, message: str):
         """Show an error message in the status bar."""
+        if self._committed_text is not None:
+            self.text_area.setPlainText(self._take_committed_text())
         self.status_label.setText(f"Error: {message}")
         self.recording_indicator.setStyleSheet("color: gray; font-size: 24px;")
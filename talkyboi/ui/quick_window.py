@@ -144,6 +144,19 @@ class QuickRecordWindow(QWidget):
         self.stop_btn.hide()
         self.hint_label.setText("Please wait...")
 
+    def show_partial(self, text: str, progress: float = 0.0):
+        """Preview a transcription that is still being generated.
+
+        Args:
+            text: Transcript so far
+            progress: Fraction of the recording covered, 0 if unknown
+        """
+        if progress:
+            self.status_label.setText(f"Transcribing... {progress:.0%}")
+        preview = "..." + text[-80:] if len(text) > 80 else text
+        self.result_label.setText(f'"{preview}"')
+        self.result_label.show()
+
     def show_success(self, text: str):
         """Show success state with transcribed text preview."""
         self._recording_timer.stop()